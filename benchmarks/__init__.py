@@ -0,0 +1 @@
+"""Benchmarks das etapas da aplicação."""
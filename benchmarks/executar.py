@@ -0,0 +1,211 @@
+"""Benchmark das etapas das páginas sobre coortes sintéticas.
+
+Executa, fora do Streamlit, a mesma lógica das páginas de descrição,
+pré-processamento e hipóteses para cada tamanho de coorte pedido e mede
+tempo de parede, tempo de CPU e pico de memória de cada etapa, de cada
+figura e de cada gráfico interativo. Os resultados são acrescentados a um arquivo JSONL junto com o
+commit atual, para comparação entre commits.
+
+Uso (a partir da raiz do repositório):
+
+    python -m benchmarks.executar --linhas 2000 100000
+    python -m benchmarks.executar --linhas 2000 --comparar <commit>
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from utils import graficos_descricao, graficos_interativos, hipoteses
+from utils.agregados import perfilar
+from utils.dados import ler_tratados
+from utils.esquema import otimizar_tipos
+from utils.figuras import figura_para_bytes, grafico_para_bytes
+from utils.preprocessamento import preprocessar_em_blocos
+from utils.reamostragem import REPLICAS, reamostrar_conclusoes
+from utils.sintetico import gravar_coorte
+
+# Tamanhos padrão das coortes
+LINHAS_PADRAO = [2_000, 100_000, 1_000_000, 10_000_000]
+
+# Arquivo padrão de resultados
+RESULTADOS_PATH = "benchmarks/resultados.jsonl"
+
+# Razão de tempo acima da qual uma etapa é apontada como regressão
+LIMITE_REGRESSAO = 1.2
+
+
+def commit_atual():
+    """Hash curto do commit atual, com sufixo '-dirty' se houver alterações não commitadas."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        sujo = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecido"
+    return f"{commit}-dirty" if sujo else commit
+
+
+class Medidor:
+    """Mede e acumula os resultados de cada etapa."""
+
+    def __init__(self, commit, medir_memoria=True):
+        self.commit = commit
+        self.medir_memoria = medir_memoria
+        self.resultados = []
+
+    def medir(self, estagio, linhas, funcao):
+        if self.medir_memoria:
+            tracemalloc.start()
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        try:
+            retorno = funcao()
+        finally:
+            segundos = time.perf_counter() - inicio
+            cpu_segundos = time.process_time() - inicio_cpu
+            pico = None
+            if self.medir_memoria:
+                pico = tracemalloc.get_traced_memory()[1] / 1024**2
+                tracemalloc.stop()
+        resultado = {
+            "commit": self.commit,
+            "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "estagio": estagio,
+            "linhas": linhas,
+            "segundos": round(segundos, 6),
+            "cpu_segundos": round(cpu_segundos, 6),
+            "pico_mb": round(pico, 3) if pico is not None else None,
+        }
+        self.resultados.append(resultado)
+        pico_texto = f"{pico:10.1f} MB" if pico is not None else ""
+        print(f"{linhas:>12,} {estagio:<50} {segundos:10.3f} s {pico_texto}", flush=True)
+        return retorno
+
+
+def executar(linhas, diretorio, medidor, figuras=True):
+    """Executa todas as etapas para uma coorte de `linhas` pacientes."""
+    origem = os.path.join(diretorio, f"coorte_{linhas}.csv")
+    destino = os.path.join(diretorio, f"coorte_{linhas}.parquet")
+    destino_arrow = os.path.join(diretorio, f"coorte_{linhas}.arrow")
+    gravar_coorte(origem, linhas)
+
+    # Carregamento e pré-processamento
+    bruto = medidor.medir("carga.csv", linhas, lambda: otimizar_tipos(pd.read_csv(origem)))
+    medidor.medir("preprocessamento.blocos", linhas, lambda: preprocessar_em_blocos(origem, destino))
+    tratados = medidor.medir("carga.parquet", linhas, lambda: ler_tratados(destino))
+    medidor.medir("carga.parquet.hipoteses", linhas, lambda: ler_tratados(destino, hipoteses.COLUNAS))
+    medidor.medir("preprocessamento.arrow", linhas, lambda: preprocessar_em_blocos(origem, destino_arrow))
+    medidor.medir("carga.arrow", linhas, lambda: ler_tratados(destino_arrow))
+    medidor.medir("carga.arrow.hipoteses", linhas, lambda: ler_tratados(destino_arrow, hipoteses.COLUNAS))
+
+    # Página de descrição
+    perfil = medidor.medir("descricao.perfil", linhas, lambda: perfilar(bruto))
+    if figuras:
+        for grupo, (_, construir) in graficos_descricao.GRUPOS.items():
+            medidor.medir(
+                f"descricao.figura.{grupo}", linhas,
+                lambda: figura_para_bytes(construir(perfil)),
+            )
+        for grupo, (_, construir) in graficos_interativos.GRUPOS.items():
+            medidor.medir(
+                f"descricao.grafico.{grupo}", linhas,
+                lambda: grafico_para_bytes(construir(perfil)),
+            )
+
+    # Página de hipóteses
+    medidor.medir("hipoteses.testes_t", linhas, lambda: hipoteses.testes_t(tratados))
+    modelos = medidor.medir("hipoteses.modelos", linhas, lambda: hipoteses.ajustar_modelos(tratados))
+    # Mesmas réplicas da página, reduzidas em coortes grandes (ver utils/reamostragem.py)
+    medidor.medir(
+        "hipoteses.reamostragem", linhas,
+        lambda: reamostrar_conclusoes(hipoteses.REAMOSTRAGENS, tratados, REPLICAS),
+    )
+    if figuras:
+        for figura_id, (_, construir) in hipoteses.FIGURAS.items():
+            medidor.medir(
+                f"hipoteses.figura.{figura_id}", linhas,
+                lambda: figura_para_bytes(construir(tratados, modelos)),
+            )
+        for figura_id, construir in hipoteses.GRAFICOS.items():
+            medidor.medir(
+                f"hipoteses.grafico.{figura_id}", linhas,
+                lambda: grafico_para_bytes(construir(tratados, modelos)),
+            )
+
+    os.remove(origem)
+    os.remove(destino)
+    os.remove(destino_arrow)
+
+
+def carregar_resultados(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as arquivo:
+        return [json.loads(linha) for linha in arquivo if linha.strip()]
+
+
+def salvar_resultados(path, resultados):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as arquivo:
+        for resultado in resultados:
+            arquivo.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+
+
+def comparar(atuais, anteriores, referencia):
+    """Imprime a razão de tempo entre a execução atual e a última execução do commit `referencia`."""
+    base = {}
+    for resultado in anteriores:
+        if resultado["commit"] == referencia or resultado["commit"].startswith(referencia):
+            base[(resultado["estagio"], resultado["linhas"])] = resultado
+    if not base:
+        print(f"\nNenhum resultado encontrado para o commit {referencia}.")
+        return 0
+
+    print(f"\nComparação com {referencia} (razão atual / referência):")
+    regressoes = 0
+    for resultado in atuais:
+        anterior = base.get((resultado["estagio"], resultado["linhas"]))
+        if anterior is None or anterior["segundos"] <= 0:
+            continue
+        razao = resultado["segundos"] / anterior["segundos"]
+        marcador = "  <-- regressão" if razao > LIMITE_REGRESSAO else ""
+        regressoes += bool(marcador)
+        print(f"{resultado['linhas']:>12,} {resultado['estagio']:<50} {razao:8.2f}x{marcador}")
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, nargs="+", default=LINHAS_PADRAO, help="tamanhos das coortes")
+    parser.add_argument("--saida", default=RESULTADOS_PATH, help="arquivo JSONL de resultados")
+    parser.add_argument("--comparar", metavar="COMMIT", help="compara com os resultados de outro commit")
+    parser.add_argument("--sem-figuras", action="store_true", help="não mede a renderização das figuras")
+    parser.add_argument("--sem-memoria", action="store_true", help="não mede o pico de memória (tracemalloc adiciona overhead)")
+    parser.add_argument("--diretorio", help="diretório para os arquivos temporários das coortes")
+    args = parser.parse_args(argv)
+
+    anteriores = carregar_resultados(args.saida)
+    medidor = Medidor(commit_atual(), medir_memoria=not args.sem_memoria)
+    with tempfile.TemporaryDirectory(dir=args.diretorio) as diretorio:
+        for linhas in args.linhas:
+            executar(linhas, diretorio, medidor, figuras=not args.sem_figuras)
+    salvar_resultados(args.saida, medidor.resultados)
+
+    if args.comparar:
+        return 1 if comparar(medidor.resultados, anteriores, args.comparar) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""Gera uma coorte sintética em CSV ou Parquet a partir do dataset original.
+
+As distribuições marginais e as correlações são aprendidas de
+`data/alzheimers_disease_data.csv` (ou do arquivo passado em --origem) e a
+coorte é gravada em blocos, com memória limitada, qualquer que seja o
+número de linhas.
+
+Uso (a partir da raiz do repositório):
+
+    python -m benchmarks.gerar_coorte --linhas 1000000 --saida coorte.parquet
+"""
+
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+from utils.dados import RAW_DATA_PATH
+from utils.preprocessamento import CHUNK_ROWS
+from utils.sintetico import ajustar_modelo, gravar_coorte
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, required=True, help="número de pacientes")
+    parser.add_argument("--saida", required=True, help="arquivo de saída (.csv ou .parquet)")
+    parser.add_argument("--origem", default=RAW_DATA_PATH, help="dataset de onde as distribuições são aprendidas")
+    parser.add_argument("--seed", type=int, default=0, help="semente do gerador")
+    parser.add_argument("--bloco", type=int, default=CHUNK_ROWS, help="linhas geradas e gravadas por vez")
+    args = parser.parse_args(argv)
+
+    modelo = ajustar_modelo(pd.read_csv(args.origem))
+    inicio = time.perf_counter()
+    gravar_coorte(args.saida, args.linhas, seed=args.seed, modelo=modelo, chunk_rows=args.bloco)
+    segundos = time.perf_counter() - inicio
+    print(f"{args.linhas:,} linhas gravadas em {args.saida} em {segundos:.1f} s ({args.linhas / segundos:,.0f} linhas/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,23 @@
 import streamlit as st
 import pandas as pd
 
+from utils.dados import (
+    RAW_DATA_PATH, TREATED_ARROW_PATH, caminho_tratados, carregar_tratados, tratados_atualizados, versao_dados,
+)
+from utils.esquema import ID_COLUMNS, aplicar_esquema, relatorio_memoria
+from utils.exportacao import FORMATOS, exportar
+from utils.preprocessamento import preprocessar_em_blocos, remover_colunas
+
 # Configuração da página
 st.title("Pré-Processamento dos Dados")
 
 # Caminho para o dataset
-DATA_PATH = "data/alzheimers_disease_data.csv"
+DATA_PATH = RAW_DATA_PATH
 
-# Tenta carregar o arquivo
+# Tenta carregar o arquivo. Apenas as primeiras linhas são lidas aqui; o arquivo
+# completo é processado em blocos na etapa de gravação, com memória limitada.
 try:
-    data = pd.read_csv(DATA_PATH)
+    data = pd.read_csv(DATA_PATH, nrows=5)
     st.success("Dados carregados com sucesso!")
 except FileNotFoundError:
     st.error(f"Erro: O arquivo {DATA_PATH} não foi encontrado. Verifique se o caminho está correto.")
@@ -25,13 +33,15 @@ st.write(data.head())
 st.subheader("Remoção de Colunas Irrelevantes")
 
 # Definir as colunas a serem removidas
-columns_to_remove = ["PatientID", "DoctorInCharge"]
+columns_to_remove = ID_COLUMNS
 
 # Verificar se as colunas existem antes de remover
 existing_columns_to_remove = [col for col in columns_to_remove if col in data.columns]
 
+# Transformações aplicadas a cada bloco do arquivo
+transformacoes = [remover_colunas(existing_columns_to_remove), aplicar_esquema]
+
 if existing_columns_to_remove:
-    data.drop(columns=existing_columns_to_remove, inplace=True)
     st.success(f"As colunas {existing_columns_to_remove} foram removidas com sucesso!")
 else:
     st.warning("Nenhuma coluna relevante foi encontrada para remoção.")
@@ -40,18 +50,71 @@ else:
 # 2. Exibição dos Dados Após o Pré-Processamento
 # -----------------------------
 st.subheader("Prévia dos Dados Após o Pré-Processamento")
+for transformar in transformacoes:
+    data = transformar(data)
 st.write(data.head())
 
 # -----------------------------
-# 3. Opção para Baixar os Dados Tratados
+# 3. Gravação dos Dados Tratados em Formato Colunar
+# -----------------------------
+st.subheader("Gravação dos Dados Tratados")
+
+# O arquivo Arrow (aberto pelas páginas via memory map, sem cópia) só é
+# regravado quando o dataset original é mais recente que ele
+if tratados_atualizados(DATA_PATH):
+    st.info(f"O arquivo {TREATED_ARROW_PATH} já está atualizado.")
+else:
+    with st.spinner("Processando o dataset em blocos..."):
+        linhas = preprocessar_em_blocos(DATA_PATH, TREATED_ARROW_PATH, transformacoes)
+    st.success(f"{linhas} linhas tratadas gravadas em {TREATED_ARROW_PATH} com tipos otimizados.")
+
+# Memória ocupada pelo dataset tratado carregado pelas páginas, comparada à
+# dos tipos padrão do pandas (int64/float64)
+relatorio = relatorio_memoria(carregar_tratados())
+antes, depois = relatorio["antes"].sum(), relatorio["depois"].sum()
+st.write(
+    f"Carregado pelas páginas, o dataset tratado ocupa **{depois / 1024**2:.2f} MB** em memória, "
+    f"contra {antes / 1024**2:.2f} MB com os tipos padrão ({1 - depois / antes:.0%} a menos). "
+    "Essa cópia é compartilhada por todas as sessões."
+)
+with st.expander("Memória por coluna"):
+    st.dataframe(relatorio)
+
+# -----------------------------
+# 4. Opção para Baixar os Dados Tratados
 # -----------------------------
 st.subheader("Baixar os Dados Processados")
 
-# Criar um botão para baixar os dados tratados
-csv = data.to_csv(index=False).encode('utf-8')
-st.download_button(
-    label="Baixar CSV dos Dados Tratados",
-    data=csv,
-    file_name="dados_tratados.csv",
-    mime="text/csv"
+formato = st.radio(
+    "Formato do arquivo",
+    options=list(FORMATOS),
+    format_func=lambda f: FORMATOS[f][0],
+    horizontal=True,
 )
+rotulo, extensao, mime, _ = FORMATOS[formato]
+
+# O arquivo só é gerado quando solicitado e fica guardado em disco por versão
+# do dataset. O botão de download (que envia o arquivo inteiro ao navegador)
+# vive em um fragmento e só existe na execução que atende ao pedido: a
+# execução seguinte, disparada pelo próprio download, já não o recria, então
+# as demais execuções da página não leem o arquivo.
+origem = caminho_tratados()
+versao = versao_dados(origem)
+
+
+@st.fragment
+def baixar_tratados(origem, versao, formato):
+    if not st.button(f"Preparar {rotulo} dos Dados Tratados"):
+        return
+    with st.spinner("Gerando arquivo..."):
+        caminho = exportar(origem, versao, formato)
+    with open(caminho, "rb") as arquivo:
+        st.download_button(
+            label=f"Baixar {rotulo} dos Dados Tratados",
+            data=arquivo,
+            file_name=f"dados_tratados{extensao}",
+            mime=mime,
+        )
+
+
+baixar_tratados(origem, versao, formato)
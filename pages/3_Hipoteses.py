@@ -1,38 +1,148 @@
-from sklearn.discriminant_analysis import StandardScaler
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.linear_model import LogisticRegression, LinearRegression
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, accuracy_score
-from scipy.stats import ttest_ind
-from matplotlib.patches import Patch
-
-from scipy.special import expit
-import numpy as np
+
+from utils import hipoteses
+from utils.artefatos import pacote_atual
+from utils.avaliacao import avaliacao_em_cache
+from utils.contingencia import TabelasContingencia
+from utils.coortes import COLUNAS_FILTRO, aplicar_coorte, filtrar, seletor_coorte
+from utils.dados import (
+    RAW_DATA_PATH, TREATED_DATA_PATH, caminho_tratados, carregar_dados, carregar_tratados, versao_dados,
+    versao_tratados,
+)
+from utils.esquema import BINARY_COLUMNS, CONTINUOUS_COLUMNS
+from utils.figuras import exibir_figura, exibir_grafico, figura_em_cache
+from utils.graficos_interativos import seletor_graficos
+from utils.instrumentacao import definir_secao, iniciar_pagina, painel_diagnostico
+from utils.incremental import resumo_incremental
+from utils.modelos import registro_modelos
+from utils.reamostragem import REPLICAS, reamostragem_em_cache
+from utils.testes import testes_t_em_lote
+from utils.paralelo import agendar_figuras, pool_figuras
 
 # Configuração da página
 st.title("Validação das Hipóteses")
+iniciar_pagina("3_Hipoteses")
 
-# Caminho para os dados tratados
-DATA_PATH = "data/dados_tratados.csv"
+# Filtro de coorte da barra lateral (ver utils/coortes.py)
+filtro = seletor_coorte()
 
-# Carregar os dados
-try:
-    data = pd.read_csv(DATA_PATH)
-    st.success("Dados carregados com sucesso!")
-except FileNotFoundError:
-    st.error(f"Erro: O arquivo {DATA_PATH} não foi encontrado. Certifique-se de rodar o pré-processamento antes.")
-    st.stop()
+# Gráficos desenhados no navegador a partir de agregados (ver utils/graficos_interativos.py);
+# figuras sem versão interativa continuam sendo exibidas como imagem
+interativo = seletor_graficos()
 
-st.markdown("---")
+# Caminho para os dados tratados
+DATA_PATH = TREATED_DATA_PATH
+
+# Colunas utilizadas nas hipóteses (as demais não são lidas do disco)
+COLUNAS = hipoteses.COLUNAS
+
+# Com um pacote de artefatos publicado (ver utils/artefatos.py), a página só
+# lê os resultados pré-calculados; sem ele, ou com uma coorte selecionada,
+# tudo é calculado sob demanda
+pacote = pacote_atual() if not filtro else None
+
+if pacote is not None:
+    versao = pacote.versao
+    modelos = pacote.modelos()
+    testes_t = pacote.tabela("testes_t").set_index("grupo")
+    contingencia = pacote.tabela("contingencia").iloc[0]
+    reamostragem = pacote.tabela("reamostragem")
+    st.success(f"Resultados pré-calculados em {pacote.manifesto['criado_em']} carregados com sucesso!")
+    st.markdown("---")
+
+    def exibir(figura_id):
+        """Exibe a figura `figura_id` já renderizada no pacote."""
+        especificacao = pacote.grafico("hipoteses", figura_id) if interativo else None
+        if especificacao is not None:
+            st.vega_lite_chart(especificacao, use_container_width=True)
+        else:
+            st.image(pacote.figura("hipoteses", figura_id), use_container_width=True)
 
+else:
+    # Carregar os dados
+    try:
+        data = carregar_tratados(COLUNAS)
+        versao = versao_tratados()
+        st.success("Dados carregados com sucesso!")
+    except FileNotFoundError:
+        st.error(f"Erro: O arquivo {DATA_PATH} não foi encontrado. Certifique-se de rodar o pré-processamento antes.")
+        st.stop()
+    if filtro:
+        # As colunas do filtro são lidas à parte, alinhadas linha a linha com `data`
+        data, versao = aplicar_coorte(data, versao, filtro, carregar_tratados(COLUNAS_FILTRO))
+        # Regressões e testes precisam dos dois valores de cada variável das hipóteses
+        constantes = [coluna for coluna in COLUNAS if data[coluna].nunique() < 2]
+        if constantes:
+            st.warning(
+                f"Na coorte selecionada, {', '.join(constantes)} tem um único valor; "
+                "as hipóteses não podem ser avaliadas. Amplie o filtro na barra lateral."
+            )
+            st.stop()
+
+    st.markdown("---")
+
+    # Regressões e testes T de todas as hipóteses (ver utils/hipoteses.py). Os
+    # modelos ainda não ajustados para esta versão dos dados são ajustados em
+    # segundo plano enquanto a página renderiza; cada acesso aguarda só o seu.
+    modelos = registro_modelos().modelos(versao, hipoteses.MODELOS, data)
+    testes_t = hipoteses.testes_t(data)
+    contingencia = hipoteses.testes_contingencia(data).iloc[0]
+    # As conclusões de cada hipótese vêm dos testes por reamostragem, calculados
+    # uma vez por versão dos dados em lotes vetorizados (ver utils/reamostragem.py)
+    reamostragem = reamostragem_em_cache(versao, hipoteses.REAMOSTRAGENS, data)
+
+    # Sem coorte, as medianas e os histogramas da 4.4 vêm dos esboços do resumo
+    # incremental do dataset original, atualizado só com as linhas acrescentadas
+    # (ver utils/incremental.py), desde que ele cubra as mesmas linhas dos dados tratados
+    resumo = None
+    if not filtro:
+        try:
+            resumo = resumo_incremental()
+        except FileNotFoundError:
+            resumo = None
+        if resumo is not None and resumo.linhas != len(data):
+            resumo = None
+    do_resumo = hipoteses.DO_RESUMO if resumo is not None else set()
+
+    # Figuras ainda não renderizadas são construídas em paralelo no pool de
+    # processos (ver utils/paralelo.py) enquanto a página segue sendo montada.
+    # O pool recebe só os modelos já ajustados: as figuras que dependem de um
+    # ajuste em andamento são construídas aqui, quando chegar a vez delas.
+    pool = pool_figuras()
+    prontos = set(modelos.prontos())
+    pendentes = [
+        figura_id for figura_id in hipoteses.FIGURAS
+        if not (interativo and figura_id in hipoteses.GRAFICOS) and figura_id not in do_resumo
+        and not figura_em_cache(versao, figura_id)
+        and prontos.issuperset(hipoteses.MODELOS_DAS_FIGURAS.get(figura_id, []))
+    ]
+    agendadas = {}
+    if pool is not None and pendentes:
+        # O dataset tratado é lido com RangeIndex, então o índice da coorte são as posições das suas linhas
+        linhas = data.index.to_numpy() if filtro else None
+        agendadas = agendar_figuras(
+            pool, "utils.hipoteses", pendentes, caminho_tratados(), COLUNAS,
+            {nome: modelos[nome] for nome in prontos}, linhas=linhas)
+
+    def exibir(figura_id):
+        """Exibe a figura `figura_id` da página, construindo-a apenas se não estiver em cache."""
+        opcoes = {"resumo": resumo} if figura_id in do_resumo else {}
+        if interativo and figura_id in hipoteses.GRAFICOS:
+            construir_grafico = hipoteses.GRAFICOS[figura_id]
+            exibir_grafico(versao, figura_id, lambda: construir_grafico(data, modelos, **opcoes))
+            return
+        if figura_id in agendadas:
+            construir = agendadas[figura_id]
+        else:
+            construir_figura = hipoteses.FIGURAS[figura_id][1]
+            construir = lambda: construir_figura(data, modelos, **opcoes)
+        exibir_figura(versao, figura_id, construir)
 
 
 # -----------------------------
 # 4.1 - Hipótese 1: Tabagismo e Colesterol HDL
 # -----------------------------
+definir_secao("4.1")
 st.header("4.1 - Tabagismo e Colesterol HDL")
 
 st.write("""
@@ -42,30 +152,7 @@ st.write("""
 """)
 
 # Criar gráficos lado a lado
-fig, ax = plt.subplots(1, 2, figsize=(12, 5))
-
-# Stripplot com símbolos diferentes para fumantes e não fumantes
-sns.stripplot(x="Smoking", y="CholesterolHDL", data=data, ax=ax[0], jitter=0.2, palette="Set1", marker='s', label="Não Fumante")
-sns.stripplot(x="Smoking", y="CholesterolHDL", data=data, ax=ax[0], jitter=0.2, palette="Set1", marker='^', label="Fumante")
-ax[0].set_title("Relação entre Fumo e Colesterol HDL")
-ax[0].set_xlabel("Fumante (0 = Não, 1 = Sim)")
-ax[0].set_ylabel("Colesterol HDL")
-ax[0].legend()
-
-# Boxplot com padrões visuais para acessibilidade
-box = sns.boxplot(x="Smoking", y="CholesterolHDL", data=data, ax=ax[1], palette="Set2")
-ax[1].set_title("Distribuição de Colesterol HDL entre Fumantes e Não-Fumantes")
-ax[1].set_xlabel("Fumante (0 = Não, 1 = Sim)")
-ax[1].set_ylabel("Colesterol HDL")
-
-# Adicionando padrões visuais nos boxplots
-for i, patch in enumerate(box.patches):
-    if i % 2 == 0:
-        patch.set_hatch("//")  # Listras
-    else:
-        patch.set_hatch("o")  # Bolinhas
-
-st.pyplot(fig)
+exibir("tabagismo_hdl")
 
 # Explicação detalhada dos gráficos
 st.markdown("""
@@ -79,52 +166,27 @@ O segundo gráfico (Boxplot) exibe a distribuição do colesterol HDL para fuman
 (listras e bolinhas) para cada grupo. Esse gráfico permite uma visualização clara da mediana e da dispersão dos dados.
 """)
 
-# Regressão Logística
-X = data["CholesterolHDL"].values.reshape(-1, 1)
-y = data["Smoking"]
-x_train, x_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-clf = LogisticRegression(random_state=0).fit(x_train, y_train)
-
 # Criando gráfico de regressão logística
-fig, ax = plt.subplots(figsize=(8, 5))
-sns.scatterplot(data=data, x="CholesterolHDL", y="Smoking", palette="colorblind", hue=True, legend=False, ax=ax)
-
-textstr = f'β1: {round(float(clf.coef_[0][0]), 3)}'
-props = dict(boxstyle='round', facecolor='white', alpha=0.5)
-ax.text(0.95, 0.7, textstr, transform=ax.transAxes, fontsize=12,
-        verticalalignment='center', horizontalalignment='right', bbox=props)
-
-x_test_range = np.linspace(20, 100, 300)
-loss = expit(x_test_range * clf.coef_ + clf.intercept_).ravel()
-plt.plot(x_test_range, loss, label="Logistic Regression Model", color='red', linewidth=3)
-plt.xlabel("CholesterolHDL")
-plt.ylabel("Smoking")
-plt.legend()
-st.pyplot(fig)
+exibir("tabagismo_hdl_regressao")
 
-st.markdown("""
+validada, resultado = hipoteses.resumir_conclusao(reamostragem, "tabagismo_hdl")
+st.markdown(f"""
 **Explicação da Regressão Logística:**
 
 A regressão logística foi usada para verificar a relação entre tabagismo e colesterol HDL. O valor do coeficiente β1 indica o impacto do colesterol HDL sobre a probabilidade de um indivíduo ser fumante.
 
-Se β1 fosse negativo e significativo, validaria a hipótese de que fumantes possuem menor colesterol HDL. No entanto, β1 = -0.003, mostrando que não há diferença estatisticamente relevante entre fumantes e não fumantes.
+Se β1 fosse negativo e significativo, validaria a hipótese de que fumantes possuem menor colesterol HDL. Com β1 = {modelos["tabagismo_hdl"]["coef"]:.3f}, na comparação entre fumantes e não fumantes {resultado}; portanto, a hipótese é **{"validada" if validada else "refutada"}**.
 """)
 
 
 # Criar distribuição acumulada (CDF)
-fig, ax = plt.subplots(figsize=(8, 5))
-sns.ecdfplot(data=data, x="CholesterolHDL", hue="Smoking", palette=["blue", "red"], ax=ax)
-ax.set_title("Função de Distribuição Acumulada - CholesterolHDL vs Smoking")
-ax.set_xlabel("Nível de Colesterol HDL")
-ax.set_ylabel("Probabilidade Acumulada")
-ax.legend(title="Fumante", labels=["Não", "Sim"])
-st.pyplot(fig)
+exibir("tabagismo_hdl_cdf")
 
-st.markdown("""
+st.markdown(f"""
 **Análise da Distribuição Acumulada (CDF):**
 - A CDF permite visualizar a diferença na distribuição de colesterol HDL entre fumantes e não fumantes.
 - Se a curva dos fumantes estiver mais à esquerda, indica menores níveis de colesterol HDL.
-- Caso contrário, não há evidência significativa de diferença entre os grupos.
+- Na diferença das médias de colesterol HDL, {hipoteses.resumir_conclusao(reamostragem, "hdl_tabagismo")[1]}.
 """)
 
 
@@ -134,6 +196,7 @@ st.markdown("---")
 # -----------------------------
 # 4.2 - Hipótese 2: Histórico Familiar e Diagnóstico de Alzheimer
 # -----------------------------
+definir_secao("4.2")
 st.header("4.2 - Histórico Familiar e Diagnóstico de Alzheimer")
 
 st.write("""
@@ -145,32 +208,7 @@ st.write("""
 """)
 
 # Criar gráfico de barras com padrões visuais alternados
-fig, ax = plt.subplots(figsize=(8, 6))
-
-# Definição de padrões visuais alternados
-patterns = ["//", "//", "o", "o"]  # Alternância entre listras e bolinhas
-colors = ["gray", "blue"]
-
-# Criar barras
-bars = sns.countplot(x="FamilyHistoryAlzheimers", hue="Diagnosis", data=data, ax=ax, palette=colors)
-ax.set_title("Histórico Familiar vs. Diagnóstico")
-ax.set_xlabel("Histórico Familiar (0 = Não, 1 = Sim)")
-ax.set_ylabel("Contagem")
-
-# Aplicando padrões alternados para cada barra
-for i, bar in enumerate(bars.patches):
-    bar.set_hatch(patterns[i % len(patterns)])
-
-# Criando legenda com padrões visuais
-legend_patches = [
-    Patch(facecolor=colors[0], hatch="//", label="Hist. Familiar - Negativo (0)"),
-    Patch(facecolor=colors[0], hatch="o", label="Hist. Familiar - Positivo (1)"),
-    Patch(facecolor=colors[1], hatch="//", label="Diagnóstico Negativo"),
-    Patch(facecolor=colors[1], hatch="o", label="Diagnóstico Positivo")
-]
-ax.legend(handles=legend_patches, title="Legenda")
-
-st.pyplot(fig)
+exibir("historico_diagnostico_barras")
 
 # Explicação detalhada do gráfico de barras
 st.markdown("""
@@ -182,9 +220,23 @@ apresentam uma maior quantidade de diagnósticos negativos em comparação com p
 também apresentam uma quantidade maior de diagnósticos negativos do que positivos, mas a diferença entre os grupos não é tão expressiva visualmente.
 """)
 
+# Testes sobre a tabela de contingência (ver utils/contingencia.py)
+st.subheader("Análise Estatística - Qui-Quadrado e Teste Exato de Fisher")
+st.write(
+    f"**Qui-quadrado**: χ² = {contingencia['chi2']:.3f}, p-value = {contingencia['p_chi2']:.4f}; "
+    f"**Fisher**: p-value = {contingencia['p_fisher']:.4f}"
+)
+st.write(
+    f"**Razão de chances** (diagnóstico positivo com histórico vs. sem histórico): {contingencia['odds_ratio']:.3f} "
+    f"(IC 95% [{contingencia['or_inferior']:.3f}, {contingencia['or_superior']:.3f}])"
+)
+if contingencia["p_fisher"] < 0.05:
+    st.write("- Associação significativa entre histórico familiar e diagnóstico")
+else:
+    st.write("- Sem associação significativa entre histórico familiar e diagnóstico")
+
 # Criar Pair Plot
-fig = sns.pairplot(data, vars=['FamilyHistoryAlzheimers', 'Diagnosis'], hue="FamilyHistoryAlzheimers", palette="husl", height=3)
-st.pyplot(fig.fig)
+exibir("historico_diagnostico_pairplot")
 
 # Explicação do Pair Plot
 st.markdown("""
@@ -194,51 +246,29 @@ O Pair Plot exibe diferentes relações entre as variáveis FamilyHistoryAlzheim
 No entanto, a separação entre os pontos não indica uma correlação forte entre histórico familiar e diagnóstico positivo para Alzheimer.
 """)
 
-# Regressão Logística
-X = data[["FamilyHistoryAlzheimers"]]
-y = data["Diagnosis"]
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-log_reg = LogisticRegression()
-log_reg.fit(X_train, y_train)
-y_pred = log_reg.predict(X_test)
-
 # Criar gráfico de regressão logística
-fig, ax = plt.subplots(figsize=(8, 6))
-plt.scatter(data['FamilyHistoryAlzheimers'], data['Diagnosis'], color='blue', alpha=0.5, label="Dados Observados")
-X_test_range = np.linspace(0, 1, 500).reshape(-1, 1)
-y_prob = expit(X_test_range * log_reg.coef_[0][0] + log_reg.intercept_[0])
-plt.plot(X_test_range, y_prob, color='red', linewidth=2, label="Curva Logística")
-plt.title("Regressão Logística: Diagnóstico x Histórico Familiar", fontsize=14)
-plt.xlabel("FamilyHistoryAlzheimers (0 = Não, 1 = Sim)", fontsize=12)
-plt.ylabel("Probabilidade de Diagnóstico Positivo", fontsize=12)
-plt.legend()
-st.pyplot(fig)
+exibir("historico_diagnostico_regressao")
 
 # Explicação da regressão logística
-st.markdown("""
+validada, resultado = hipoteses.resumir_conclusao(reamostragem, "diagnostico_historico")
+st.markdown(f"""
 **Explicação da Regressão Logística:**
 
 A regressão logística foi aplicada para verificar se o histórico familiar influencia o diagnóstico de Alzheimer. 
-O coeficiente β1 obtido na regressão é próximo de zero, indicando que o histórico familiar tem um impacto muito pequeno 
-ou inexistente sobre a probabilidade de um diagnóstico positivo.
+O coeficiente β1 obtido na regressão é {modelos["historico_diagnostico"]["coef"]:.3f}. Comparando a proporção de diagnósticos 
+positivos entre pacientes com e sem histórico familiar, {resultado}.
 
-Portanto, a hipótese é **refutada**.
+Portanto, a hipótese é **{"validada" if validada else "refutada"}**.
 """)
 
 # Criar gráfico de densidade (PDF)
-fig, ax = plt.subplots(figsize=(8, 5))
-sns.kdeplot(data=data, x="Diagnosis", hue="FamilyHistoryAlzheimers", fill=True, palette=["gray", "blue"], ax=ax)
-ax.set_title("Função de Densidade de Probabilidade - Diagnóstico de Alzheimer vs Histórico Familiar")
-ax.set_xlabel("Diagnóstico de Alzheimer (0 = Negativo, 1 = Positivo)")
-ax.set_ylabel("Densidade de Probabilidade")
-ax.legend(title="Histórico Familiar", labels=["Não", "Sim"])
-st.pyplot(fig)
+exibir("historico_diagnostico_pdf")
 
-st.markdown("""
+st.markdown(f"""
 **Análise da Função de Densidade de Probabilidade (PDF):**
 - A PDF mostra a distribuição de probabilidade dos diagnósticos de Alzheimer entre pacientes com e sem histórico familiar.
 - Se a curva dos pacientes com histórico familiar estiver mais deslocada para diagnósticos positivos, isso indicaria uma correlação.
-- Caso contrário, não há uma relação estatisticamente significativa.
+- Nos dados, {hipoteses.resumir_conclusao(reamostragem, "diagnostico_historico")[1]}.
 """)
 
 
@@ -250,6 +280,7 @@ st.markdown("---")
 # -----------------------------
 # 4.3 - Hipótese 3: Qualidade da Dieta e MMSE
 # -----------------------------
+definir_secao("4.3")
 st.header("4.3 - Qualidade da Dieta e MMSE")
 
 st.write("""
@@ -259,47 +290,23 @@ st.write("""
 """)
 
 # Gráfico de dispersão
-fig, ax = plt.subplots(figsize=(3, 2))
-p = sns.jointplot(data=data, x="DietQuality", y="MMSE", kind="scatter", marginal_kws=dict(bins=30, fill=False))
-p.fig.suptitle("DietQuality x MMSE")
-p.fig.tight_layout()
-p.fig.text(0.5, -0.05, "O gráfico de dispersão posiciona as amostras no espaço dos atributos DietQuality e MMSE nos eixos X e Y acompanhado de suas distribuições. Não é possível observar visualmente nenhuma tendência.", wrap=True, horizontalalignment='center')
-st.pyplot(p.fig)
-
-# Regressão Linear
-X = data[["DietQuality"]]
-Y = data[["MMSE"]]
-x_train, x_test, y_train, y_test = train_test_split(X, Y, test_size=0.2, random_state=42)
-
-clf = LinearRegression().fit(x_train, y_train)
-
-y_pred = clf.predict(x_test)
+exibir("dieta_mmse_dispersao")
 
 # Gráfico de regressão linear
-fig, ax = plt.subplots(figsize=(8, 6))
-sns.scatterplot(x=x_test.values.reshape(1,-1)[0], y=y_test.values.reshape(1,-1)[0], label="Dados Reais")
-sns.scatterplot(x=x_test.values.reshape(1,-1)[0], y=y_pred.reshape(1,-1)[0], label="Previsões")
-plt.title("Regressão Linear - DietQuality x MMSE")
-plt.xlabel("DietQuality")
-plt.ylabel("MMSE")
-st.pyplot(fig)
+exibir("dieta_mmse_regressao")
 
 
 # Histograma adicional
-fig, ax = plt.subplots(figsize=(8, 5))
-sns.histplot(data, x="DietQuality", kde=True, bins=30, color="blue", alpha=0.5)
-ax.set_title("Histograma - Distribuição da Qualidade da Dieta")
-ax.set_xlabel("Qualidade da Dieta")
-ax.set_ylabel("Frequência")
-st.pyplot(fig)
+exibir("dieta_histograma")
 
 # Explicação detalhada
+validada, resultado = hipoteses.resumir_conclusao(reamostragem, "dieta_mmse")
 st.markdown(f"""
 **Análise dos Gráficos e Mineração de Dados**
 
 - Se a hipótese for verdadeira, veremos uma correlação positiva entre **DietQuality** e **MMSE**.
-- O coeficiente da **Regressão Linear** foi **{clf.coef_[0][0]:.4f}**.
-- Como é muito próximo de zero, a hipótese foi **refutada**.
+- O coeficiente da **Regressão Linear** foi **{modelos["dieta_mmse"]["coef"]:.4f}**.
+- Na inclinação testada por permutação, {resultado}; portanto, a hipótese foi **{"validada" if validada else "refutada"}**.
 """)
 
 
@@ -311,6 +318,7 @@ st.markdown("---")
 # -----------------------------
 # 4.4 - Hipótese 4: Atividade Física e Sintomas Cognitivos
 # -----------------------------
+definir_secao("4.4")
 st.header("4.4 - Atividade Física e Sintomas Cognitivos")
 
 st.write("""
@@ -320,53 +328,21 @@ st.write("""
 """)
 
 # Criando os boxplots com destaque para as medianas
-fig, ax = plt.subplots(1, 2, figsize=(14, 6))
-
-# Boxplot para Confusion
-sns.boxplot(data=data, x='Confusion', y='PhysicalActivity', showfliers=False, palette='pastel', ax=ax[0])
-medians_confusion = data.groupby('Confusion')['PhysicalActivity'].median()
-for i, median in enumerate(medians_confusion):
-    ax[0].text(i, median + 0.1, f"{median:.2f}", ha='center', color='blue', fontsize=10)
-ax[0].set_title('Atividade Física vs Confusion')
-ax[0].set_xlabel('Confusion (0: Não, 1: Sim)')
-ax[0].set_ylabel('Atividade Física')
-
-# Boxplot para Forgetfulness
-sns.boxplot(data=data, x='Forgetfulness', y='PhysicalActivity', showfliers=False, palette='pastel', ax=ax[1])
-medians_forgetfulness = data.groupby('Forgetfulness')['PhysicalActivity'].median()
-for i, median in enumerate(medians_forgetfulness):
-    ax[1].text(i, median + 0.1, f"{median:.2f}", ha='center', color='blue', fontsize=10)
-ax[1].set_title('Atividade Física vs Forgetfulness')
-ax[1].set_xlabel('Forgetfulness (0: Não, 1: Sim)')
-ax[1].set_ylabel('Atividade Física')
-
-st.pyplot(fig)
+exibir("atividade_sintomas_boxplots")
 
 # Explicação detalhada dos gráficos
-st.markdown("""
+medianas = reamostragem.set_index("conclusao")["estatistica"]
+st.markdown(f"""
 **Análise dos Boxplots:**
 
 - A distribuição de atividade física é analisada em relação aos sintomas de **Confusion** e **Forgetfulness**.
-- Medianas destacadas mostram pequenas diferenças entre os grupos.
+- Medianas destacadas: a mediana sem o sintoma menos a mediana com o sintoma é {medianas["atividade_confusao"]:.3f}
+  para **Confusion** e {medianas["atividade_esquecimento"]:.3f} para **Forgetfulness**.
 - Se a hipótese for verdadeira, a atividade física dos pacientes sem sintomas deve ser visivelmente maior.
 """)
 
 # Histogramas
-fig, ax = plt.subplots(1, 2, figsize=(12, 6))
-
-# Histograma para PhysicalActivity por Confusion
-sns.histplot(data=data, x="PhysicalActivity", hue="Confusion", kde=True, multiple="stack", palette="Set2", ax=ax[0])
-ax[0].set_title('Distribuição de PhysicalActivity por Confusion')
-ax[0].set_xlabel('Physical Activity (0 a 10)')
-ax[0].set_ylabel('Frequência')
-
-# Histograma para PhysicalActivity por Forgetfulness
-sns.histplot(data=data, x="PhysicalActivity", hue="Forgetfulness", kde=True, multiple="stack", palette="Set2", ax=ax[1])
-ax[1].set_title('Distribuição de PhysicalActivity por Forgetfulness')
-ax[1].set_xlabel('Physical Activity (0 a 10)')
-ax[1].set_ylabel('Frequência')
-
-st.pyplot(fig)
+exibir("atividade_sintomas_histogramas")
 
 
 
@@ -377,9 +353,7 @@ st.pyplot(fig)
 st.subheader("Análise Estatística - Teste T")
 
 # Teste T para Confusion
-group0 = data[data['Confusion'] == 0]['PhysicalActivity']
-group1 = data[data['Confusion'] == 1]['PhysicalActivity']
-t_stat, p_value = ttest_ind(group0, group1)
+t_stat, p_value = testes_t.loc["Confusion", ["t", "p"]]
 st.write(f"**Teste T para Confusion**: t-statistic = {t_stat:.3f}, p-value = {p_value:.4f}")
 if p_value < 0.05:
     st.write("- Diferença significativa entre os grupos")
@@ -387,9 +361,7 @@ else:
     st.write("- Sem diferença significativa entre os grupos")
 
 # Teste T para Forgetfulness
-group0 = data[data['Forgetfulness'] == 0]['PhysicalActivity']
-group1 = data[data['Forgetfulness'] == 1]['PhysicalActivity']
-t_stat, p_value = ttest_ind(group0, group1)
+t_stat, p_value = testes_t.loc["Forgetfulness", ["t", "p"]]
 st.write(f"**Teste T para Forgetfulness**: t-statistic = {t_stat:.3f}, p-value = {p_value:.4f}")
 if p_value < 0.05:
     st.write("- Diferença significativa entre os grupos")
@@ -398,19 +370,14 @@ else:
     
     
 # Criar distribuição acumulada (CDF)
-fig, ax = plt.subplots(figsize=(8, 5))
-sns.ecdfplot(data=data, x="PhysicalActivity", hue="Confusion", palette=["blue", "red"], ax=ax)
-ax.set_title("Função de Distribuição Acumulada - Atividade Física vs Sintomas Cognitivos")
-ax.set_xlabel("Atividade Física")
-ax.set_ylabel("Probabilidade Acumulada")
-ax.legend(title="Sintomas Cognitivos", labels=["Não", "Sim"])
-st.pyplot(fig)    
+exibir("atividade_sintomas_cdf")
 
-st.markdown("""
+st.markdown(f"""
 **Análise da Distribuição Acumulada (CDF):**
 - A CDF permite visualizar a diferença na distribuição de atividade física entre pacientes com e sem sintomas cognitivos.
 - Se a curva dos pacientes com sintomas estiver mais à esquerda, indica menor nível de atividade física.
-- Caso contrário, não há evidência significativa de diferença entre os grupos.
+- Na diferença das medianas para **Confusion**, {hipoteses.resumir_conclusao(reamostragem, "atividade_confusao")[1]}.
+- Na diferença das medianas para **Forgetfulness**, {hipoteses.resumir_conclusao(reamostragem, "atividade_esquecimento")[1]}.
 """)
 
 
@@ -420,6 +387,7 @@ st.markdown("---")
 # -----------------------------
 # 4.5 - Hipótese 5: Atividade Física e Depressão
 # -----------------------------
+definir_secao("4.5")
 st.header("4.5 - Atividade Física e Depressão")
 
 st.write("""
@@ -429,24 +397,7 @@ st.write("""
 """)
 
 # Criando os boxplots e gráficos de violino
-fig, ax = plt.subplots(1, 2, figsize=(14, 6))
-
-# Boxplot para Depressão
-sns.boxplot(data=data, x='Depression', y='PhysicalActivity', showfliers=False, palette='coolwarm', ax=ax[0])
-medians_depression = data.groupby('Depression')['PhysicalActivity'].median()
-for i, median in enumerate(medians_depression):
-    ax[0].text(i, median + 0.1, f"{median:.2f}", ha='center', color='blue', fontsize=10)
-ax[0].set_title('Atividade Física vs Depressão')
-ax[0].set_xlabel('Depression (0: Não, 1: Sim)')
-ax[0].set_ylabel('Atividade Física')
-
-# Gráfico de Violino
-sns.violinplot(data=data, x='Depression', y='PhysicalActivity', palette='coolwarm', split=True, ax=ax[1])
-ax[1].set_title('Distribuição de Atividade Física por Depressão')
-ax[1].set_xlabel('Depression (0: Não, 1: Sim)')
-ax[1].set_ylabel('Atividade Física')
-
-st.pyplot(fig)
+exibir("atividade_depressao")
 
 # Explicação detalhada dos gráficos
 st.markdown("""
@@ -461,9 +412,7 @@ st.markdown("""
 st.subheader("Análise Estatística - Teste T")
 
 # Teste T para Depressão
-group0 = data[data['Depression'] == 0]['PhysicalActivity']
-group1 = data[data['Depression'] == 1]['PhysicalActivity']
-t_stat, p_value = ttest_ind(group0, group1)
+t_stat, p_value = testes_t.loc["Depression", ["t", "p"]]
 st.write(f"**Teste T para Depressão**: t-statistic = {t_stat:.3f}, p-value = {p_value:.4f}")
 if p_value < 0.05:
     st.write("- Diferença significativa entre os grupos")
@@ -472,40 +421,26 @@ else:
 
 # Regressão Logística
 st.subheader("Regressão Logística")
-scaler = StandardScaler()
-data['PhysicalActivity_scaled'] = scaler.fit_transform(data[['PhysicalActivity']])
-
-X = data[['PhysicalActivity_scaled']].values
-y = data['Depression'].values
-
-model = LogisticRegression()
-model.fit(X, y)
-
-beta_0 = model.intercept_[0]
-beta_1 = model.coef_[0][0]
+beta_0 = modelos["atividade_depressao"]["intercept"]
+beta_1 = modelos["atividade_depressao"]["coef"]
 
 st.write(f"**Coeficientes da Regressão Logística:** β0 = {beta_0:.4f}, β1 = {beta_1:.4f}")
-if beta_1 < 0:
-    st.write("- Hipótese validada: Pacientes com depressão tendem a praticar menos atividade física.")
+validada, resultado = hipoteses.resumir_conclusao(reamostragem, "atividade_depressao")
+if validada:
+    st.write(f"- Hipótese validada: Pacientes com depressão tendem a praticar menos atividade física; {resultado}.")
 else:
-    st.write("- Hipótese refutada: Não há evidência de que pacientes com depressão pratiquem menos atividade física.")
+    st.write(f"- Hipótese refutada: Na diferença das médias de atividade física, {resultado}.")
 
 
 # Criar a Função de Distribuição Acumulada (CDF)
-fig, ax = plt.subplots(figsize=(8, 5))
-sns.ecdfplot(data=data, x="PhysicalActivity", hue="Depression", palette=["gray", "blue"], ax=ax)
-ax.set_title("Função de Distribuição Acumulada - Atividade Física vs Depressão")
-ax.set_xlabel("Atividade Física (0 a 10)")
-ax.set_ylabel("Probabilidade Acumulada")
-ax.legend(title="Depressão", labels=["Não", "Sim"])
-st.pyplot(fig)
+exibir("atividade_depressao_cdf")
 
-st.markdown("""
+st.markdown(f"""
 **Análise da CDF:**
 
 - A CDF permite visualizar a diferença na distribuição de atividade física entre pacientes com e sem depressão.
 - Se a curva dos pacientes com depressão estiver mais à esquerda, indica menores níveis de atividade física.
-- Caso contrário, não há evidência significativa de diferença entre os grupos.
+- Na diferença das médias de atividade física, {resultado}.
 """)
 
 
@@ -513,6 +448,149 @@ st.markdown("""
 st.markdown("---")
 
 
+# -----------------------------
+# Avaliação dos Modelos
+# -----------------------------
+definir_secao("avaliacao")
+st.header("Avaliação dos Modelos")
+
+st.write("""
+Os coeficientes acima vêm de um único ajuste. Para verificar se as conclusões se mantêm, cada regressão é
+avaliada por validação cruzada em 5 partes (acurácia nas regressões logísticas e R² na regressão linear) e
+o coeficiente de cada uma recebe um intervalo de confiança de 95% por bootstrap (200 réplicas).
+""")
+
+if st.toggle("Executar validação cruzada e bootstrap dos modelos"):
+    if pacote is not None:
+        avaliacao = pacote.tabela("avaliacao")
+    else:
+        # Folds e réplicas são ajustados em paralelo e guardados em disco por versão dos dados (ver utils/avaliacao.py)
+        avaliacao = avaliacao_em_cache(versao, hipoteses.MODELOS, data)
+    st.dataframe(avaliacao, hide_index=True)
+    for linha in avaliacao.itertuples():
+        contem_zero = linha.ic_inferior <= 0 <= linha.ic_superior
+        st.write(
+            f"- **{linha.modelo}** ({linha.variavel}): {linha.metrica} = {linha.cv_media:.3f} ± {linha.cv_desvio:.3f}; "
+            f"IC 95% do coeficiente [{linha.ic_inferior:.4f}, {linha.ic_superior:.4f}] "
+            + ("contém zero, sem evidência de efeito." if contem_zero else "não contém zero, efeito consistente.")
+        )
+
+st.markdown("---")
+
+
+# -----------------------------
+# Testes por Reamostragem
+# -----------------------------
+definir_secao("reamostragem")
+st.header("Testes por Reamostragem")
+
+st.write(f"""
+As conclusões das hipóteses acima são tiradas de testes que não supõem normalidade: cada diferença de médias
+ou de medianas e cada coeficiente de regressão recebe um p-valor por teste de permutação e um intervalo de
+confiança de 95% por bootstrap, com até {REPLICAS} réplicas de cada. Em coortes grandes as réplicas são
+reduzidas para limitar o tempo de cálculo; a coluna `replicas` da tabela mostra quantas foram usadas.
+""")
+
+# A tabela já foi calculada no início da página, para as conclusões de cada hipótese
+if st.toggle("Exibir testes de permutação e bootstrap"):
+    st.dataframe(reamostragem, hide_index=True)
+    for linha in reamostragem.itertuples():
+        significativo = linha.p_valor < 0.05
+        st.write(
+            f"- **{linha.secao} {linha.conclusao}** ({linha.teste}, {linha.desfecho} ~ {linha.variavel}): "
+            f"estatística = {linha.estatistica:.4f}, p = {linha.p_valor:.4f}, "
+            f"IC 95% [{linha.ic_inferior:.4f}, {linha.ic_superior:.4f}] "
+            + ("— efeito significativo." if significativo else "— sem evidência de efeito.")
+        )
+
+st.markdown("---")
+
+
+# -----------------------------
+# Triagem de Associações
+# -----------------------------
+definir_secao("triagem")
+st.header("Triagem de Associações")
+
+st.write("""
+Além das hipóteses acima, é possível comparar de uma só vez todas as medições contínuas entre os grupos
+de todas as variáveis binárias. Os p-valores são corrigidos para comparações múltiplas (Benjamini-Hochberg).
+""")
+
+def coorte_original():
+    """Linhas da coorte selecionada no dataset original, que tem todas as colunas usadas pela triagem."""
+    try:
+        bruto = carregar_dados(RAW_DATA_PATH)
+        versao_bruto = versao_dados(RAW_DATA_PATH)
+    except FileNotFoundError:
+        st.error(f"Erro: O arquivo {RAW_DATA_PATH} não foi encontrado. Verifique se o caminho está correto.")
+        st.stop()
+    return filtrar(bruto, versao_bruto, filtro)[0]
+
+
+if st.toggle("Executar triagem de todas as combinações"):
+    if pacote is not None:
+        triagem = pacote.tabela("triagem")
+    elif filtro:
+        triagem = testes_t_em_lote(coorte_original(), CONTINUOUS_COLUMNS, BINARY_COLUMNS)
+    else:
+        # Estatísticas suficientes mantidas de forma incremental: quando o dataset
+        # recebe novas linhas, apenas o lote acrescentado é lido (ver utils/incremental.py)
+        try:
+            resumo = resumo_incremental()
+        except FileNotFoundError:
+            st.error(f"Erro: O arquivo {RAW_DATA_PATH} não foi encontrado. Verifique se o caminho está correto.")
+            st.stop()
+        triagem = resumo.testes_t(CONTINUOUS_COLUMNS, BINARY_COLUMNS)
+    triagem = triagem.sort_values("p_ajustado")
+    st.write(f"{len(triagem)} testes realizados; {(triagem['p_ajustado'] < 0.05).sum()} com p-valor ajustado < 0.05.")
+    st.dataframe(
+        triagem[["grupo", "desfecho", "media0", "media1", "t", "p", "p_welch", "hedges_g", "p_ajustado"]],
+        hide_index=True,
+    )
+
+st.markdown("---")
+
+
+# -----------------------------
+# Associações entre Variáveis Categóricas
+# -----------------------------
+definir_secao("associacoes")
+st.header("Associações entre Variáveis Categóricas")
+
+st.write("""
+As tabelas de contingência de todos os pares de variáveis categóricas (sintomas, histórico médico, gênero,
+etnia e escolaridade) são contadas em uma única passada pelos dados. Cada par recebe o teste qui-quadrado,
+o V de Cramér e, nas tabelas 2x2, o teste exato de Fisher e a razão de chances, com p-valores corrigidos
+para comparações múltiplas (Benjamini-Hochberg).
+""")
+
+if st.toggle("Executar testes de associação de todos os pares"):
+    if pacote is not None:
+        associacoes = pacote.tabela("associacoes")
+    elif filtro:
+        associacoes = TabelasContingencia.de_dados(coorte_original()).testes()
+    else:
+        # Tabelas mantidas de forma incremental junto com a triagem (ver utils/incremental.py)
+        try:
+            resumo = resumo_incremental()
+        except FileNotFoundError:
+            st.error(f"Erro: O arquivo {RAW_DATA_PATH} não foi encontrado. Verifique se o caminho está correto.")
+            st.stop()
+        associacoes = resumo.tabelas.testes()
+    associacoes = associacoes.sort_values("p_chi2_ajustado")
+    st.write(
+        f"{len(associacoes)} pares testados; {(associacoes['p_chi2_ajustado'] < 0.05).sum()} com p-valor ajustado < 0.05."
+    )
+    st.dataframe(
+        associacoes[["a", "b", "n", "chi2", "gl", "p_chi2", "cramer_v", "p_fisher", "odds_ratio",
+                     "or_inferior", "or_superior", "p_chi2_ajustado"]],
+        hide_index=True,
+    )
+
+st.markdown("---")
+
+
 # Conclusão
 st.subheader("Conclusão")
 st.write("""
@@ -521,4 +599,7 @@ Foi realizada a exploração de uma base de dados sobre a Doença de Alzheimer,
 As hipóteses abordaram questões importantes, como os efeitos do tabagismo nos níveis de colesterol HDL, a influência do histórico familiar no diagnóstico da doença e o impacto de fatores como dieta e atividade física na saúde cognitiva e física. As visualizações desempenham um papel fundamental na comunicação das hipóteses apresentadas, tornando os resultados mais intuitivos e acessíveis.
 
 De maneira geral, o trabalho proporcionou um aprendizado sobre o uso de técnicas de análise e mineração de dados, bem como sobre a importância da qualidade e da organização dos dados para se obter insights.
-""")
\ No newline at end of file
+""")
+
+# Painel de diagnóstico de desempenho (oculto; ver utils/instrumentacao.py)
+painel_diagnostico()
@@ -0,0 +1,342 @@
+"""Agregados de histograma e KDE calculados com NumPy.
+
+Em vez de entregar todas as linhas ao matplotlib/seaborn, as contagens por
+bin e a curva KDE de cada coluna são calculadas uma única vez, de forma
+vetorizada para todas as colunas, e os gráficos desenham apenas esses
+agregados. O custo de desenho passa a ser O(bins) e não O(linhas).
+
+A KDE é aproximada por binning: as amostras são contadas em uma grade fina
+e convoluídas com o kernel gaussiano via FFT, usando a largura de banda de
+Scott, como o `gaussian_kde` usado pelo seaborn.
+
+Para pares de variáveis contínuas, `densidade_2d` conta os pontos em uma
+grade 2D, desenhada como imagem no lugar de um marcador por linha.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from pandas.api.types import is_numeric_dtype
+
+# Número de linhas processadas por vez, para limitar a memória temporária
+CHUNK_SIZE = 262_144
+
+# Resolução da grade usada na KDE
+KDE_GRIDSIZE = 512
+
+# Quantis calculados por padrão para cada coluna
+QUANTIS = (0.25, 0.5, 0.75)
+
+# Colunas inteiras com até este número de valores distintos recebem tabela de frequências
+MAX_CATEGORIAS = 20
+
+Histograma = namedtuple("Histograma", ["edges", "counts", "kde_x", "kde_y"])
+
+# Resumo de uma coluna: contagem de valores válidos e nulos, limites, média,
+# desvio padrão, quantis {nível: valor}, frequências (pd.Series valor -> contagem,
+# apenas para colunas discretas, senão None) e histograma
+ResumoColuna = namedtuple(
+    "ResumoColuna", ["n", "nulos", "minimo", "maximo", "media", "desvio", "quantis", "frequencias", "histograma"],
+)
+
+
+def _blocos(data, columns, chunk_size):
+    for inicio in range(0, len(data), chunk_size):
+        yield data.iloc[inicio:inicio + chunk_size].loc[:, columns].to_numpy(dtype=np.float64)
+
+
+def _contar(bloco, minimos, amplitudes, bins):
+    """Contagens (colunas x bins) de um bloco de linhas, em um único bincount."""
+    n_colunas = bloco.shape[1]
+    validos = ~np.isnan(bloco)
+    indices = np.floor((bloco - minimos) / amplitudes * bins)
+    np.clip(indices, 0, bins - 1, out=indices)
+    indices += np.arange(n_colunas) * bins
+    planos = indices[validos].astype(np.int64)
+    return np.bincount(planos, minlength=n_colunas * bins).reshape(n_colunas, bins)
+
+
+def _kde_binada(contagens, minimos, amplitudes, larguras, n):
+    """Convolui as contagens da grade fina com um kernel gaussiano via FFT."""
+    n_colunas, grade = contagens.shape
+    passo = amplitudes / grade
+    sigma = larguras / passo  # largura de banda em unidades da grade
+
+    # Preenchimento com zeros evita que a convolução circular "dê a volta"
+    tamanho = 2 * grade
+    deslocamentos = np.fft.fftfreq(tamanho, 1 / tamanho)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kernel = np.exp(-0.5 * (deslocamentos[None, :] / sigma[:, None]) ** 2)
+        kernel /= np.sqrt(2 * np.pi) * sigma[:, None]
+    kernel[~np.isfinite(kernel)] = 0
+
+    espectro = np.fft.rfft(contagens, n=tamanho, axis=1) * np.fft.rfft(kernel, axis=1)
+    densidade = np.fft.irfft(espectro, n=tamanho, axis=1)[:, :grade]
+    # Densidade por unidade de x, normalizada pelo total de amostras
+    densidade /= passo[:, None] * np.maximum(n, 1)[:, None]
+    centros = minimos[:, None] + (np.arange(grade)[None, :] + 0.5) * passo[:, None]
+    return centros, np.clip(densidade, 0, None)
+
+
+def quantis_da_grade(contagens, inicio, passo, niveis):
+    """Quantis de uma coluna a partir das contagens em uma grade regular, interpolando dentro de cada célula."""
+    acumulada = np.cumsum(contagens)
+    total = acumulada[-1] if len(acumulada) else 0
+    if total == 0:
+        return np.full(len(niveis), np.nan)
+    alvos = np.asarray(niveis) * total
+    celulas = np.minimum(np.searchsorted(acumulada, alvos, side="left"), len(contagens) - 1)
+    anteriores = np.where(celulas > 0, acumulada[celulas - 1], 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fracoes = np.nan_to_num((alvos - anteriores) / contagens[celulas])
+    return inicio + (celulas + np.clip(fracoes, 0, 1)) * passo
+
+
+def histogramas_da_grade(contagens, inicio, passo, bins="auto"):
+    """`Histograma` de cada linha de `contagens` (grupos x células de uma grade regular), com bins comuns.
+
+    Cada bin junta células vizinhas da grade, então as contagens de esboços
+    combinados (somados) viram histogramas sem reler os dados. A largura é a
+    da regra `bins` ("auto", "fd" ou "sturges", como em `np.histogram_bin_edges`)
+    ou a de `bins` bins, arredondada para cima para um número inteiro de
+    células, sobre as células ocupadas de todos os grupos. A KDE de cada
+    grupo é a binada de `perfilar`, calculada sobre a própria grade e
+    escalada para a largura dos bins.
+    """
+    contagens = np.atleast_2d(np.asarray(contagens, dtype=np.int64))
+    total = contagens.sum(axis=0)
+    ocupadas = np.flatnonzero(total)
+    if not len(ocupadas):
+        return [Histograma(np.array([inicio, inicio + passo]), np.zeros(1, dtype=np.int64), None, None)
+                for _ in contagens]
+    primeira, ultima = ocupadas[0], ocupadas[-1] + 1
+    amplitude = (ultima - primeira) * passo
+    if isinstance(bins, str):
+        n = total.sum()
+        sturges = amplitude / (np.log2(n) + 1)
+        q1, q3 = quantis_da_grade(total, inicio, passo, [0.25, 0.75])
+        fd = 2 * (q3 - q1) * n ** (-1 / 3)
+        largura = {"sturges": sturges, "fd": fd, "auto": min(fd, sturges)}[bins]
+        if largura <= 0:
+            largura = sturges
+    else:
+        largura = amplitude / bins
+    # Mesmo número de bins da regra, cada um com um número inteiro de células (o último pode ser menor)
+    n_bins = max(1, int(np.ceil(amplitude / largura)))
+    por_bin = -(-(ultima - primeira) // n_bins)
+    n_bins = -(-(ultima - primeira) // por_bin)
+
+    trecho = np.zeros((len(contagens), n_bins * por_bin), dtype=np.int64)
+    trecho[:, :ultima - primeira] = contagens[:, primeira:ultima]
+    edges = inicio + (primeira + np.minimum(np.arange(n_bins + 1) * por_bin, ultima - primeira)) * passo
+
+    n = trecho.sum(axis=1)
+    centros = inicio + (primeira + np.arange(trecho.shape[1]) + 0.5) * passo
+    with np.errstate(divide="ignore", invalid="ignore"):
+        media = trecho @ centros / n
+        variancia = (trecho * (centros[None, :] - media[:, None]) ** 2).sum(axis=1) / (n - 1)
+    larguras = np.sqrt(np.clip(np.nan_to_num(variancia), 0, None)) * np.maximum(n, 1) ** (-1 / 5)
+    minimos = np.full(len(trecho), inicio + primeira * passo)
+    kde_x, kde_y = _kde_binada(trecho, minimos, np.full(len(trecho), trecho.shape[1] * passo), larguras, n)
+    kde_y *= (n * por_bin * passo)[:, None]
+
+    return [
+        Histograma(edges, trecho[i].reshape(n_bins, por_bin).sum(axis=1), kde_x[i], kde_y[i])
+        if larguras[i] > 0 else Histograma(edges, trecho[i].reshape(n_bins, por_bin).sum(axis=1), None, None)
+        for i in range(len(trecho))
+    ]
+
+
+def perfilar(data, columns=None, bins=30, quantis=QUANTIS, max_categorias=MAX_CATEGORIAS,
+             kde_gridsize=KDE_GRIDSIZE, chunk_size=CHUNK_SIZE):
+    """Calcula o `ResumoColuna` de cada coluna numérica em duas passadas sobre os dados.
+
+    A 1ª passada obtém os limites de todas as colunas; a 2ª calcula, para
+    todas as colunas de uma vez, contagens, momentos, histograma, grade da
+    KDE e as frequências das colunas com valores inteiros e no máximo
+    `max_categorias` valores distintos. Os quantis das colunas contínuas são
+    interpolados na grade fina da KDE (erro menor que amplitude / kde_gridsize);
+    os das colunas discretas são exatos, calculados a partir das frequências
+    com a mesma interpolação linear de `pd.Series.quantile`.
+
+    Retorna um dicionário {coluna: ResumoColuna}. A KDE do histograma está
+    escalada para a mesma unidade das contagens (densidade x total x largura
+    do bin), como no `sns.histplot(..., kde=True)`. Colunas constantes ficam sem KDE.
+    """
+    if columns is None:
+        # Categóricos de códigos numéricos (ver utils/esquema.py) são perfilados pelos códigos
+        columns = [
+            col for col, dtype in data.dtypes.items()
+            if is_numeric_dtype(dtype) or (isinstance(dtype, pd.CategoricalDtype) and is_numeric_dtype(dtype.categories))
+        ]
+    columns = list(columns)
+    n_colunas = len(columns)
+
+    # 1ª passada: limites de cada coluna e se todos os valores são inteiros
+    minimos = np.full(n_colunas, np.inf)
+    maximos = np.full(n_colunas, -np.inf)
+    inteiras = np.ones(n_colunas, dtype=bool)
+    for bloco in _blocos(data, columns, chunk_size):
+        if len(bloco):
+            minimos = np.fmin(minimos, np.nanmin(bloco, axis=0))
+            maximos = np.fmax(maximos, np.nanmax(bloco, axis=0))
+            inteiras &= np.all(np.isnan(bloco) | (bloco == np.round(bloco)), axis=0)
+    vazias = ~np.isfinite(minimos)
+    minimos[vazias] = 0.0
+    maximos[vazias] = 1.0
+    amplitudes = np.where(maximos > minimos, maximos - minimos, 1.0)
+
+    # Colunas discretas: cada valor inteiro entre o mínimo e o máximo ganha
+    # uma posição em um único vetor de frequências
+    discretas = np.flatnonzero(inteiras & ~vazias & (maximos - minimos + 1 <= max_categorias))
+    tamanhos = (maximos - minimos + 1)[discretas].astype(np.int64)
+    inicios = np.concatenate([[0], np.cumsum(tamanhos)])
+
+    # 2ª passada: contagens, grade fina da KDE, frequências e somas para o desvio padrão
+    contagens = np.zeros((n_colunas, bins), dtype=np.int64)
+    grade_fina = np.zeros((n_colunas, kde_gridsize), dtype=np.int64)
+    frequencias = np.zeros(inicios[-1], dtype=np.int64)
+    n = np.zeros(n_colunas, dtype=np.int64)
+    soma = np.zeros(n_colunas)
+    soma_quadrados = np.zeros(n_colunas)
+    for bloco in _blocos(data, columns, chunk_size):
+        contagens += _contar(bloco, minimos, amplitudes, bins)
+        grade_fina += _contar(bloco, minimos, amplitudes, kde_gridsize)
+        centrado = bloco - minimos  # reduz o erro numérico da soma dos quadrados
+        n += np.count_nonzero(~np.isnan(bloco), axis=0)
+        soma += np.nansum(centrado, axis=0)
+        soma_quadrados += np.nansum(centrado**2, axis=0)
+        if len(discretas):
+            posicoes = centrado[:, discretas] + inicios[:-1]
+            validos = ~np.isnan(posicoes)
+            frequencias += np.bincount(posicoes[validos].astype(np.int64), minlength=inicios[-1])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        media = soma / n
+        variancia = (soma_quadrados - n * media**2) / (n - 1)
+    desvio = np.sqrt(np.clip(np.nan_to_num(variancia), 0, None))
+    larguras = desvio * np.maximum(n, 1) ** (-1 / 5)  # regra de Scott
+
+    kde_x, kde_y = _kde_binada(grade_fina, minimos, amplitudes, larguras, n)
+    # Mesma escala das barras: densidade x total x largura do bin
+    kde_y *= (n * amplitudes / bins)[:, None]
+
+    frequencias_por_coluna = {}
+    for j, i in enumerate(discretas):
+        valores = minimos[i] + np.arange(tamanhos[j])
+        contadas = frequencias[inicios[j]:inicios[j + 1]]
+        frequencias_por_coluna[i] = pd.Series(contadas, index=valores.astype(np.int64))
+
+    resultado = {}
+    for i, col in enumerate(columns):
+        edges = np.linspace(minimos[i], minimos[i] + amplitudes[i], bins + 1)
+        if larguras[i] > 0 and maximos[i] > minimos[i]:
+            histograma = Histograma(edges, contagens[i], kde_x[i], kde_y[i])
+        else:
+            histograma = Histograma(edges, contagens[i], None, None)
+
+        freq = frequencias_por_coluna.get(i)
+        if freq is not None:
+            # Quantil exato: interpolação linear entre os valores de posição
+            # floor(q * (n - 1)) e a seguinte na amostra ordenada, como no pandas.
+            # O valor na posição p é o primeiro cuja frequência acumulada passa de p.
+            acumulada = np.cumsum(freq.to_numpy())
+            valores = freq.index.to_numpy(dtype=np.float64)
+            posicoes = np.asarray(quantis, dtype=np.float64) * (acumulada[-1] - 1)
+            abaixo = np.floor(posicoes)
+            inferior = valores[np.searchsorted(acumulada, abaixo, side="right")]
+            superior = valores[np.minimum(np.searchsorted(acumulada, abaixo + 1, side="right"), len(valores) - 1)]
+            valores_quantis = inferior + (posicoes - abaixo) * (superior - inferior)
+        else:
+            valores_quantis = quantis_da_grade(grade_fina[i], minimos[i], amplitudes[i] / kde_gridsize, quantis)
+
+        vazia = n[i] == 0
+        resultado[col] = ResumoColuna(
+            n=int(n[i]),
+            nulos=int(len(data) - n[i]),
+            minimo=np.nan if vazia else float(minimos[i]),
+            maximo=np.nan if vazia else float(maximos[i]),
+            media=np.nan if vazia else float(minimos[i] + media[i]),
+            desvio=np.nan if vazia else float(desvio[i]),
+            quantis=dict(zip(quantis, valores_quantis.tolist())),
+            frequencias=freq,
+            histograma=histograma,
+        )
+    return resultado
+
+
+def histogramas(data, columns=None, bins=30, kde_gridsize=KDE_GRIDSIZE, chunk_size=CHUNK_SIZE):
+    """Histograma e KDE de cada coluna numérica (ver `perfilar`), como um dicionário {coluna: Histograma}."""
+    perfil = perfilar(data, columns, bins, max_categorias=0, kde_gridsize=kde_gridsize, chunk_size=chunk_size)
+    return {col: resumo.histograma for col, resumo in perfil.items()}
+
+
+def histogramas_por_grupo(data, coluna, grupo, bins="auto", kde_gridsize=KDE_GRIDSIZE):
+    """`Histograma` de `coluna` em cada nível de `grupo`, com bins comuns a todos os grupos.
+
+    `bins` aceita o que `np.histogram_bin_edges` aceita; o padrão é a regra
+    automática do numpy, também usada pelo seaborn.
+
+    A KDE de cada grupo é a de `histogramas`, reescalada para a largura dos
+    bins comuns, como no `sns.histplot(..., hue=grupo, kde=True)`. Retorna
+    um dicionário {nível: Histograma}.
+    """
+    data = data[[coluna, grupo]]
+    bordas = np.histogram_bin_edges(data[coluna].dropna(), bins=bins)
+    resultado = {}
+    for nivel, subconjunto in data.groupby(grupo, observed=True):
+        contagens, _ = np.histogram(subconjunto[coluna].dropna(), bins=bordas)
+        proprio = histogramas(subconjunto, [coluna], kde_gridsize=kde_gridsize)[coluna]
+        kde_y = proprio.kde_y
+        if kde_y is not None:
+            kde_y = kde_y * (bordas[1] - bordas[0]) / (proprio.edges[1] - proprio.edges[0])
+        resultado[nivel] = Histograma(bordas, contagens, proprio.kde_x, kde_y)
+    return resultado
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def perfil_em_cache(versao, _data, columns=None, bins=30):
+    """`perfilar` calculado uma vez por versão do dataset (o DataFrame não entra na chave)."""
+    return perfilar(_data, columns, bins)
+
+
+def desenhar_histograma(ax, hist, color=None, kde=False, alpha=0.75, edgecolor="black", linewidth=0.5):
+    """Desenha um `Histograma` pré-calculado, com a curva KDE opcional."""
+    barras = ax.bar(
+        hist.edges[:-1], hist.counts, width=np.diff(hist.edges), align="edge",
+        color=color, alpha=alpha, edgecolor=edgecolor, linewidth=linewidth,
+    )
+    if kde and hist.kde_x is not None:
+        ax.plot(hist.kde_x, hist.kde_y, color=barras.patches[0].get_facecolor()[:3] if barras.patches else color)
+    return barras
+
+
+def densidade_2d(x, y, bins=200, chunk_size=CHUNK_SIZE):
+    """Contagens de (x, y) em uma grade `bins` x `bins` sobre a faixa dos dados, calculadas em blocos.
+
+    Retorna (contagens, bordas_x, bordas_y), como `np.histogram2d`.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    faixa = [[np.nanmin(x), np.nanmax(x)], [np.nanmin(y), np.nanmax(y)]]
+    contagens = np.zeros((bins, bins), dtype=np.int64)
+    for inicio in range(0, len(x), chunk_size):
+        parcial, bordas_x, bordas_y = np.histogram2d(
+            x[inicio:inicio + chunk_size], y[inicio:inicio + chunk_size], bins=bins, range=faixa,
+        )
+        contagens += parcial.astype(np.int64)
+    return contagens, bordas_x, bordas_y
+
+
+def desenhar_densidade(ax, x, y, bins=200, cmap="viridis", colorbar=True):
+    """Desenha a densidade de pontos de (x, y) como imagem rasterizada, com custo O(bins²) no desenho."""
+    contagens, bordas_x, bordas_y = densidade_2d(x, y, bins)
+    imagem = ax.imshow(
+        np.ma.masked_equal(contagens.T, 0), origin="lower", aspect="auto", cmap=cmap,
+        extent=(bordas_x[0], bordas_x[-1], bordas_y[0], bordas_y[-1]), interpolation="nearest",
+    )
+    if colorbar:
+        ax.figure.colorbar(imagem, ax=ax, label="Pacientes")
+    return imagem
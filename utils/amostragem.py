@@ -0,0 +1,32 @@
+"""Redução do número de pontos desenhados em gráficos de dispersão.
+
+Strip plots e gráficos de dispersão desenham um marcador por paciente, o
+que torna a renderização proporcional ao número de linhas e, em coortes
+grandes, ilegível pela sobreposição. Acima de `LIMITE_PONTOS` linhas, os
+gráficos de pontos passam a desenhar uma amostra estratificada (que
+preserva a proporção de cada grupo) ou, entre duas variáveis contínuas, a
+densidade em uma grade 2D (ver `utils.agregados.desenhar_densidade`).
+"""
+
+# Número máximo de pontos desenhados por gráfico
+LIMITE_PONTOS = 5_000
+
+
+def acima_do_limite(data, limite=LIMITE_PONTOS):
+    return len(data) > limite
+
+
+def amostra_para_pontos(data, estratos=None, limite=LIMITE_PONTOS, seed=0):
+    """Retorna `data` inteiro ou, acima de `limite` linhas, uma amostra de cerca de `limite` linhas.
+
+    Com `estratos` (coluna ou lista de colunas), cada grupo é amostrado
+    com a mesma fração, preservando a proporção entre os grupos. A amostra
+    é determinística para a mesma `seed`, então a figura resultante pode
+    ficar em cache pela versão do dataset.
+    """
+    if not acima_do_limite(data, limite):
+        return data
+    if estratos is None:
+        return data.sample(n=limite, random_state=seed)
+    fracao = limite / len(data)
+    return data.groupby(estratos, observed=True, group_keys=False).sample(frac=fracao, random_state=seed)
@@ -0,0 +1,280 @@
+"""Pacote de artefatos pré-calculados das páginas.
+
+Executa fora do Streamlit todo o pipeline das páginas (pré-processamento,
+perfil do dataset, testes de hipótese, ajuste dos modelos e renderização das
+figuras) e grava o resultado em um pacote versionado:
+
+    artefatos/
+        ATUAL                      nome do pacote em uso
+        <criado_em>-<versao>/
+            manifesto.json         versão dos dados, data de criação, estatísticas e arquivos
+            perfil.parquet         resumo de cada coluna numérica do dataset original
+            frequencias.parquet    frequências das colunas discretas
+            testes_t.parquet       testes T das hipóteses 4.4 e 4.5
+            contingencia.parquet   qui-quadrado, Fisher e razão de chances da hipótese 4.2
+            triagem.parquet        testes T de todas as combinações (desfecho, coluna binária)
+            associacoes.parquet    testes de associação de todos os pares de colunas categóricas
+            modelos.json           coeficiente e intercepto de cada regressão
+            avaliacao.parquet      validação cruzada e intervalos por bootstrap de cada regressão
+            reamostragem.parquet   testes de permutação e intervalos por bootstrap das conclusões
+            figuras/<pagina>/<figura_id>.<formato>
+            graficos/<pagina>/<figura_id>.json   especificação Vega-Lite dos gráficos interativos
+
+Quando existe um pacote gerado a partir da versão atual do CSV original, as
+páginas de descrição e de hipóteses apenas leem seus arquivos, sem carregar
+os dados nem calcular nada; um pacote de uma versão anterior é ignorado, e
+remover `ATUAL` também volta as páginas ao cálculo sob demanda. O pacote é gravado em um diretório
+temporário e publicado com a troca atômica de `ATUAL`, então as páginas
+nunca veem um pacote parcial.
+
+Uso (a partir da raiz do repositório, por exemplo em um agendamento):
+
+    python -m utils.artefatos
+    python -m utils.artefatos --formatos png svg --manter 5
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils import graficos_descricao, graficos_interativos, hipoteses
+from utils.agregados import perfilar
+from utils.avaliacao import avaliar_modelos
+from utils.contingencia import TabelasContingencia
+from utils.dados import RAW_DATA_PATH, assinatura_arquivo, ler_tratados, versao_dados
+from utils.esquema import BINARY_COLUMNS, CONTINUOUS_COLUMNS, otimizar_tipos
+from utils.figuras import figura_para_bytes, grafico_para_bytes
+from utils.preprocessamento import preprocessar_em_blocos
+from utils.reamostragem import reamostrar_conclusoes
+from utils.testes import testes_t_em_lote
+
+# Diretório dos pacotes e arquivo que aponta o pacote em uso
+ARTEFATOS_DIR = "artefatos"
+ATUAL = "ATUAL"
+
+# Pacotes mantidos em disco (o atual e os anteriores mais recentes)
+MANTER = 3
+
+# Formato das figuras lido pelas páginas, sempre incluído no pacote
+FORMATO_PAGINAS = "png"
+
+# Figuras de cada página: pagina -> {figura_id: (título ou seção, construtor)}
+PAGINAS = {"descricao": graficos_descricao.GRUPOS, "hipoteses": hipoteses.FIGURAS}
+
+# Gráficos interativos de cada página: pagina -> {figura_id: construtor}
+GRAFICOS = {
+    "descricao": {grupo: construir for grupo, (_, construir) in graficos_interativos.GRUPOS.items()},
+    "hipoteses": hipoteses.GRAFICOS,
+}
+
+
+def _gravar_json(path, conteudo):
+    with open(path, "w", encoding="utf-8") as arquivo:
+        json.dump(conteudo, arquivo, ensure_ascii=False, indent=2, default=float)
+
+
+def _tabela_perfil(perfil):
+    """Perfil como tabelas: uma linha por coluna e uma linha por (coluna, valor) das discretas."""
+    linhas, frequencias = [], []
+    for coluna, resumo in perfil.items():
+        linhas.append({
+            "coluna": coluna, "n": resumo.n, "nulos": resumo.nulos, "minimo": resumo.minimo,
+            "maximo": resumo.maximo, "media": resumo.media, "desvio": resumo.desvio,
+            **{f"q{round(nivel * 100)}": valor for nivel, valor in resumo.quantis.items()},
+        })
+        if resumo.frequencias is not None:
+            for valor, contagem in resumo.frequencias.items():
+                frequencias.append({"coluna": coluna, "valor": valor, "contagem": int(contagem)})
+    return pd.DataFrame(linhas), pd.DataFrame(frequencias, columns=["coluna", "valor", "contagem"])
+
+
+def _coeficientes(modelos):
+    resumo = {}
+    for nome, modelo in modelos.items():
+        resumo[nome] = {"coef": np.ravel(modelo["coef"]).tolist(), "intercept": modelo["intercept"]}
+    return resumo
+
+
+def gerar_pacote(origem=RAW_DATA_PATH, destino=ARTEFATOS_DIR, formatos=("png",), manter=MANTER):
+    """Executa o pipeline completo sobre o CSV `origem` e publica um novo pacote em `destino`.
+
+    As figuras são gravadas em cada um de `formatos` e sempre em
+    FORMATO_PAGINAS, o formato que as páginas exibem. Retorna o caminho do
+    pacote publicado.
+    """
+    formatos = [FORMATO_PAGINAS, *(formato for formato in formatos if formato != FORMATO_PAGINAS)]
+    versao = versao_dados(origem)
+    criado_em = datetime.now(timezone.utc)
+    nome = f"{criado_em:%Y%m%dT%H%M%SZ}-{versao}"
+    os.makedirs(destino, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=destino)
+    try:
+        # Pré-processamento (o dataset tratado não faz parte do pacote)
+        tratados_path = os.path.join(tmp_dir, "tratados.parquet")
+        linhas_tratadas = preprocessar_em_blocos(origem, tratados_path)
+        tratados = ler_tratados(tratados_path)
+        os.remove(tratados_path)
+
+        # Perfil do dataset original (página de descrição)
+        bruto = otimizar_tipos(pd.read_csv(origem))
+        perfil = perfilar(bruto)
+        tabela_perfil, frequencias = _tabela_perfil(perfil)
+        tabela_perfil.to_parquet(os.path.join(tmp_dir, "perfil.parquet"), index=False)
+        frequencias.to_parquet(os.path.join(tmp_dir, "frequencias.parquet"), index=False)
+
+        # Testes de hipótese e modelos (página de hipóteses)
+        hipoteses.testes_t(tratados).reset_index().to_parquet(os.path.join(tmp_dir, "testes_t.parquet"), index=False)
+        hipoteses.testes_contingencia(tratados).to_parquet(os.path.join(tmp_dir, "contingencia.parquet"), index=False)
+        triagem = testes_t_em_lote(bruto, CONTINUOUS_COLUMNS, BINARY_COLUMNS)
+        triagem.to_parquet(os.path.join(tmp_dir, "triagem.parquet"), index=False)
+        TabelasContingencia.de_dados(bruto).testes().to_parquet(os.path.join(tmp_dir, "associacoes.parquet"), index=False)
+        modelos = hipoteses.ajustar_modelos(tratados)
+        _gravar_json(os.path.join(tmp_dir, "modelos.json"), _coeficientes(modelos))
+        avaliar_modelos(versao, hipoteses.MODELOS, tratados).to_parquet(
+            os.path.join(tmp_dir, "avaliacao.parquet"), index=False)
+        reamostrar_conclusoes(hipoteses.REAMOSTRAGENS, tratados, n_jobs=-1).to_parquet(
+            os.path.join(tmp_dir, "reamostragem.parquet"), index=False)
+
+        # Figuras
+        argumentos = {"descricao": (perfil,), "hipoteses": (tratados, modelos)}
+        figuras = {}
+        for pagina, construtores in PAGINAS.items():
+            os.makedirs(os.path.join(tmp_dir, "figuras", pagina))
+            figuras[pagina] = list(construtores)
+            for figura_id, (_, construir) in construtores.items():
+                for formato in formatos:
+                    fig = construir(*argumentos[pagina])
+                    with open(os.path.join(tmp_dir, "figuras", pagina, f"{figura_id}.{formato}"), "wb") as arquivo:
+                        arquivo.write(figura_para_bytes(fig, formato))
+        graficos = {}
+        for pagina, construtores in GRAFICOS.items():
+            os.makedirs(os.path.join(tmp_dir, "graficos", pagina))
+            graficos[pagina] = list(construtores)
+            for figura_id, construir in construtores.items():
+                with open(os.path.join(tmp_dir, "graficos", pagina, f"{figura_id}.json"), "wb") as arquivo:
+                    arquivo.write(grafico_para_bytes(construir(*argumentos[pagina])))
+
+        _gravar_json(os.path.join(tmp_dir, "manifesto.json"), {
+            "nome": nome,
+            "versao": versao,
+            "origem": os.path.abspath(origem),
+            "criado_em": criado_em.isoformat(timespec="seconds"),
+            "estatisticas": {
+                "linhas_origem": len(bruto),
+                "linhas_tratadas": linhas_tratadas,
+                "colunas_tratadas": list(tratados.columns),
+            },
+            "formatos": list(formatos),
+            "figuras": figuras,
+            "graficos": graficos,
+        })
+        os.replace(tmp_dir, os.path.join(destino, nome))
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    # Publica o pacote trocando o apontador de forma atômica
+    tmp_path = os.path.join(destino, f"{ATUAL}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as arquivo:
+        arquivo.write(nome)
+    os.replace(tmp_path, os.path.join(destino, ATUAL))
+    _podar(destino, manter)
+    return os.path.join(destino, nome)
+
+
+def _podar(destino, manter):
+    # Os nomes começam pela data de criação, então a ordem alfabética é a cronológica
+    pacotes = sorted(
+        nome for nome in os.listdir(destino)
+        if not nome.startswith(".") and os.path.isdir(os.path.join(destino, nome))
+    )
+    for nome in pacotes[:-manter] if manter > 0 else []:
+        shutil.rmtree(os.path.join(destino, nome), ignore_errors=True)
+
+
+class PacoteArtefatos:
+    """Leitura de um pacote publicado por `gerar_pacote`."""
+
+    def __init__(self, diretorio):
+        self.diretorio = diretorio
+        with open(os.path.join(diretorio, "manifesto.json"), encoding="utf-8") as arquivo:
+            self.manifesto = json.load(arquivo)
+
+    @property
+    def versao(self):
+        return self.manifesto["versao"]
+
+    def tabela(self, nome):
+        """Tabela `nome` do pacote (um dos arquivos .parquet listados no início do módulo, sem a extensão)."""
+        return pd.read_parquet(os.path.join(self.diretorio, f"{nome}.parquet"))
+
+    def modelos(self):
+        """Coeficiente e intercepto de cada regressão, como em `hipoteses.ajustar_modelos`."""
+        with open(os.path.join(self.diretorio, "modelos.json"), encoding="utf-8") as arquivo:
+            modelos = json.load(arquivo)
+        for modelo in modelos.values():
+            coef = modelo["coef"]
+            modelo["coef"] = coef[0] if len(coef) == 1 else np.asarray(coef)
+        return modelos
+
+    def figura(self, pagina, figura_id, formato="png"):
+        """Bytes da figura `figura_id` da página `pagina`."""
+        with open(os.path.join(self.diretorio, "figuras", pagina, f"{figura_id}.{formato}"), "rb") as arquivo:
+            return arquivo.read()
+
+    def grafico(self, pagina, figura_id):
+        """Especificação Vega-Lite do gráfico interativo `figura_id`, ou None se o pacote não o tiver."""
+        if figura_id not in self.manifesto.get("graficos", {}).get(pagina, []):
+            return None
+        with open(os.path.join(self.diretorio, "graficos", pagina, f"{figura_id}.json"), encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _pacote(destino, assinatura):
+    # `assinatura` (do apontador ATUAL) só participa da chave do cache
+    with open(os.path.join(destino, ATUAL), encoding="utf-8") as arquivo:
+        return PacoteArtefatos(os.path.join(destino, arquivo.read().strip()))
+
+
+def pacote_atual(destino=ARTEFATOS_DIR, origem=RAW_DATA_PATH):
+    """Pacote publicado em `destino`, ou None se não houver nenhum ou se ele não for da versão atual de `origem`.
+
+    O dataset tratado é derivado de `origem`, então um pacote de outra
+    versão do CSV original mostraria figuras e resultados de dados antigos.
+    """
+    try:
+        pacote = _pacote(destino, assinatura_arquivo(os.path.join(destino, ATUAL)))
+        if pacote.versao != versao_dados(origem):
+            return None
+    except FileNotFoundError:
+        return None
+    return pacote
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--origem", default=RAW_DATA_PATH, help="CSV original")
+    parser.add_argument("--destino", default=ARTEFATOS_DIR, help="diretório dos pacotes")
+    parser.add_argument(
+        "--formatos", nargs="+", default=[FORMATO_PAGINAS], choices=["png", "svg"],
+        help=f"formatos das figuras ({FORMATO_PAGINAS} é sempre incluído)",
+    )
+    parser.add_argument("--manter", type=int, default=MANTER, help="pacotes mantidos em disco")
+    args = parser.parse_args(argv)
+
+    caminho = gerar_pacote(args.origem, args.destino, args.formatos, args.manter)
+    print(f"Pacote publicado em {caminho}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""Avaliação dos modelos das hipóteses por validação cruzada e bootstrap.
+
+Um único `train_test_split` dá uma métrica e um coeficiente que dependem da
+divisão sorteada. Aqui cada modelo é avaliado em k folds (acurácia para
+classificadores, R² para regressores) e seus coeficientes recebem
+intervalos de confiança por bootstrap (percentis das réplicas).
+
+Cada fold e cada bloco de réplicas é uma tarefa independente, executada em
+paralelo com joblib e guardada em disco pela versão do dataset, pelo modelo
+(ver `utils.modelos.chave_modelo`) e pela semente. Reavaliar a mesma versão
+não ajusta nada de novo, e pedir mais réplicas ajusta apenas os blocos que
+faltam. Como no registro de modelos, cada versão tem seu diretório e só as
+versões gravadas mais recentemente ficam em disco.
+"""
+
+import hashlib
+import os
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+import streamlit as st
+from joblib import Parallel, delayed
+from sklearn.base import clone, is_classifier
+from sklearn.model_selection import KFold, StratifiedKFold
+
+from utils.instrumentacao import medir
+from utils.modelos import MANTER_VERSOES, chave_modelo, coeficientes, remover_versoes_antigas
+
+# Diretório onde os resultados de folds e réplicas são persistidos
+AVALIACAO_DIR = ".cache/avaliacao"
+
+# Número padrão de folds e de réplicas de bootstrap
+FOLDS = 5
+REPLICAS = 200
+
+# Réplicas de bootstrap por tarefa (e por arquivo em cache)
+BLOCO_REPLICAS = 50
+
+# Nível de confiança dos intervalos
+NIVEL = 0.95
+
+
+def _ajustar_fold(especificacao, X, y, treino, teste):
+    estimador = clone(especificacao.estimador).fit(X[treino], y[treino])
+    coef, intercept = coeficientes(estimador)
+    return {"coef": coef, "intercept": intercept, "score": estimador.score(X[teste], y[teste])}
+
+
+def _ajustar_replicas(especificacao, X, y, seed, bloco, tamanho):
+    # Cada bloco tem seu próprio gerador, então o resultado não depende da ordem de execução
+    rng = np.random.default_rng([seed, bloco])
+    coefs = np.empty((tamanho, X.shape[1]))
+    intercepts = np.empty(tamanho)
+    for i in range(tamanho):
+        indices = rng.integers(0, len(X), len(X))
+        estimador = clone(especificacao.estimador).fit(X[indices], y[indices])
+        coefs[i], intercepts[i] = coeficientes(estimador)
+    return {"coef": coefs, "intercept": intercepts}
+
+
+class Avaliador:
+    """Validação cruzada e bootstrap com resultados parciais em disco."""
+
+    def __init__(self, avaliacao_dir=AVALIACAO_DIR, n_jobs=-1, manter=MANTER_VERSOES):
+        self.avaliacao_dir = avaliacao_dir
+        self.n_jobs = n_jobs
+        self.manter = manter
+
+    def _caminho(self, versao, *partes):
+        chave = hashlib.sha1(repr(partes).encode("utf-8")).hexdigest()
+        return os.path.join(self.avaliacao_dir, versao, f"{chave}.joblib")
+
+    def _guardar(self, caminho, resultado):
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        tmp_path = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        joblib.dump(resultado, tmp_path)
+        os.replace(tmp_path, caminho)
+
+    def avaliar(self, versao, especificacao, data, folds=FOLDS, replicas=REPLICAS, seed=0):
+        """Avalia o modelo descrito por `especificacao` em `data`.
+
+        Retorna um dicionário com o nome da métrica, o score de cada fold,
+        os coeficientes e interceptos de cada fold e os de cada réplica de
+        bootstrap (réplicas x features).
+        """
+        modelo = chave_modelo(versao, especificacao)
+        X = data[list(especificacao.features)].to_numpy(dtype=np.float64)
+        y = data[especificacao.target].to_numpy()
+
+        # Folds estratificados pelo alvo nos classificadores
+        divisor = StratifiedKFold if is_classifier(especificacao.estimador) else KFold
+        tarefas = {}
+        for i, (treino, teste) in enumerate(divisor(folds, shuffle=True, random_state=seed).split(X, y)):
+            caminho = self._caminho(versao, modelo, "fold", folds, seed, i)
+            tarefas[caminho] = delayed(_ajustar_fold)(especificacao, X, y, treino, teste)
+        blocos = []
+        for bloco, inicio in enumerate(range(0, replicas, BLOCO_REPLICAS)):
+            tamanho = min(BLOCO_REPLICAS, replicas - inicio)
+            caminho = self._caminho(versao, modelo, "bootstrap", seed, bloco, tamanho)
+            tarefas[caminho] = delayed(_ajustar_replicas)(especificacao, X, y, seed, bloco, tamanho)
+            blocos.append(caminho)
+
+        faltantes = [caminho for caminho in tarefas if not os.path.exists(caminho)]
+        if faltantes:
+            nome = f"{type(especificacao.estimador).__name__}: {especificacao.target}"
+            with medir("ajuste", f"avaliação {nome}"):
+                novos = Parallel(n_jobs=self.n_jobs)(tarefas[caminho] for caminho in faltantes)
+            for caminho, resultado in zip(faltantes, novos):
+                self._guardar(caminho, resultado)
+            remover_versoes_antigas(self.avaliacao_dir, self.manter)
+
+        resultados = {caminho: joblib.load(caminho) for caminho in tarefas}
+        por_fold = [resultado for caminho, resultado in resultados.items() if caminho not in blocos]
+        return {
+            "metrica": "acuracia" if is_classifier(especificacao.estimador) else "r2",
+            "scores": np.array([fold["score"] for fold in por_fold]),
+            "coef_folds": np.stack([fold["coef"] for fold in por_fold]),
+            "intercept_folds": np.array([fold["intercept"] for fold in por_fold]),
+            "coef_bootstrap": np.concatenate([resultados[caminho]["coef"] for caminho in blocos]),
+            "intercept_bootstrap": np.concatenate([resultados[caminho]["intercept"] for caminho in blocos]),
+        }
+
+
+def resumir(avaliacoes, especificacoes, nivel=NIVEL):
+    """Tabela com uma linha por (modelo, variável): métrica de validação cruzada e intervalo do coeficiente.
+
+    `avaliacoes` e `especificacoes` são dicionários nome -> resultado de
+    `Avaliador.avaliar` e nome -> Especificacao.
+    """
+    cauda = (1 - nivel) / 2 * 100
+    linhas = []
+    for nome, avaliacao in avaliacoes.items():
+        inferiores, superiores = np.percentile(avaliacao["coef_bootstrap"], [cauda, 100 - cauda], axis=0)
+        for j, variavel in enumerate(especificacoes[nome].features):
+            linhas.append({
+                "modelo": nome,
+                "variavel": variavel,
+                "metrica": avaliacao["metrica"],
+                "cv_media": avaliacao["scores"].mean(),
+                "cv_desvio": avaliacao["scores"].std(ddof=1),
+                "coef_cv": avaliacao["coef_folds"][:, j].mean(),
+                "coef_cv_desvio": avaliacao["coef_folds"][:, j].std(ddof=1),
+                "ic_inferior": inferiores[j],
+                "ic_superior": superiores[j],
+                "replicas": len(avaliacao["coef_bootstrap"]),
+            })
+    return pd.DataFrame(linhas)
+
+
+def avaliar_modelos(versao, especificacoes, data, folds=FOLDS, replicas=REPLICAS, seed=0, avaliador=None):
+    """Avalia todos os modelos de `especificacoes` (nome -> Especificacao) e retorna `resumir`."""
+    avaliador = avaliador or Avaliador()
+    avaliacoes = {
+        nome: avaliador.avaliar(versao, especificacao, data, folds, replicas, seed)
+        for nome, especificacao in especificacoes.items()
+    }
+    return resumir(avaliacoes, especificacoes)
+
+
+@st.cache_resource(max_entries=4, show_spinner="Avaliando os modelos...")
+def avaliacao_em_cache(versao, _especificacoes, _data, folds=FOLDS, replicas=REPLICAS, seed=0):
+    """`avaliar_modelos` uma vez por versão do dataset (os modelos e o DataFrame não entram na chave)."""
+    return avaliar_modelos(versao, _especificacoes, _data, folds, replicas, seed)
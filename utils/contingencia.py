@@ -0,0 +1,131 @@
+"""Tabelas de contingência pré-agregadas das colunas categóricas.
+
+Em uma única passada pelos dados, conta as combinações de valores de todos
+os pares de colunas de poucos níveis (as flags binárias, `Ethnicity` e
+`EducationLevel`). Cada bloco de linhas vira uma matriz indicadora (linhas x
+níveis de todas as colunas) e o produto `indicadora.T @ indicadora` dá, de
+uma vez, a tabela de cada par (e, na diagonal, as frequências de cada
+coluna). As contagens são combináveis entre blocos e lotes de linhas.
+
+Gráficos categóricos e testes (qui-quadrado, exato de Fisher, razão de
+chances) leem apenas essas tabelas, sem voltar ao dataset.
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from utils.agregados import CHUNK_SIZE
+from utils.esquema import BINARY_COLUMNS, CATEGORICAL_COLUMNS
+from utils.testes import corrigir_pvalores
+
+# Níveis de cada coluna contada: coluna -> valores possíveis
+NIVEIS = {
+    **{col: [0, 1] for col in BINARY_COLUMNS},
+    **CATEGORICAL_COLUMNS,
+}
+
+# Nível de confiança do intervalo da razão de chances
+NIVEL = 0.95
+
+
+class TabelasContingencia:
+    """Contagens conjuntas de todos os pares de um conjunto de colunas categóricas."""
+
+    def __init__(self, niveis, contagens):
+        self.niveis = niveis  # coluna -> valores, na ordem das linhas de `contagens`
+        self.contagens = contagens  # níveis x níveis (de todas as colunas)
+        self._inicio = {}
+        inicio = 0
+        for coluna, valores in niveis.items():
+            self._inicio[coluna] = inicio
+            inicio += len(valores)
+
+    @classmethod
+    def de_dados(cls, data, colunas=None, chunk_size=CHUNK_SIZE):
+        """Conta as combinações das `colunas` de `data` (por padrão, as de NIVEIS presentes em `data`).
+
+        Valores ausentes ou fora dos níveis não entram nas tabelas da coluna.
+        """
+        colunas = [col for col in NIVEIS if col in data.columns] if colunas is None else list(colunas)
+        niveis = {col: NIVEIS[col] for col in colunas}
+        total = sum(len(valores) for valores in niveis.values())
+        contagens = np.zeros((total, total))
+        for inicio in range(0, len(data), chunk_size):
+            bloco = data.iloc[inicio:inicio + chunk_size]
+            indicadora = np.zeros((len(bloco), total))
+            deslocamento = 0
+            for coluna, valores in niveis.items():
+                codigos = pd.Categorical(bloco[coluna].to_numpy(), categories=valores).codes
+                linhas = np.flatnonzero(codigos >= 0)
+                indicadora[linhas, deslocamento + codigos[linhas]] = 1
+                deslocamento += len(valores)
+            contagens += indicadora.T @ indicadora
+        return cls(niveis, contagens.astype(np.int64))
+
+    def combinar(self, outro):
+        """Novas tabelas com as linhas destas e de `outro` (mesmas colunas)."""
+        return TabelasContingencia(self.niveis, self.contagens + outro.contagens)
+
+    def _faixa(self, coluna):
+        inicio = self._inicio[coluna]
+        return slice(inicio, inicio + len(self.niveis[coluna]))
+
+    def tabela(self, a, b):
+        """Tabela de contingência de duas colunas, como `pd.crosstab(data[a], data[b])` com todos os níveis."""
+        return pd.DataFrame(
+            self.contagens[self._faixa(a), self._faixa(b)],
+            index=pd.Index(self.niveis[a], name=a), columns=pd.Index(self.niveis[b], name=b),
+        )
+
+    def frequencias(self, coluna):
+        """Contagem de cada nível da coluna, como `data[coluna].value_counts()` com todos os níveis."""
+        faixa = self._faixa(coluna)
+        return pd.Series(
+            np.diag(self.contagens[faixa, faixa]), index=pd.Index(self.niveis[coluna], name=coluna), name="contagem",
+        )
+
+    def teste(self, a, b, nivel=NIVEL):
+        """Testes de associação entre as colunas `a` e `b`.
+
+        Retorna um dicionário com o qui-quadrado de Pearson (com a correção de
+        Yates nas tabelas 2x2, como `chi2_contingency`) e o V de Cramér; nas
+        tabelas 2x2, também o p-valor exato de Fisher e a razão de chances
+        (chances de b = 1 com a = 1 sobre as chances com a = 0), com intervalo
+        de Woolf e correção de Haldane (0,5 em cada célula) quando há zeros.
+        Níveis sem nenhuma observação são descartados antes dos testes.
+        """
+        tabela = self.tabela(a, b).to_numpy()
+        tabela = tabela[tabela.sum(axis=1) > 0][:, tabela.sum(axis=0) > 0]
+        n = int(tabela.sum())
+        resultado = {
+            "a": a, "b": b, "n": n, "chi2": np.nan, "gl": 0, "p_chi2": np.nan, "cramer_v": np.nan,
+            "p_fisher": np.nan, "odds_ratio": np.nan, "or_inferior": np.nan, "or_superior": np.nan,
+        }
+        if min(tabela.shape) < 2:
+            return resultado
+
+        chi2, p, gl, _ = stats.chi2_contingency(tabela)
+        sem_correcao = stats.chi2_contingency(tabela, correction=False)[0]
+        resultado.update(chi2=chi2, gl=int(gl), p_chi2=p, cramer_v=np.sqrt(sem_correcao / (n * (min(tabela.shape) - 1))))
+
+        if tabela.shape == (2, 2):
+            resultado["p_fisher"] = stats.fisher_exact(tabela)[1]
+            celulas = tabela + 0.5 if (tabela == 0).any() else tabela.astype(np.float64)
+            log_or = np.log(celulas[1, 1] * celulas[0, 0] / (celulas[1, 0] * celulas[0, 1]))
+            erro = np.sqrt((1 / celulas).sum())
+            z = stats.norm.ppf(0.5 + nivel / 2)
+            resultado.update(
+                odds_ratio=np.exp(log_or), or_inferior=np.exp(log_or - z * erro), or_superior=np.exp(log_or + z * erro),
+            )
+        return resultado
+
+    def testes(self, pares=None, correcao="fdr_bh", nivel=NIVEL):
+        """Tabela com `teste` de cada par (por padrão, todos os pares de colunas), com p-valores ajustados."""
+        pares = combinations(self.niveis, 2) if pares is None else pares
+        resultado = pd.DataFrame([self.teste(a, b, nivel) for a, b in pares])
+        if correcao is not None and not resultado.empty:
+            resultado["p_chi2_ajustado"] = corrigir_pvalores(resultado["p_chi2"], correcao)
+        return resultado
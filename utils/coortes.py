@@ -0,0 +1,200 @@
+"""Seleção de coortes por índices bitmap.
+
+Cada coluna categórica ou binária recebe, por nível, um bitmap com um bit
+por linha empacotado em palavras uint64; as colunas numéricas filtráveis
+recebem um índice ordenado (valores em ordem crescente e a linha de cada
+um). Um filtro combinado é resolvido com operações bit a bit sobre os
+bitmaps (OU entre os níveis aceitos de uma coluna, E entre colunas) e com
+`searchsorted` nas faixas, sem percorrer o DataFrame.
+
+O filtro escolhido na barra lateral (`seletor_coorte`) vale para todas as
+páginas da sessão. `aplicar_coorte` devolve os dados da coorte e uma versão
+própria para ela, que as páginas usam no lugar da versão do dataset: figuras,
+perfis e modelos de cada coorte ficam em cache separadamente, e a coorte
+completa continua usando as entradas já existentes.
+"""
+
+import hashlib
+
+import numpy as np
+import streamlit as st
+
+from utils.contingencia import NIVEIS
+from utils.esquema import FAIXAS, INTEGER_COLUMNS
+
+# Colunas numéricas com índice ordenado
+COLUNAS_FAIXA = ["Age", "BMI", "MMSE"]
+
+# Filtros exibidos na barra lateral: coluna -> (rótulo, nome de cada nível)
+FILTROS_NIVEIS = {
+    "Gender": ("Gênero", {0: "Masculino", 1: "Feminino"}),
+    "Ethnicity": ("Etnia", {0: "Caucasiano", 1: "Afro-americano", 2: "Asiático", 3: "Outro"}),
+    "EducationLevel": ("Nível de Educação", {0: "Nenhum", 1: "Ensino Médio", 2: "Bacharelado", 3: "Superior"}),
+    "Diagnosis": ("Diagnóstico", {0: "Negativo", 1: "Positivo"}),
+}
+FILTROS_FAIXAS = {"Age": "Idade", "BMI": "IMC", "MMSE": "MMSE"}
+
+# Colunas que precisam ser carregadas para construir o índice dos filtros
+COLUNAS_FILTRO = list(FILTROS_NIVEIS) + list(FILTROS_FAIXAS)
+
+# Coortes com menos pacientes não são analisadas
+MINIMO_PACIENTES = 30
+
+# Prefixo das chaves dos filtros em `st.session_state`
+CHAVE_SESSAO = "coorte"
+
+
+def _empacotar(mascara):
+    """Bitmap (uint64, um bit por linha) de uma máscara booleana."""
+    bytes_ = np.packbits(mascara, bitorder="little")
+    return np.pad(bytes_, (0, -len(bytes_) % 8)).view(np.uint64)
+
+
+class IndiceCoortes:
+    """Bitmaps por nível das colunas categóricas e índices ordenados das colunas numéricas de um DataFrame."""
+
+    def __init__(self, data, colunas_faixa=COLUNAS_FAIXA):
+        self.linhas = len(data)
+        self.bitmaps = {}
+        for coluna, niveis in NIVEIS.items():
+            if coluna in data.columns:
+                valores = data[coluna].to_numpy()
+                self.bitmaps[coluna] = {nivel: _empacotar(valores == nivel) for nivel in niveis}
+        self.ordenados = {}
+        tipo_indice = np.int32 if self.linhas < 2**31 else np.int64
+        for coluna in colunas_faixa:
+            if coluna in data.columns:
+                valores = data[coluna].to_numpy(dtype=np.float64)
+                # NaN fica no fim da ordenação e fora do trecho consultado
+                ordem = np.argsort(valores, kind="stable").astype(tipo_indice)
+                validos = int((~np.isnan(valores)).sum())
+                self.ordenados[coluna] = (valores[ordem[:validos]], ordem[:validos])
+        self._todos = _empacotar(np.ones(self.linhas, dtype=bool))
+
+    def niveis(self, coluna, aceitos):
+        """Bitmap das linhas em que `coluna` tem um dos níveis `aceitos`."""
+        bitmap = np.zeros_like(self._todos)
+        for nivel in aceitos:
+            bitmap |= self.bitmaps[coluna][nivel]
+        return bitmap
+
+    def faixa(self, coluna, minimo, maximo):
+        """Bitmap das linhas com `minimo <= coluna <= maximo`."""
+        valores, ordem = self.ordenados[coluna]
+        inicio = np.searchsorted(valores, minimo, side="left")
+        fim = np.searchsorted(valores, maximo, side="right")
+        mascara = np.zeros(self.linhas, dtype=bool)
+        mascara[ordem[inicio:fim]] = True
+        return _empacotar(mascara)
+
+    def selecionar(self, filtro):
+        """Bitmap das linhas que atendem a todos os critérios de `filtro` (ver `seletor_coorte`)."""
+        bitmap = self._todos.copy()
+        for coluna, criterio in filtro.items():
+            if coluna in self.ordenados:
+                bitmap &= self.faixa(coluna, *criterio)
+            else:
+                bitmap &= self.niveis(coluna, criterio)
+        return bitmap
+
+    def contar(self, bitmap):
+        """Número de linhas marcadas no bitmap."""
+        return int(np.bitwise_count(bitmap).sum())
+
+    def posicoes(self, bitmap):
+        """Posições (para `DataFrame.iloc`) das linhas marcadas no bitmap, em ordem crescente."""
+        return np.flatnonzero(np.unpackbits(bitmap.view(np.uint8), count=self.linhas, bitorder="little"))
+
+
+def assinatura_filtro(filtro):
+    """Impressão digital estável de `filtro`, usada nas chaves de cache da coorte."""
+    texto = repr(sorted((coluna, tuple(criterio)) for coluna, criterio in filtro.items()))
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()[:12]
+
+
+def versao_coorte(versao, filtro):
+    """Versão dos dados da coorte: a própria `versao` sem filtro, ou ela acrescida da assinatura do filtro."""
+    return f"{versao}-coorte-{assinatura_filtro(filtro)}" if filtro else versao
+
+
+@st.cache_resource(max_entries=8, show_spinner="Indexando o dataset...")
+def indice_em_cache(versao, _data):
+    """`IndiceCoortes` de `_data`, construído uma vez por versão do dataset (o DataFrame não entra na chave)."""
+    return IndiceCoortes(_data)
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _dados_coorte(versao, _data, _posicoes):
+    # `versao` já identifica a coorte; as linhas ficam compartilhadas entre as sessões
+    return _data.iloc[_posicoes]
+
+
+def _faixa_completa(coluna):
+    # Inteiros nas colunas inteiras e floats nas demais, como o slider devolve
+    tipo = int if coluna in INTEGER_COLUMNS else float
+    return tuple(tipo(limite) for limite in FAIXAS[coluna])
+
+
+def _limpar_filtros():
+    for coluna in FILTROS_NIVEIS:
+        st.session_state[f"{CHAVE_SESSAO}_{coluna}"] = []
+    for coluna in FILTROS_FAIXAS:
+        st.session_state[f"{CHAVE_SESSAO}_{coluna}"] = _faixa_completa(coluna)
+
+
+def seletor_coorte():
+    """Exibe os filtros de coorte na barra lateral e retorna o filtro escolhido.
+
+    O filtro é um dicionário coluna -> níveis aceitos (colunas categóricas)
+    ou coluna -> (mínimo, máximo) (colunas numéricas), só com as colunas
+    efetivamente restritas; um dicionário vazio é o dataset completo.
+    """
+    st.sidebar.subheader("Coorte")
+    filtro = {}
+    for coluna, (rotulo, nomes) in FILTROS_NIVEIS.items():
+        chave = f"{CHAVE_SESSAO}_{coluna}"
+        # Regravar o valor mantém o filtro ao trocar de página (widgets ausentes perdem o estado)
+        st.session_state[chave] = st.session_state.get(chave, [])
+        aceitos = st.sidebar.multiselect(
+            rotulo, list(nomes), format_func=nomes.get, key=chave, placeholder="Todos",
+        )
+        if aceitos:
+            filtro[coluna] = tuple(sorted(aceitos))
+    for coluna, rotulo in FILTROS_FAIXAS.items():
+        chave = f"{CHAVE_SESSAO}_{coluna}"
+        minimo, maximo = _faixa_completa(coluna)
+        st.session_state[chave] = st.session_state.get(chave, (minimo, maximo))
+        faixa = st.sidebar.slider(rotulo, minimo, maximo, step=1 if coluna in INTEGER_COLUMNS else 0.5, key=chave)
+        if tuple(faixa) != (minimo, maximo):
+            filtro[coluna] = tuple(faixa)
+    st.sidebar.button("Limpar filtros", on_click=_limpar_filtros, disabled=not filtro)
+    return filtro
+
+
+def filtrar(data, versao, filtro, indexados=None):
+    """Restringe `data` à coorte de `filtro` e retorna (dados da coorte, versão da coorte).
+
+    `indexados` é o DataFrame com as colunas do filtro, alinhado linha a
+    linha com `data` (por padrão, o próprio `data`). Sem filtro, `data` e
+    `versao` voltam inalterados.
+    """
+    if not filtro:
+        return data, versao
+    indice = indice_em_cache(versao, data if indexados is None else indexados)
+    coorte = versao_coorte(versao, filtro)
+    return _dados_coorte(coorte, data, indice.posicoes(indice.selecionar(filtro))), coorte
+
+
+def aplicar_coorte(data, versao, filtro, indexados=None):
+    """Como `filtrar`, exibindo o tamanho da coorte na barra lateral.
+
+    Interrompe a página se a coorte tiver menos de MINIMO_PACIENTES.
+    """
+    coorte, versao = filtrar(data, versao, filtro, indexados)
+    if filtro:
+        st.sidebar.caption(f"{len(coorte)} de {len(data)} pacientes na coorte.")
+        if len(coorte) < MINIMO_PACIENTES:
+            st.warning(
+                f"A coorte selecionada tem {len(coorte)} pacientes; são necessários pelo menos {MINIMO_PACIENTES}.")
+            st.stop()
+    return coorte, versao
@@ -0,0 +1,145 @@
+"""Acesso centralizado aos datasets usados pelas páginas.
+
+Os arquivos são lidos uma única vez por processo e reaproveitados entre
+sessões e páginas. A chave do cache inclui a assinatura do arquivo
+(mtime e tamanho), então qualquer alteração em disco força uma nova leitura.
+
+Cada sessão recebe uma visão rasa (`DataFrame.copy(deep=False)`) do
+DataFrame compartilhado. Com Copy-on-Write, a visão não copia nenhuma
+coluna: colunas derivadas ou alteradas pela página ficam apenas na visão
+da sessão, e o DataFrame compartilhado nunca é modificado. A memória cresce
+com as colunas derivadas, não com o número de sessões.
+"""
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import streamlit as st
+
+from utils.esquema import LEITURA_SCHEMA, otimizar_tipos
+from utils.instrumentacao import medir
+
+# Copy-on-Write é o comportamento padrão (e único) a partir do pandas 3
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# Caminhos dos datasets
+RAW_DATA_PATH = "data/alzheimers_disease_data.csv"
+TREATED_DATA_PATH = "data/dados_tratados.csv"
+TREATED_PARQUET_PATH = "data/dados_tratados.parquet"
+TREATED_ARROW_PATH = "data/dados_tratados.arrow"
+
+
+def assinatura_arquivo(path):
+    """Retorna (mtime_ns, tamanho) do arquivo; levanta FileNotFoundError se não existir."""
+    info = os.stat(path)
+    return info.st_mtime_ns, info.st_size
+
+
+def versao_dados(path):
+    """Identificador textual da versão atual do arquivo em disco."""
+    mtime_ns, tamanho = assinatura_arquivo(path)
+    return f"{os.path.basename(path)}-{mtime_ns:x}-{tamanho:x}"
+
+
+@st.cache_resource(max_entries=4, show_spinner="Carregando dados...")
+def _ler_csv(path, assinatura):
+    # `assinatura` só participa da chave do cache
+    with medir("carregamento", path):
+        return otimizar_tipos(pd.read_csv(path))
+
+
+def _visao_da_sessao(chave, base):
+    """Visão da sessão atual sobre o DataFrame compartilhado `base`, criada uma vez por versão dos dados."""
+    visoes = st.session_state.setdefault("_visoes_dados", {})
+    compartilhado, visao = visoes.get(chave, (None, None))
+    if compartilhado is not base:
+        # Uma nova versão substitui a anterior, liberando a referência ao DataFrame antigo
+        visao = base.copy(deep=False)
+        visoes[chave] = (base, visao)
+    return visao
+
+
+def carregar_dados(path=RAW_DATA_PATH):
+    """Carrega o CSV em `path`, lido uma vez e compartilhado entre todas as sessões.
+
+    Retorna a visão da sessão sobre o DataFrame compartilhado: a página
+    pode derivar colunas nela sem afetar as demais sessões.
+    """
+    return _visao_da_sessao(("bruto", path), _ler_csv(path, assinatura_arquivo(path)))
+
+
+def ler_arrow(path, columns=None):
+    """Abre o arquivo Arrow IPC `path` via memory map, sem copiar os dados.
+
+    As colunas numéricas do DataFrame apontam diretamente para as páginas
+    do arquivo mapeado (somente leitura), que o sistema operacional
+    compartilha entre todos os processos que abrem o mesmo arquivo.
+    """
+    tabela = ipc.open_file(pa.memory_map(path)).read_all()
+    if columns is not None:
+        tabela = tabela.select(list(columns))
+    # split_blocks evita consolidar as colunas em blocos 2D, o que as copiaria
+    return tabela.to_pandas(split_blocks=True)
+
+
+def ler_tratados(path, columns=None):
+    """Lê o dataset tratado (Arrow, Parquet ou CSV) tipado pelo esquema, sem passar pelo cache."""
+    columns = list(columns) if columns is not None else None
+    if path.endswith(".arrow"):
+        return otimizar_tipos(ler_arrow(path, columns))
+    if path.endswith(".parquet"):
+        # O Parquet devolve os categóricos de inteiros como int64; o esquema os restaura
+        return otimizar_tipos(pd.read_parquet(path, columns=columns))
+    return otimizar_tipos(pd.read_csv(path, usecols=columns, dtype=LEITURA_SCHEMA))
+
+
+@st.cache_resource(max_entries=16, show_spinner="Carregando dados...")
+def _ler_tratados(path, assinatura, columns):
+    # `assinatura` só participa da chave do cache
+    with medir("carregamento", path):
+        return ler_tratados(path, columns)
+
+
+def caminho_tratados():
+    """Prefere o Arrow e depois o Parquet gerados pelo pré-processamento, se estiverem atualizados."""
+    try:
+        csv_mtime = assinatura_arquivo(TREATED_DATA_PATH)[0]
+    except FileNotFoundError:
+        csv_mtime = None
+    for path in (TREATED_ARROW_PATH, TREATED_PARQUET_PATH):
+        try:
+            mtime = assinatura_arquivo(path)[0]
+        except FileNotFoundError:
+            continue
+        if csv_mtime is None or mtime >= csv_mtime:
+            return path
+    return TREATED_DATA_PATH
+
+
+def carregar_tratados(columns=None):
+    """Carrega apenas as colunas `columns` do dataset tratado, já tipadas pelo esquema.
+
+    Lê `dados_tratados.arrow` (via memory map) ou `dados_tratados.parquet`
+    quando disponíveis e recorre ao CSV caso contrário. Assim como em `carregar_dados`, retorna a visão da sessão
+    sobre o DataFrame compartilhado.
+    """
+    path = caminho_tratados()
+    columns = tuple(columns) if columns is not None else None
+    return _visao_da_sessao(("tratados", columns), _ler_tratados(path, assinatura_arquivo(path), columns))
+
+
+def tratados_atualizados(origem=RAW_DATA_PATH, path=TREATED_ARROW_PATH):
+    """Indica se o dataset tratado em `path` existe e é mais recente que o arquivo de origem."""
+    try:
+        return assinatura_arquivo(path)[0] >= assinatura_arquivo(origem)[0]
+    except FileNotFoundError:
+        return False
+
+
+def versao_tratados():
+    """Versão do arquivo que `carregar_tratados` está lendo no momento."""
+    return versao_dados(caminho_tratados())
+
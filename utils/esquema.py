@@ -0,0 +1,167 @@
+"""Esquema de tipos do dataset de Alzheimer.
+
+Centraliza os dtypes de cada coluna para que leitura, escrita e
+pré-processamento usem a mesma representação compacta:
+flags 0/1 em uint8, códigos de grupo como categóricos e medições em float32.
+`otimizar_tipos` aplica o esquema na carga dos dados e reduz também as
+colunas fora dele; `relatorio_memoria` compara a memória ocupada com a dos
+tipos padrão da leitura do pandas (int64/float64).
+"""
+
+import pandas as pd
+from pandas.api.types import is_integer_dtype, is_numeric_dtype
+
+# Colunas descartadas no pré-processamento
+ID_COLUMNS = ["PatientID", "DoctorInCharge"]
+
+# Flags 0 = Não, 1 = Sim (Gender: 0 = Masculino, 1 = Feminino)
+BINARY_COLUMNS = [
+    "Gender",
+    "Smoking",
+    "FamilyHistoryAlzheimers",
+    "CardiovascularDisease",
+    "Diabetes",
+    "Depression",
+    "HeadInjury",
+    "Hypertension",
+    "MemoryComplaints",
+    "BehavioralProblems",
+    "Confusion",
+    "Disorientation",
+    "PersonalityChanges",
+    "DifficultyCompletingTasks",
+    "Forgetfulness",
+    "Diagnosis",
+]
+
+# Códigos de grupo com categorias fixas (0 a 3)
+CATEGORICAL_COLUMNS = {
+    "Ethnicity": [0, 1, 2, 3],
+    "EducationLevel": [0, 1, 2, 3],
+}
+
+# Idade em anos inteiros (60 a 90)
+INTEGER_COLUMNS = ["Age"]
+
+# Medições clínicas, escores e fatores de estilo de vida
+CONTINUOUS_COLUMNS = [
+    "BMI",
+    "AlcoholConsumption",
+    "PhysicalActivity",
+    "DietQuality",
+    "SleepQuality",
+    "SystolicBP",
+    "DiastolicBP",
+    "CholesterolTotal",
+    "CholesterolLDL",
+    "CholesterolHDL",
+    "CholesterolTriglycerides",
+    "MMSE",
+    "FunctionalAssessment",
+    "ADL",
+]
+
+# Faixas documentadas (mínimo, máximo) das colunas numéricas
+FAIXAS = {
+    "Age": (60, 90),
+    "BMI": (15, 40),
+    "AlcoholConsumption": (0, 20),
+    "PhysicalActivity": (0, 10),
+    "DietQuality": (0, 10),
+    "SleepQuality": (4, 10),
+    "SystolicBP": (90, 180),
+    "DiastolicBP": (60, 120),
+    "CholesterolTotal": (150, 300),
+    "CholesterolLDL": (50, 200),
+    "CholesterolHDL": (20, 100),
+    "CholesterolTriglycerides": (50, 400),
+    "MMSE": (0, 30),
+    "FunctionalAssessment": (0, 10),
+    "ADL": (0, 10),
+}
+
+# Dtype declarado de cada coluna do dataset tratado
+TREATED_SCHEMA = {
+    **{col: "uint8" for col in INTEGER_COLUMNS},
+    **{col: "uint8" for col in BINARY_COLUMNS},
+    **{col: pd.CategoricalDtype(cats) for col, cats in CATEGORICAL_COLUMNS.items()},
+    **{col: "float32" for col in CONTINUOUS_COLUMNS},
+}
+
+# Dtypes usados na leitura de CSVs: as colunas uint8 são lidas como float32,
+# que representa os mesmos inteiros e também os valores ausentes (NaN), e só
+# depois convertidas por `aplicar_esquema`
+LEITURA_SCHEMA = {col: "float32" if dtype == "uint8" else dtype for col, dtype in TREATED_SCHEMA.items()}
+
+# Colunas de texto com no máximo esta fração de valores distintos viram categóricas
+FRACAO_CATEGORICA = 0.5
+
+
+def _dtype_do_esquema(serie, dtype):
+    # uint8 só recebe inteiros de 0 a 255 sem ausentes: fora da faixa, a
+    # conversão daria a volta (300 -> 44, -1 -> 255) em vez de falhar
+    if dtype != "uint8" or not len(serie):
+        return dtype
+    if serie.isna().any() or (not is_integer_dtype(serie.dtype) and (serie % 1 != 0).any()):
+        return "float32"
+    minimo, maximo = serie.min(), serie.max()
+    if minimo < 0 or maximo > 255:
+        return pd.to_numeric(serie.astype("int64"), downcast="unsigned" if minimo >= 0 else "integer").dtype
+    return dtype
+
+
+def aplicar_esquema(data):
+    """Converte as colunas conhecidas de `data` para os dtypes do esquema (ver `otimizar_tipos`)."""
+    dtypes = {col: _dtype_do_esquema(data[col], dtype) for col, dtype in TREATED_SCHEMA.items() if col in data.columns}
+    return data.astype(dtypes)
+
+
+def otimizar_tipos(data):
+    """Converte `data` para a representação compacta do esquema.
+
+    As colunas do esquema recebem o dtype de TREATED_SCHEMA. As colunas
+    uint8 só são convertidas quando todos os valores são inteiros de 0 a
+    255: com valores ausentes ou frações ficam em float32, e fora da faixa
+    no menor inteiro que comporta os valores. As medições em float32 guardam
+    cerca de 7 dígitos significativos, então perdem precisão em relação ao
+    float64 lido do CSV, e códigos fora das categorias fixas viram ausentes.
+    As demais colunas inteiras são reduzidas ao menor inteiro que comporta
+    seus valores e as de texto com poucos valores distintos viram
+    categóricas. Colunas float fora do esquema são mantidas, pois reduzi-las
+    perderia precisão.
+    """
+    dtypes = {}
+    for col in data.columns:
+        serie = data[col]
+        if col in TREATED_SCHEMA:
+            dtypes[col] = _dtype_do_esquema(serie, TREATED_SCHEMA[col])
+        elif is_integer_dtype(serie.dtype) and not isinstance(serie.dtype, pd.CategoricalDtype):
+            dtypes[col] = pd.to_numeric(serie, downcast="unsigned" if serie.min() >= 0 else "integer").dtype
+        elif not is_numeric_dtype(serie.dtype) and not isinstance(serie.dtype, pd.CategoricalDtype):
+            if len(serie) and serie.nunique() <= FRACAO_CATEGORICA * len(serie):
+                dtypes[col] = "category"
+    return data.astype(dtypes)
+
+
+def _bytes_padrao(serie):
+    # Memória da coluna com o dtype que a leitura padrão do pandas daria (8 bytes por número)
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        if is_numeric_dtype(serie.cat.categories.dtype):
+            return 8 * len(serie)
+        serie = serie.astype(serie.cat.categories.dtype)
+    if is_numeric_dtype(serie.dtype):
+        return 8 * len(serie)
+    return serie.memory_usage(deep=True, index=False)
+
+
+def relatorio_memoria(data):
+    """Memória de cada coluna de `data` com os tipos atuais e com os tipos padrão do pandas.
+
+    Retorna um DataFrame indexado pela coluna, com o dtype atual e os bytes
+    "antes" (tipos padrão: int64/float64 e texto) e "depois" (tipos atuais).
+    """
+    return pd.DataFrame({
+        "dtype": data.dtypes.astype(str),
+        "antes": [_bytes_padrao(data[col]) for col in data.columns],
+        "depois": data.memory_usage(deep=True, index=False),
+    }, index=data.columns).rename_axis("coluna")
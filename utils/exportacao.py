@@ -0,0 +1,108 @@
+"""Exportação do dataset tratado para download.
+
+O arquivo de exportação só é gerado quando o usuário o solicita, bloco a
+bloco a partir do dataset tratado, e fica guardado em disco por versão do
+dataset e formato. Pedidos seguintes da mesma versão reaproveitam o arquivo.
+"""
+
+import io
+import os
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from utils.preprocessamento import CHUNK_ROWS, ler_em_blocos
+
+# Diretório onde os arquivos exportados ficam guardados
+EXPORT_DIR = ".cache/exportacoes"
+
+# formato -> (rótulo, extensão, mime, codec do pyarrow para CSV comprimido)
+FORMATOS = {
+    "csv": ("CSV", ".csv", "text/csv", None),
+    "csv.gz": ("CSV (gzip)", ".csv.gz", "application/gzip", "gzip"),
+    "csv.zst": ("CSV (zstd)", ".csv.zst", "application/zstd", "zstd"),
+    "parquet": ("Parquet", ".parquet", "application/vnd.apache.parquet", None),
+}
+
+
+def _blocos(origem, chunk_rows):
+    """DataFrames consecutivos do dataset tratado, seja ele Arrow, Parquet ou CSV."""
+    if origem.endswith(".parquet"):
+        for lote in pq.ParquetFile(origem).iter_batches(batch_size=chunk_rows):
+            yield lote.to_pandas()
+    elif origem.endswith(".arrow"):
+        tabela = ipc.open_file(pa.memory_map(origem)).read_all()
+        for lote in tabela.to_batches(max_chunksize=chunk_rows):
+            yield lote.to_pandas()
+    else:
+        yield from ler_em_blocos(origem, chunk_rows)
+
+
+def _escrever_csv(origem, destino, codec, chunk_rows):
+    if codec is None:
+        saida = open(destino, "wb")
+    else:
+        saida = pa.CompressedOutputStream(destino, codec)
+    with io.TextIOWrapper(saida, encoding="utf-8", newline="") as texto:
+        cabecalho = True
+        for bloco in _blocos(origem, chunk_rows):
+            bloco.to_csv(texto, index=False, header=cabecalho)
+            cabecalho = False
+
+
+def _escrever_parquet(origem, destino, chunk_rows):
+    writer = None
+    try:
+        for bloco in _blocos(origem, chunk_rows):
+            tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(destino, tabela.schema, compression="zstd")
+            writer.write_table(tabela.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def caminho_exportacao(versao, formato):
+    """Caminho do arquivo exportado para a versão do dataset e o formato dados."""
+    return os.path.join(EXPORT_DIR, f"dados_tratados-{versao}{FORMATOS[formato][1]}")
+
+
+def exportar(origem, versao, formato="csv", chunk_rows=CHUNK_ROWS):
+    """Gera (se ainda não existir) o arquivo de exportação e retorna seu caminho.
+
+    `versao` identifica o conteúdo de `origem` (ver `utils.dados.versao_dados`);
+    uma versão nova gera um arquivo novo, e as exportações de versões
+    anteriores são removidas.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconhecido: {formato!r}. Use um de {sorted(FORMATOS)}.")
+    destino = caminho_exportacao(versao, formato)
+    if os.path.exists(destino):
+        return destino
+
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    tmp_path = f"{destino}.{os.getpid()}.tmp"
+    try:
+        if formato == "parquet":
+            _escrever_parquet(origem, tmp_path, chunk_rows)
+        else:
+            _escrever_csv(origem, tmp_path, FORMATOS[formato][3], chunk_rows)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, destino)
+    _remover_versoes_antigas(versao)
+    return destino
+
+
+def _remover_versoes_antigas(versao):
+    for nome in os.listdir(EXPORT_DIR):
+        if nome.startswith("dados_tratados-") and f"-{versao}." not in nome and not nome.endswith(".tmp"):
+            try:
+                os.remove(os.path.join(EXPORT_DIR, nome))
+            except FileNotFoundError:
+                pass
+
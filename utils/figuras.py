@@ -0,0 +1,229 @@
+"""Cache de figuras renderizadas.
+
+As figuras são guardadas como bytes de imagem (PNG ou SVG) ou, nos gráficos
+interativos, como a especificação Vega-Lite com os dados agregados embutidos
+(ver `utils.graficos_interativos`), indexadas pela versão do dataset, pelo
+identificador da figura e pelos parâmetros do gráfico. A memória é
+limitada por um LRU em bytes; entradas removidas da memória são despejadas
+em disco e recarregadas de lá no próximo acesso.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import streamlit as st
+
+from utils.instrumentacao import medir
+
+# Diretório padrão para o despejo em disco
+CACHE_DIR = ".cache/figuras"
+
+# Mesmas opções usadas por `st.pyplot`
+SAVEFIG_OPTIONS = {"bbox_inches": "tight", "dpi": 200}
+
+# Formato dos gráficos interativos no cache
+FORMATO_GRAFICO = "vega-lite"
+
+
+def figura_para_bytes(fig, formato="png"):
+    """Renderiza a figura no formato pedido e libera seus recursos."""
+    fig = getattr(fig, "figure", fig)  # FacetGrid/PairGrid/JointGrid expõem a Figure em `.figure`
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=formato, **SAVEFIG_OPTIONS)
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def grafico_para_bytes(grafico):
+    """Especificação Vega-Lite (JSON compacto, com os dados embutidos) de um gráfico do Altair."""
+    return grafico.to_json(indent=None).encode("utf-8")
+
+
+class FigureCache:
+    """Cache LRU de imagens renderizadas com despejo em disco."""
+
+    def __init__(self, max_bytes=128 * 1024**2, cache_dir=CACHE_DIR, max_disk_bytes=1024**3):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._memoria = OrderedDict()
+        self._tamanho = 0
+        # Arquivos despejados (caminho -> tamanho), do mais antigo ao mais novo
+        self._disco = None
+        self._tamanho_disco = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def chave(versao, figura_id, formato="png", **params):
+        """Chave estável para (versão do dataset, figura, formato, parâmetros)."""
+        texto = repr((versao, figura_id, formato, sorted(params.items())))
+        return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.cache_dir, chave[:2], chave)
+
+    def obter(self, chave):
+        """Retorna os bytes da figura ou None se ela não estiver em cache."""
+        with self._lock:
+            if chave in self._memoria:
+                self._memoria.move_to_end(chave)
+                return self._memoria[chave]
+        try:
+            with open(self._caminho(chave), "rb") as arquivo:
+                conteudo = arquivo.read()
+        except FileNotFoundError:
+            return None
+        self.guardar(chave, conteudo)
+        return conteudo
+
+    def guardar(self, chave, conteudo):
+        """Insere a figura na memória, despejando as menos usadas se necessário."""
+        removidas = []
+        with self._lock:
+            if chave in self._memoria:
+                self._tamanho -= len(self._memoria.pop(chave))
+            self._memoria[chave] = conteudo
+            self._tamanho += len(conteudo)
+            while self._tamanho > self.max_bytes and len(self._memoria) > 1:
+                antiga, dados = self._memoria.popitem(last=False)
+                self._tamanho -= len(dados)
+                removidas.append((antiga, dados))
+        for antiga, dados in removidas:
+            self._despejar(antiga, dados)
+
+    def _despejar(self, chave, conteudo):
+        caminho = self._caminho(chave)
+        if os.path.exists(caminho):
+            return
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        tmp_path = f"{caminho}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as arquivo:
+            arquivo.write(conteudo)
+        os.replace(tmp_path, caminho)
+        self._podar_disco(caminho, len(conteudo))
+
+    def _indexar_disco(self):
+        # Varre o diretório uma única vez (arquivos de execuções anteriores);
+        # a partir daí os tamanhos são mantidos em memória. Chamado com o lock adquirido.
+        arquivos = []
+        for raiz, _, nomes in os.walk(self.cache_dir):
+            for nome in nomes:
+                if nome.endswith(".tmp"):
+                    continue
+                caminho = os.path.join(raiz, nome)
+                try:
+                    info = os.stat(caminho)
+                except FileNotFoundError:
+                    continue
+                arquivos.append((info.st_mtime, caminho, info.st_size))
+        self._disco = OrderedDict((caminho, tamanho) for _, caminho, tamanho in sorted(arquivos))
+        self._tamanho_disco = sum(self._disco.values())
+
+    def _podar_disco(self, caminho, tamanho):
+        # Registra o arquivo despejado e remove os mais antigos quando o disco passa do limite
+        removidos = []
+        with self._lock:
+            if self._disco is None:
+                self._indexar_disco()
+            elif caminho not in self._disco:
+                self._disco[caminho] = tamanho
+                self._tamanho_disco += tamanho
+            while self._tamanho_disco > self.max_disk_bytes and self._disco:
+                antigo, tamanho_antigo = self._disco.popitem(last=False)
+                self._tamanho_disco -= tamanho_antigo
+                removidos.append(antigo)
+        for antigo in removidos:
+            try:
+                os.remove(antigo)
+            except FileNotFoundError:
+                pass
+
+    def limpar(self):
+        """Esvazia a memória (o disco é mantido)."""
+        with self._lock:
+            self._memoria.clear()
+            self._tamanho = 0
+
+    def renderizar(self, versao, figura_id, construir, formato="png", **params):
+        """Retorna a figura em cache ou a constrói com `construir()` e a guarda.
+
+        `construir` deve devolver uma figura do matplotlib (ou, no formato
+        FORMATO_GRAFICO, um gráfico do Altair) ou os bytes já serializados
+        (por exemplo, por `utils.paralelo`); os `params`
+        participam da chave e devem descrever tudo que altera o gráfico além
+        da versão do dataset.
+        """
+        chave = self.chave(versao, figura_id, formato, **params)
+        conteudo = self.obter(chave)
+        if conteudo is None:
+            with medir("figura", figura_id):
+                conteudo = construir()
+            if not isinstance(conteudo, bytes):
+                with medir("serializacao", figura_id):
+                    if formato == FORMATO_GRAFICO:
+                        conteudo = grafico_para_bytes(conteudo)
+                    else:
+                        conteudo = figura_para_bytes(conteudo, formato)
+            self.guardar(chave, conteudo)
+        return conteudo
+
+
+@st.cache_resource
+def cache_figuras():
+    """Instância única do cache de figuras, compartilhada por todas as sessões."""
+    return FigureCache()
+
+
+def figura_em_cache(versao, figura_id, **params):
+    """Indica se a figura já está renderizada, na sessão ou no cache global."""
+    chave = FigureCache.chave(versao, figura_id, **params)
+    return chave in _figuras_da_sessao(versao) or cache_figuras().obter(chave) is not None
+
+
+def _figuras_da_sessao(versao):
+    """Figuras já exibidas pela sessão para `versao`; as de outras versões são descartadas."""
+    versao_sessao, figuras = st.session_state.get("_figuras", (None, {}))
+    if versao_sessao != versao:
+        figuras = {}
+        st.session_state["_figuras"] = (versao, figuras)
+    return figuras
+
+
+def exibir_figura(versao, figura_id, construir, use_container_width=True, **params):
+    """Exibe no Streamlit a figura `figura_id`, renderizando-a apenas em cache miss.
+
+    As imagens já exibidas para a versão atual ficam também em
+    `st.session_state`, para que a sessão as reutilize mesmo após serem
+    removidas do LRU global; ao mudar de versão, as anteriores são descartadas.
+    """
+    figuras_sessao = _figuras_da_sessao(versao)
+    chave = FigureCache.chave(versao, figura_id, **params)
+    imagem = figuras_sessao.get(chave)
+    if imagem is None:
+        imagem = cache_figuras().renderizar(versao, figura_id, construir, **params)
+        figuras_sessao[chave] = imagem
+    st.image(imagem, use_container_width=use_container_width)
+
+
+def exibir_grafico(versao, figura_id, construir, **params):
+    """Exibe no Streamlit o gráfico interativo `figura_id`, construindo-o apenas em cache miss.
+
+    Como `exibir_figura`, mas `construir` devolve um gráfico do Altair e o
+    que fica em cache (e é enviado ao navegador) é a sua especificação.
+    """
+    graficos_sessao = _figuras_da_sessao(versao)
+    chave = FigureCache.chave(versao, figura_id, FORMATO_GRAFICO, **params)
+    especificacao = graficos_sessao.get(chave)
+    if especificacao is None:
+        especificacao = cache_figuras().renderizar(versao, figura_id, construir, formato=FORMATO_GRAFICO, **params)
+        graficos_sessao[chave] = especificacao
+    st.vega_lite_chart(json.loads(especificacao), use_container_width=True)
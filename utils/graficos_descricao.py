@@ -0,0 +1,440 @@
+"""Construção das figuras da página de descrição do dataset.
+
+Cada função recebe o perfil do dataset (`utils.agregados.perfilar`) e
+devolve uma `matplotlib.figure.Figure` sem exibi-la, para que a página possa
+renderizá-la através do cache de figuras. Histogramas e gráficos de
+contagem são desenhados a partir do perfil, nunca das linhas brutas.
+"""
+
+import matplotlib.pyplot as plt
+import seaborn as sns
+from matplotlib.patches import Patch
+
+from utils.agregados import desenhar_histograma
+
+# Padrões de hachura para gráficos de 2 e 4 categorias
+hachuras1 = ["/", "\\"]
+hachuras2 = ["/", "\\", "o", "x"]
+
+
+def desenhar_frequencias(ax, resumo, palette=None):
+    """Gráfico de contagem a partir das frequências de um `ResumoColuna`, como `sns.countplot(x=col, hue=col)`.
+
+    Colunas sem tabela de frequências (por exemplo, sem nenhum valor válido)
+    são desenhadas pelo histograma do resumo.
+    """
+    if resumo.frequencias is None:
+        desenhar_histograma(ax, resumo.histograma, color=sns.color_palette(palette, 1)[0])
+        return ax
+    frequencias = resumo.frequencias[resumo.frequencias > 0]
+    cores = [sns.desaturate(cor, 0.75) for cor in sns.color_palette(palette, len(frequencias))]
+    for posicao, (valor, contagem) in enumerate(frequencias.items()):
+        ax.bar(posicao, contagem, width=0.8, color=cores[posicao], label=str(valor))
+    ax.set_xticks(range(len(frequencias)), [str(valor) for valor in frequencias.index])
+    ax.set_xlim(-0.5, len(frequencias) - 0.5)
+    return ax
+
+
+def histogramas_numericos(perfil):
+    """Grid com o histograma de cada coluna numérica do perfil."""
+    numeric_cols = list(perfil)
+
+    # Criar um grid para exibir todos os histogramas lado a lado
+    num_cols = len(numeric_cols)  # Quantidade real de colunas numéricas
+    num_rows = (num_cols // 6) + (1 if num_cols % 6 != 0 else 0)  # Determinar número correto de linhas
+
+    fig, axes = plt.subplots(nrows=num_rows, ncols=6, figsize=(15, 10))
+    axes = axes.flatten()  # Converter matriz de eixos em lista
+
+    # Plotar histogramas para cada coluna numérica
+    for i, col in enumerate(numeric_cols):
+        ax = axes[i]
+        desenhar_histograma(ax, perfil[col].histograma, color="skyblue", alpha=1, linewidth=1)
+        ax.set_title(col)
+        ax.set_xlabel("Valores")
+        ax.set_ylabel("Frequência")
+
+    # Ocultar gráficos vazios (se houver)
+    for i in range(num_cols, len(axes)):
+        fig.delaxes(axes[i])  # Remove os eixos vazios
+
+    # Ajustar layout para evitar sobreposição
+    fig.tight_layout()
+
+    return fig
+
+
+def demograficos(perfil):
+    """Detalhes demográficos: idade, gênero, etnia e nível educacional."""
+    fig, ax = plt.subplots(2,2,figsize=(16, 10))
+
+    fig.suptitle("Detalhes Demográficos")
+
+    desenhar_histograma(ax[0,0], perfil["Age"].histograma, kde=True)
+    ax[0,0].set_title("Distribuição da Idade (Anos)")
+    ax[0,0].set_xlabel("Age")
+    ax[0,0].set_ylabel("Frequência")
+
+    c = desenhar_frequencias(ax[0,1], perfil["Gender"], palette=["#ff2626", "#2664ff"])
+    ax[0,1].set_title("Distribuição do Gênero")
+    ax[0,1].set_xlabel("Gender")
+    ax[0,1].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#ff2626", hatch="//", label = "Masculino"),
+        Patch(facecolor="#2664ff", hatch="\\\\", label = "Feminino")
+    ]
+    ax[0,1].legend(title="Gênero", loc="upper right", handles=patches)
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras1[i%len(hachuras1)])
+
+    c = desenhar_frequencias(ax[1,0], perfil["Ethnicity"], palette="Set2")
+    ax[1,0].set_title("Distribuição da Etnicidade")
+    ax[1,0].set_xlabel("Ethnicity")
+    ax[1,0].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#72b6a1", hatch="//", label = "Caucasiana"),
+        Patch(facecolor="#e99675", hatch="//", label = "Afro-Americana"),
+        Patch(facecolor="#95a3c3", hatch="o", label = "Asiática"),
+        Patch(facecolor="#db96c0", hatch="x", label = "Outras")
+    ]
+    ax[1,0].legend(title="Etnicidade", loc="upper right", handles=patches)
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras2[i%len(hachuras2)])
+
+    c = desenhar_frequencias(ax[1,1], perfil["EducationLevel"], palette="Set3")
+    ax[1,1].set_title("Distribuição do Nível Educacional")
+    ax[1,1].set_xlabel("EducationLevel")
+    ax[1,1].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#96cac1", hatch="//", label = "Nenhum"),
+        Patch(facecolor="#f6f6bc", hatch="//", label = "Ensino Médio"),
+        Patch(facecolor="#c1bed6", hatch="o", label = "Bachalerado"),
+        Patch(facecolor="#ea8e83", hatch="x", label = "Superior")
+    ]
+    ax[1,1].legend(title="Nível Educacional", loc="upper right", handles=patches)
+
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras2[i%len(hachuras2)])
+
+    fig.tight_layout()
+
+    return fig
+
+
+def estilo_de_vida(perfil):
+    """Fatores de estilo de vida: IMC, tabagismo, álcool, atividade física, dieta e sono."""
+    fig, ax = plt.subplots(2,3,figsize=(16, 10))
+
+    fig.suptitle("Fatores de Estilo de Vida")
+
+    desenhar_histograma(ax[0,0], perfil["BMI"].histograma, color="green", kde=True)
+    ax[0,0].set_title("Distribuição do IMC")
+    ax[0,0].set_xlabel("BMI")
+    ax[0,0].set_ylabel("Frequência")
+
+    c = desenhar_frequencias(ax[0,1], perfil["Smoking"], palette=["#ff2626", "#2664ff"])
+    ax[0,1].set_title("Distribuição dos Fumantes")
+    ax[0,1].set_xlabel("Smoking")
+    ax[0,1].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#ff2626", hatch="//", label = "Não"),
+        Patch(facecolor="#2664ff", hatch="\\\\", label = "Sim")
+    ]
+    ax[0,1].legend(title="Fumante?", loc="upper right", handles=patches)
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras1[i%len(hachuras1)])
+
+    desenhar_histograma(ax[0,2], perfil["AlcoholConsumption"].histograma, color="purple", kde=True)
+    ax[0,2].set_title("Distribuição do Consumo de Álcool (Unidades)")
+    ax[0,2].set_xlabel("AlcoholConsumption")
+    ax[0,2].set_ylabel("Frequência")
+
+    desenhar_histograma(ax[1,0], perfil["PhysicalActivity"].histograma, color="orange", kde=True)
+    ax[1,0].set_title("Distribuição da Atividade Física Semanal (Horas)")
+    ax[1,0].set_xlabel("PhysicalActivity")
+    ax[1,0].set_ylabel("Frequência")
+
+    desenhar_histograma(ax[1,1], perfil["DietQuality"].histograma, color="pink", kde=True)
+    ax[1,1].set_title("Distribuição da Qualidade da Dieta (Score)")
+    ax[1,1].set_xlabel("DietQuality")
+    ax[1,1].set_ylabel("Frequência")
+
+    desenhar_histograma(ax[1,2], perfil["SleepQuality"].histograma, color="brown", kde=True)
+    ax[1,1].set_title("Distribuição da Qualidade do Sono (Score)")
+    ax[1,1].set_xlabel("SleepQuality")
+    ax[1,1].set_ylabel("Frequência")
+
+    fig.tight_layout()
+
+    return fig
+
+
+def historico_medico(perfil):
+    """Histórico médico: histórico familiar e comorbidades."""
+    fig, ax = plt.subplots(2,3,figsize=(16, 10))
+
+    fig.suptitle("Histórico Médico")
+
+    c = desenhar_frequencias(ax[0,0], perfil["FamilyHistoryAlzheimers"], palette=["#ff2626","#2664ff"])
+    ax[0,0].set_title("Distribuição do histórico de Alzheimer na família")
+    ax[0,0].set_xlabel("FamilyHistoryAlzheimers")
+    ax[0,0].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#ff2626", hatch="//", label = "Não"),
+        Patch(facecolor="#2664ff", hatch="\\\\", label = "Sim")
+    ]
+    ax[0,0].legend(title="Histórico de Alzheimer?", loc="upper right", handles=patches)
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras1[i%len(hachuras1)])
+
+    c = desenhar_frequencias(ax[0,1], perfil["CardiovascularDisease"], palette="Set2")
+    ax[0,1].set_title("Distribuição da presença de Doença Cardiovascular")
+    ax[0,1].set_xlabel("CardiovascularDisease")
+    ax[0,1].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#72b6a1", hatch="//", label = "Não"),
+        Patch(facecolor="#e99675", hatch="\\\\", label = "Sim")
+    ]
+    ax[0,1].legend(title="Doença Cardiovascular?", loc="upper right", handles=patches)
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras1[i%len(hachuras1)])
+
+    c = desenhar_frequencias(ax[0,2], perfil["Diabetes"], palette="Set3")
+    ax[0,2].set_title("Distribuição da presença de Diabetes")
+    ax[0,2].set_xlabel("Diabetes")
+    ax[0,2].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#96cac1", hatch="//", label = "Não"),
+        Patch(facecolor="#f6f6bc", hatch="\\\\", label = "Sim")
+    ]
+    ax[0,2].legend(title="Presença de Diabetes?", loc="upper right", handles=patches)
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras1[i%len(hachuras1)])
+
+    c = desenhar_frequencias(ax[1,0], perfil["Depression"], palette=["#ff13ed","#ffed13"])
+    ax[1,0].set_title("Distribuição da presença de Depressão")
+    ax[1,0].set_xlabel("Depression")
+    ax[1,0].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#ff13ed", hatch="//", label = "Não"),
+        Patch(facecolor="#ffed13", hatch="\\\\", label = "Sim")
+    ]
+    ax[1,0].legend(title="Presença de Depressão?", loc="upper right", handles=patches)
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras1[i%len(hachuras1)])
+
+    c = desenhar_frequencias(ax[1,1], perfil["HeadInjury"], palette=["#49ff13", "#1c4fee"])
+    ax[1,1].set_title("Distribuição do histórico de Ferimento na Cabeça")
+    ax[1,1].set_xlabel("HeadInjury")
+    ax[1,1].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#49ff13", hatch="//", label = "Não"),
+        Patch(facecolor="#1c4fee", hatch="\\\\", label = "Sim")
+    ]
+    ax[1,1].legend(title="Ferimento na Cabeça?", loc="upper right", handles=patches)
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras1[i%len(hachuras1)])
+
+    c = desenhar_frequencias(ax[1,2], perfil["Hypertension"], palette=["#16f4ed","#9d580b"])
+    ax[1,2].set_title("Distribuição de presença de Hipertensão")
+    ax[1,2].set_xlabel("Hypertension")
+    ax[1,2].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#16f4ed", hatch="//", label = "Não"),
+        Patch(facecolor="#9d580b", hatch="\\\\", label = "Sim")
+    ]
+    ax[1,2].legend(title="Presença de Hipertensão?", loc="upper right", handles=patches)
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras1[i%len(hachuras1)])
+
+    fig.tight_layout()
+
+    return fig
+
+
+def medicoes_clinicas(perfil):
+    """Medições clínicas: pressão arterial e colesterol."""
+    fig, ax = plt.subplots(2,3,figsize=(16, 10))
+
+    fig.suptitle("Medições Clínicas")
+
+    desenhar_histograma(ax[0,0], perfil["SystolicBP"].histograma, color="#ff2626", kde=True)
+    ax[0,0].set_title("Distribuição da Pressão Sistólica (mmHg)")
+    ax[0,0].set_xlabel("SystolicBP")
+    ax[0,0].set_ylabel("Frequência")
+
+    desenhar_histograma(ax[0,1], perfil["DiastolicBP"].histograma, color="#2664ff", kde=True)
+    ax[0,1].set_title("Distribuição da Pressão Diastólica (mmHg)")
+    ax[0,1].set_xlabel("DiastolicBP")
+    ax[0,1].set_ylabel("Frequência")
+
+    desenhar_histograma(ax[0,2], perfil["CholesterolTotal"].histograma, color="#eb9d2d", kde=True)
+    ax[0,2].set_title("Distribuição do Nível de Colesterol Total (mg/dL)")
+    ax[0,2].set_xlabel("CholesterolTotal")
+    ax[0,2].set_ylabel("Frequência")
+
+    desenhar_histograma(ax[1,0], perfil["CholesterolLDL"].histograma, color="#4fea34", kde=True)
+    ax[1,0].set_title("Distribuição da Nível de Colesterol LDL (mg/dL)")
+    ax[1,0].set_xlabel("CholesterolLDL")
+    ax[1,0].set_ylabel("Frequência")
+
+    desenhar_histograma(ax[1,1], perfil["CholesterolHDL"].histograma, color="#7e2de5", kde=True)
+    ax[1,1].set_title("Distribuição da Nível de Colesterol HDL (mg/dL)")
+    ax[1,1].set_xlabel("CholesterolLDL")
+    ax[1,1].set_ylabel("Frequência")
+
+    desenhar_histograma(ax[1,2], perfil["CholesterolTriglycerides"].histograma, color="#9d580b", kde=True)
+    ax[1,2].set_title("Distribuição da Nível de Triglicerídeos (mg/dL)")
+    ax[1,2].set_xlabel("CholesterolTriglycerides")
+    ax[1,2].set_ylabel("Frequência")
+
+    fig.tight_layout()
+
+    return fig
+
+
+def avaliacoes_cognitivas(perfil):
+    """Avaliações cognitivas e funcionais: MMSE, avaliação funcional, queixas e ADL."""
+    fig, ax = plt.subplots(2,3,figsize=(16, 10))
+
+    fig.suptitle("Avaliações Cognitivas e Funcionais")
+
+    desenhar_histograma(ax[0,0], perfil["MMSE"].histograma, color="#ff2626", kde=True)
+    ax[0,0].set_title("Distribuição do Mini-Exame do Estado Mental (Score)")
+    ax[0,0].set_xlabel("MMSE")
+    ax[0,0].set_ylabel("Frequência")
+
+    desenhar_histograma(ax[0,1], perfil["FunctionalAssessment"].histograma, color="#2664ff", kde=True)
+    ax[0,1].set_title("Distribuição da Avaliação Funcional (Score)")
+    ax[0,1].set_xlabel("FunctionalAssessment")
+    ax[0,1].set_ylabel("Frequência")
+
+    c = desenhar_frequencias(ax[0,2], perfil["MemoryComplaints"], palette=["#ff2626","#2664ff"])
+    ax[0,2].set_title("Distribuição da presença de Queixas de Memória")
+    ax[0,2].set_xlabel("MemoryComplaints")
+    ax[0,2].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#ff2626", hatch="//", label = "Não"),
+        Patch(facecolor="#2664ff", hatch="\\\\", label = "Sim")
+    ]
+    ax[0,2].legend(title="Queixas de Memória?", loc="upper right", labels=["Não", "Sim"])
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras1[i%len(hachuras1)])
+
+    c = desenhar_frequencias(ax[1,0], perfil["BehavioralProblems"], palette=["#49ff13", "#1c4fee"])
+    ax[1,0].set_title("Distribuição de Problemas Comportamentais")
+    ax[1,0].set_xlabel("BehavioralProblems")
+    ax[1,0].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#49ff13", hatch="//", label = "Não"),
+        Patch(facecolor="#1c4fee", hatch="\\\\", label = "Sim")
+    ]
+    ax[1,0].legend(title="Problemas Comportamentais?", loc="upper right", handles=patches)
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras1[i%len(hachuras1)])
+
+    desenhar_histograma(ax[1,1], perfil["ADL"].histograma, color="#eb9d2d", kde=True)
+    ax[1,1].set_title("Distribuição das Atividades de Vida Diária (Score)")
+    ax[1,1].set_xlabel("ADL")
+    ax[1,1].set_ylabel("Frequência")
+
+    fig.delaxes(ax=ax[1,2])
+
+    fig.tight_layout()
+
+    return fig
+
+
+def sintomas_diagnostico(perfil):
+    """Sintomas e diagnóstico."""
+    fig, ax = plt.subplots(2,3,figsize=(16, 10))
+
+    fig.suptitle("Sintomas e Diagnóstico")
+
+    c = desenhar_frequencias(ax[0,0], perfil["Confusion"], palette=["#ff2626","#2664ff"])
+    ax[0,0].set_title("Distribuição da presença de Confusão")
+    ax[0,0].set_xlabel("Confusion")
+    ax[0,0].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#ff2626", hatch="//", label = "Não"),
+        Patch(facecolor="#2664ff", hatch="\\\\", label = "Sim")
+    ]
+    ax[0,0].legend(title="Confusão?", loc="upper right", handles=patches)
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras1[i%len(hachuras1)])
+
+    c = desenhar_frequencias(ax[0,1], perfil["Disorientation"], palette="Set2")
+    ax[0,1].set_title("Distribuição da presença de Desorientação")
+    ax[0,1].set_xlabel("Disorientation")
+    ax[0,1].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#72b6a1", hatch="//", label = "Não"),
+        Patch(facecolor="#e99675", hatch="\\\\", label = "Sim")
+    ]
+    ax[0,1].legend(title="Presença de Desorientação?", loc="upper right", handles=patches)
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras1[i%len(hachuras1)])
+
+    c = desenhar_frequencias(ax[0,2], perfil["PersonalityChanges"], palette="Set3")
+    ax[0,2].set_title("Distribuição de Mudanças de Personalidade")
+    ax[0,2].set_xlabel("PersonalityChanges")
+    ax[0,2].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#96cac1", hatch="//", label = "Não"),
+        Patch(facecolor="#f6f6bc", hatch="\\\\", label = "Sim")
+    ]
+    ax[0,2].legend(title="Mudanças?", loc="upper right", handles=patches)
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras1[i%len(hachuras1)])
+
+    c = desenhar_frequencias(ax[1,0], perfil["DifficultyCompletingTasks"], palette=["#ff13ed","#ffed13"])
+    ax[1,0].set_title("Distribuição de Dificuldade de Completar Tarefas")
+    ax[1,0].set_xlabel("DifficultyCompletingTasks")
+    ax[1,0].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#ff13ed", hatch="//", label = "Não"),
+        Patch(facecolor="#ffed13", hatch="\\\\", label = "Sim")
+    ]
+    ax[1,0].legend(title="Dificuldades?", loc="upper right", handles=patches)
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras1[i%len(hachuras1)])
+
+    c = desenhar_frequencias(ax[1,1], perfil["Forgetfulness"], palette=["#49ff13", "#1c4fee"])
+    ax[1,1].set_title("Distribuição da presença de Esquecimento")
+    ax[1,1].set_xlabel("Forgetfulness")
+    ax[1,1].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#49ff13", hatch="//", label = "Não"),
+        Patch(facecolor="#1c4fee", hatch="\\\\", label = "Sim")
+    ]
+    ax[1,1].legend(title="Presença de Esquecimento?", loc="upper right", handles=patches)
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras1[i%len(hachuras1)])
+
+    c = desenhar_frequencias(ax[1,2], perfil["Diagnosis"], palette=["#16f4ed","#9d580b"])
+    ax[1,2].set_title("Distribuição do Diagnóstico")
+    ax[1,2].set_xlabel("Diagnosis")
+    ax[1,2].set_ylabel("Frequência")
+    patches = [
+        Patch(facecolor="#16f4ed", hatch="//", label = "Não"),
+        Patch(facecolor="#9d580b", hatch="\\\\", label = "Sim")
+    ]
+    ax[1,2].legend(title="Presença de Alzheimer?", loc="upper right", handles=patches)
+    for i, bar in enumerate(c.patches):
+      bar.set_hatch(hachuras1[i%len(hachuras1)])
+
+    fig.tight_layout()
+
+    return fig
+
+
+# Grupos de gráficos da página, na ordem de exibição: id -> (título, construtor(perfil))
+GRUPOS = {
+    "histogramas_numericos": ("Distribuição das Variáveis Numéricas", histogramas_numericos),
+    "demograficos": ("Detalhes Demográficos", demograficos),
+    "estilo_de_vida": ("Fatores de Estilo de Vida", estilo_de_vida),
+    "historico_medico": ("Histórico Médico", historico_medico),
+    "medicoes_clinicas": ("Medições Clínicas", medicoes_clinicas),
+    "avaliacoes_cognitivas": ("Avaliações Cognitivas e Funcionais", avaliacoes_cognitivas),
+    "sintomas_diagnostico": ("Sintomas e Diagnóstico", sintomas_diagnostico),
+}
@@ -0,0 +1,361 @@
+"""Construção das figuras da página de hipóteses.
+
+Cada função devolve uma `matplotlib.figure.Figure` sem exibi-la. Resultados
+de modelos que aparecem no gráfico (coeficientes, previsões) são recebidos
+como argumentos, para que a página os calcule uma única vez. Gráficos de
+pontos desenham no máximo `LIMITE_PONTOS` marcadores (ver `utils.amostragem`)
+e os gráficos categóricos da hipótese 4.2 recebem apenas a tabela de
+contingência (ver `utils.contingencia`), nunca as linhas.
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib.patches import Patch
+from scipy.special import expit
+
+from utils.agregados import desenhar_densidade, desenhar_histograma
+from utils.amostragem import acima_do_limite, amostra_para_pontos
+
+# Pontos da grade comum em que as curvas KDE empilhadas são desenhadas
+KDE_PONTOS = 200
+
+
+def tabagismo_hdl(data):
+    """Strip plot e boxplot do colesterol HDL por tabagismo (4.1)."""
+    fig, ax = plt.subplots(1, 2, figsize=(12, 5))
+    pontos = amostra_para_pontos(data, "Smoking")
+
+    # Stripplot com símbolos diferentes para fumantes e não fumantes
+    sns.stripplot(x="Smoking", y="CholesterolHDL", data=pontos, ax=ax[0], jitter=0.2, palette="Set1", marker='s', label="Não Fumante")
+    sns.stripplot(x="Smoking", y="CholesterolHDL", data=pontos, ax=ax[0], jitter=0.2, palette="Set1", marker='^', label="Fumante")
+    ax[0].set_title("Relação entre Fumo e Colesterol HDL")
+    ax[0].set_xlabel("Fumante (0 = Não, 1 = Sim)")
+    ax[0].set_ylabel("Colesterol HDL")
+    ax[0].legend()
+
+    # Boxplot com padrões visuais para acessibilidade
+    box = sns.boxplot(x="Smoking", y="CholesterolHDL", data=data, ax=ax[1], palette="Set2")
+    ax[1].set_title("Distribuição de Colesterol HDL entre Fumantes e Não-Fumantes")
+    ax[1].set_xlabel("Fumante (0 = Não, 1 = Sim)")
+    ax[1].set_ylabel("Colesterol HDL")
+
+    # Adicionando padrões visuais nos boxplots
+    for i, patch in enumerate(box.patches):
+        if i % 2 == 0:
+            patch.set_hatch("//")  # Listras
+        else:
+            patch.set_hatch("o")  # Bolinhas
+
+    return fig
+
+
+def tabagismo_hdl_regressao(data, coef, intercept):
+    """Curva da regressão logística Smoking ~ CholesterolHDL (4.1)."""
+    fig, ax = plt.subplots(figsize=(8, 5))
+    pontos = amostra_para_pontos(data, "Smoking")
+    sns.scatterplot(data=pontos, x="CholesterolHDL", y="Smoking", palette="colorblind", hue=True, legend=False, ax=ax)
+
+    textstr = f'β1: {round(float(coef), 3)}'
+    props = dict(boxstyle='round', facecolor='white', alpha=0.5)
+    ax.text(0.95, 0.7, textstr, transform=ax.transAxes, fontsize=12,
+            verticalalignment='center', horizontalalignment='right', bbox=props)
+
+    x_test_range = np.linspace(20, 100, 300)
+    loss = expit(x_test_range * coef + intercept).ravel()
+    plt.plot(x_test_range, loss, label="Logistic Regression Model", color='red', linewidth=3)
+    plt.xlabel("CholesterolHDL")
+    plt.ylabel("Smoking")
+    plt.legend()
+
+    return fig
+
+
+def tabagismo_hdl_cdf(data):
+    """CDF do colesterol HDL por tabagismo (4.1)."""
+    fig, ax = plt.subplots(figsize=(8, 5))
+    sns.ecdfplot(data=data, x="CholesterolHDL", hue="Smoking", palette=["blue", "red"], ax=ax)
+    ax.set_title("Função de Distribuição Acumulada - CholesterolHDL vs Smoking")
+    ax.set_xlabel("Nível de Colesterol HDL")
+    ax.set_ylabel("Probabilidade Acumulada")
+    ax.legend(title="Fumante", labels=["Não", "Sim"])
+
+    return fig
+
+
+def historico_diagnostico_barras(tabela):
+    """Contagem de diagnósticos por histórico familiar, a partir da tabela FamilyHistoryAlzheimers x Diagnosis (4.2)."""
+    fig, ax = plt.subplots(figsize=(8, 6))
+
+    # Definição de padrões visuais alternados
+    patterns = ["//", "//", "o", "o"]  # Alternância entre listras e bolinhas
+    colors = ["gray", "blue"]
+
+    # Criar barras agrupadas como no `sns.countplot(x="FamilyHistoryAlzheimers", hue="Diagnosis")`
+    largura = 0.8 / len(tabela.columns)
+    posicoes = np.arange(len(tabela.index))
+    for j, diagnostico in enumerate(tabela.columns):
+        ax.bar(posicoes + (j - (len(tabela.columns) - 1) / 2) * largura, tabela[diagnostico], width=largura,
+               color=sns.desaturate(colors[j], 0.75), label=str(diagnostico))
+    ax.set_xticks(posicoes, [str(valor) for valor in tabela.index])
+    ax.set_title("Histórico Familiar vs. Diagnóstico")
+    ax.set_xlabel("Histórico Familiar (0 = Não, 1 = Sim)")
+    ax.set_ylabel("Contagem")
+
+    # Aplicando padrões alternados para cada barra
+    for i, bar in enumerate(ax.patches):
+        bar.set_hatch(patterns[i % len(patterns)])
+
+    # Criando legenda com padrões visuais
+    legend_patches = [
+        Patch(facecolor=colors[0], hatch="//", label="Hist. Familiar - Negativo (0)"),
+        Patch(facecolor=colors[0], hatch="o", label="Hist. Familiar - Positivo (1)"),
+        Patch(facecolor=colors[1], hatch="//", label="Diagnóstico Negativo"),
+        Patch(facecolor=colors[1], hatch="o", label="Diagnóstico Positivo")
+    ]
+    ax.legend(handles=legend_patches, title="Legenda")
+
+    return fig
+
+
+def historico_diagnostico_pairplot(tabela):
+    """Pair plot de FamilyHistoryAlzheimers e Diagnosis a partir da tabela de contingência (4.2).
+
+    Como as duas variáveis são binárias, cada painel fora da diagonal mostra
+    as quatro combinações com marcadores de área proporcional à contagem, e
+    a diagonal mostra a contagem de cada valor por histórico familiar.
+    """
+    variaveis = [tabela.index.name, tabela.columns.name]
+    cores = sns.color_palette("husl", len(tabela.index))
+    fig, axes = plt.subplots(2, 2, figsize=(7.5, 6), sharex="col")
+    maximo = tabela.to_numpy().max()
+    for historico, cor in zip(tabela.index, cores):
+        linha = tabela.loc[historico]
+        # Diagonal: contagem de cada valor da variável no grupo
+        axes[0, 0].bar(historico, linha.sum(), width=0.4, color=cor, alpha=0.6)
+        axes[1, 1].bar(linha.index + (historico - 0.5) * 0.4, linha.to_numpy(), width=0.4, color=cor, alpha=0.6)
+        # Fora da diagonal: as combinações observadas
+        tamanhos = 400 * linha.to_numpy() / max(maximo, 1)
+        axes[0, 1].scatter(linha.index, [historico] * len(linha), s=tamanhos, color=cor, edgecolor="white")
+        axes[1, 0].scatter([historico] * len(linha), linha.index, s=tamanhos, color=cor, edgecolor="white")
+    for i, variavel_y in enumerate(variaveis):
+        axes[i, 0].set_ylabel(variavel_y)
+        axes[1, i].set_xlabel(variaveis[i])
+        axes[1, i].set_xticks([0, 1])
+    axes[0, 0].set_ylabel(variaveis[0] + "\n(contagem)")
+    axes[1, 1].set_ylabel("contagem")
+    fig.legend(
+        handles=[Patch(facecolor=cor, label=str(historico)) for historico, cor in zip(tabela.index, cores)],
+        title=variaveis[0], loc="center right",
+    )
+    fig.tight_layout(rect=(0, 0, 0.75, 1))
+
+    return fig
+
+
+def historico_diagnostico_regressao(data, coef, intercept):
+    """Curva da regressão logística Diagnosis ~ FamilyHistoryAlzheimers (4.2)."""
+    fig, ax = plt.subplots(figsize=(8, 6))
+    pontos = amostra_para_pontos(data, ["FamilyHistoryAlzheimers", "Diagnosis"])
+    plt.scatter(pontos['FamilyHistoryAlzheimers'], pontos['Diagnosis'], color='blue', alpha=0.5, label="Dados Observados")
+    X_test_range = np.linspace(0, 1, 500).reshape(-1, 1)
+    y_prob = expit(X_test_range * coef + intercept)
+    plt.plot(X_test_range, y_prob, color='red', linewidth=2, label="Curva Logística")
+    plt.title("Regressão Logística: Diagnóstico x Histórico Familiar", fontsize=14)
+    plt.xlabel("FamilyHistoryAlzheimers (0 = Não, 1 = Sim)", fontsize=12)
+    plt.ylabel("Probabilidade de Diagnóstico Positivo", fontsize=12)
+    plt.legend()
+
+    return fig
+
+
+def kde_de_contagens(valores, contagens, total, gridsize=200, cut=3):
+    """KDE gaussiana (largura de Scott) de uma variável discreta a partir das contagens de cada valor.
+
+    Equivale ao `sns.kdeplot` sobre as linhas do grupo, com a densidade
+    multiplicada pela fração `n / total` do grupo (`common_norm=True`).
+    Retorna (x, densidade), ou None se o grupo tiver um único valor.
+    """
+    valores, contagens = np.asarray(valores, dtype=np.float64), np.asarray(contagens, dtype=np.float64)
+    n = contagens.sum()
+    media = (valores * contagens).sum() / n
+    variancia = (contagens * (valores - media) ** 2).sum() / (n - 1) if n > 1 else 0.0
+    if variancia <= 0:
+        return None
+    largura = np.sqrt(variancia) * n ** (-1 / 5)
+    x = np.linspace(valores.min() - cut * largura, valores.max() + cut * largura, gridsize)
+    nucleos = np.exp(-0.5 * ((x[:, None] - valores[None, :]) / largura) ** 2) / (largura * np.sqrt(2 * np.pi))
+    return x, nucleos @ contagens / total
+
+
+def historico_diagnostico_pdf(tabela):
+    """Densidade do diagnóstico por histórico familiar, a partir da tabela de contingência (4.2)."""
+    fig, ax = plt.subplots(figsize=(8, 5))
+    total = tabela.to_numpy().sum()
+    handles = []
+    for historico, cor, rotulo in zip(tabela.index, ["gray", "blue"], ["Não", "Sim"]):
+        curva = kde_de_contagens(tabela.columns, tabela.loc[historico], total)
+        if curva is None:
+            continue
+        ax.fill_between(*curva, color=cor, alpha=0.25, linewidth=0)
+        ax.plot(*curva, color=cor)
+        handles.append(Patch(facecolor=cor, alpha=0.5, label=rotulo))
+    ax.set_title("Função de Densidade de Probabilidade - Diagnóstico de Alzheimer vs Histórico Familiar")
+    ax.set_xlabel("Diagnóstico de Alzheimer (0 = Negativo, 1 = Positivo)")
+    ax.set_ylabel("Densidade de Probabilidade")
+    ax.legend(handles=handles, title="Histórico Familiar")
+
+    return fig
+
+
+def dieta_mmse_dispersao(data):
+    """Dispersão DietQuality x MMSE com distribuições marginais (4.3)."""
+    if acima_do_limite(data):
+        # Densidade em grade no lugar de um ponto por paciente
+        p = sns.JointGrid(data=data, x="DietQuality", y="MMSE")
+        desenhar_densidade(p.ax_joint, data["DietQuality"], data["MMSE"], colorbar=False)
+        p.plot_marginals(sns.histplot, bins=30, fill=False)
+    else:
+        p = sns.jointplot(data=data, x="DietQuality", y="MMSE", kind="scatter", marginal_kws=dict(bins=30, fill=False))
+    p.fig.suptitle("DietQuality x MMSE")
+    p.fig.tight_layout()
+    p.fig.text(0.5, -0.05, "O gráfico de dispersão posiciona as amostras no espaço dos atributos DietQuality e MMSE nos eixos X e Y acompanhado de suas distribuições. Não é possível observar visualmente nenhuma tendência.", wrap=True, horizontalalignment='center')
+
+    return p.fig
+
+
+def dieta_mmse_regressao(x_test, y_test, y_pred):
+    """Valores reais e previstos da regressão linear MMSE ~ DietQuality (4.3)."""
+    fig, ax = plt.subplots(figsize=(8, 6))
+    pontos = amostra_para_pontos(pd.DataFrame({
+        "x": x_test.values.reshape(1,-1)[0], "real": y_test.values.reshape(1,-1)[0], "previsto": y_pred.reshape(1,-1)[0],
+    }))
+    sns.scatterplot(x=pontos["x"].values, y=pontos["real"].values, label="Dados Reais")
+    sns.scatterplot(x=pontos["x"].values, y=pontos["previsto"].values, label="Previsões")
+    plt.title("Regressão Linear - DietQuality x MMSE")
+    plt.xlabel("DietQuality")
+    plt.ylabel("MMSE")
+
+    return fig
+
+
+def dieta_histograma(hist):
+    """Histograma da qualidade da dieta (4.3), a partir do agregado pré-calculado."""
+    fig, ax = plt.subplots(figsize=(8, 5))
+    desenhar_histograma(ax, hist, color="blue", kde=True, alpha=0.5)
+    ax.set_title("Histograma - Distribuição da Qualidade da Dieta")
+    ax.set_xlabel("Qualidade da Dieta")
+    ax.set_ylabel("Frequência")
+
+    return fig
+
+
+def atividade_sintomas_boxplots(data, medianas=None):
+    """Boxplots da atividade física por Confusion e Forgetfulness (4.4).
+
+    `medianas` ({sintoma: Series nível -> mediana}, por exemplo do resumo
+    incremental) substitui o `groupby(...).median()` das anotações.
+    """
+    fig, ax = plt.subplots(1, 2, figsize=(14, 6))
+    if medianas is None:
+        medianas = {sintoma: data.groupby(sintoma)['PhysicalActivity'].median() for sintoma in ['Confusion', 'Forgetfulness']}
+
+    # Boxplot para Confusion
+    sns.boxplot(data=data, x='Confusion', y='PhysicalActivity', showfliers=False, palette='pastel', ax=ax[0])
+    medians_confusion = medianas['Confusion']
+    for i, median in enumerate(medians_confusion):
+        ax[0].text(i, median + 0.1, f"{median:.2f}", ha='center', color='blue', fontsize=10)
+    ax[0].set_title('Atividade Física vs Confusion')
+    ax[0].set_xlabel('Confusion (0: Não, 1: Sim)')
+    ax[0].set_ylabel('Atividade Física')
+
+    # Boxplot para Forgetfulness
+    sns.boxplot(data=data, x='Forgetfulness', y='PhysicalActivity', showfliers=False, palette='pastel', ax=ax[1])
+    medians_forgetfulness = medianas['Forgetfulness']
+    for i, median in enumerate(medians_forgetfulness):
+        ax[1].text(i, median + 0.1, f"{median:.2f}", ha='center', color='blue', fontsize=10)
+    ax[1].set_title('Atividade Física vs Forgetfulness')
+    ax[1].set_xlabel('Forgetfulness (0: Não, 1: Sim)')
+    ax[1].set_ylabel('Atividade Física')
+
+    return fig
+
+
+def atividade_sintomas_histogramas(por_sintoma):
+    """Histogramas empilhados da atividade física por Confusion e Forgetfulness (4.4).
+
+    `por_sintoma` é {sintoma: {nível: Histograma}}, os agregados de cada
+    grupo (ver `utils.agregados.histogramas_por_grupo`); as barras e as
+    curvas KDE dos grupos são empilhadas como no `multiple="stack"` do
+    seaborn, com o último nível embaixo.
+    """
+    fig, ax = plt.subplots(1, 2, figsize=(12, 6))
+    cores = sns.color_palette("Set2")
+
+    for eixo, (sintoma, grupos) in zip(ax, por_sintoma.items()):
+        curvas = [hist for hist in grupos.values() if hist.kde_x is not None]
+        grade = None
+        if curvas:
+            grade = np.linspace(min(h.kde_x[0] for h in curvas), max(h.kde_x[-1] for h in curvas), KDE_PONTOS)
+        base, base_kde = 0, 0
+        for cor, (nivel, hist) in reversed(list(zip(cores, grupos.items()))):
+            eixo.bar(hist.edges[:-1], hist.counts, width=np.diff(hist.edges), align="edge", bottom=base,
+                     color=cor, alpha=0.75, edgecolor="black", linewidth=0.5, label=str(nivel))
+            base = base + hist.counts
+            if hist.kde_x is not None:
+                base_kde = base_kde + np.interp(grade, hist.kde_x, hist.kde_y, left=0, right=0)
+                eixo.plot(grade, base_kde, color=cor)
+        handles, labels = eixo.get_legend_handles_labels()
+        eixo.legend(handles[::-1], labels[::-1], title=sintoma)
+        eixo.set_title(f'Distribuição de PhysicalActivity por {sintoma}')
+        eixo.set_xlabel('Physical Activity (0 a 10)')
+        eixo.set_ylabel('Frequência')
+
+    return fig
+
+
+def atividade_sintomas_cdf(data):
+    """CDF da atividade física por Confusion (4.4)."""
+    fig, ax = plt.subplots(figsize=(8, 5))
+    sns.ecdfplot(data=data, x="PhysicalActivity", hue="Confusion", palette=["blue", "red"], ax=ax)
+    ax.set_title("Função de Distribuição Acumulada - Atividade Física vs Sintomas Cognitivos")
+    ax.set_xlabel("Atividade Física")
+    ax.set_ylabel("Probabilidade Acumulada")
+    ax.legend(title="Sintomas Cognitivos", labels=["Não", "Sim"])
+
+    return fig
+
+
+def atividade_depressao(data):
+    """Boxplot e violino da atividade física por depressão (4.5)."""
+    fig, ax = plt.subplots(1, 2, figsize=(14, 6))
+
+    # Boxplot para Depressão
+    sns.boxplot(data=data, x='Depression', y='PhysicalActivity', showfliers=False, palette='coolwarm', ax=ax[0])
+    medians_depression = data.groupby('Depression')['PhysicalActivity'].median()
+    for i, median in enumerate(medians_depression):
+        ax[0].text(i, median + 0.1, f"{median:.2f}", ha='center', color='blue', fontsize=10)
+    ax[0].set_title('Atividade Física vs Depressão')
+    ax[0].set_xlabel('Depression (0: Não, 1: Sim)')
+    ax[0].set_ylabel('Atividade Física')
+
+    # Gráfico de Violino
+    sns.violinplot(data=data, x='Depression', y='PhysicalActivity', palette='coolwarm', split=True, ax=ax[1])
+    ax[1].set_title('Distribuição de Atividade Física por Depressão')
+    ax[1].set_xlabel('Depression (0: Não, 1: Sim)')
+    ax[1].set_ylabel('Atividade Física')
+
+    return fig
+
+
+def atividade_depressao_cdf(data):
+    """CDF da atividade física por depressão (4.5)."""
+    fig, ax = plt.subplots(figsize=(8, 5))
+    sns.ecdfplot(data=data, x="PhysicalActivity", hue="Depression", palette=["gray", "blue"], ax=ax)
+    ax.set_title("Função de Distribuição Acumulada - Atividade Física vs Depressão")
+    ax.set_xlabel("Atividade Física (0 a 10)")
+    ax.set_ylabel("Probabilidade Acumulada")
+    ax.legend(title="Depressão", labels=["Não", "Sim"])
+
+    return fig
@@ -0,0 +1,533 @@
+"""Gráficos interativos (Altair/Vega-Lite) montados a partir de agregados.
+
+As figuras do matplotlib são rasterizadas no servidor e chegam ao navegador
+como um PNG por figura. Aqui o servidor calcula apenas os agregados de cada
+gráfico (contagens por bin e curva KDE dos histogramas, frequências das
+colunas discretas, os cinco números dos boxplots, a ECDF em uma grade de
+pontos e, nos gráficos de pontos, uma amostra de no máximo `LIMITE_PONTOS`
+linhas) e o navegador desenha o gráfico com o Vega-Lite. Tooltips e zoom
+(arrastar e rolar sobre os eixos contínuos) não executam a página de novo.
+
+Cada construtor devolve um gráfico do Altair; a especificação serializada
+(ver `utils.figuras.grafico_para_bytes`) é o que fica em cache e no pacote
+de artefatos. Os gráficos da página de descrição estão em GRUPOS, com os
+mesmos identificadores de `utils.graficos_descricao.GRUPOS`; os da página de
+hipóteses, em `utils.hipoteses.GRAFICOS`.
+"""
+
+import re
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+from matplotlib.colors import is_color_like
+from scipy.special import expit
+
+from utils.agregados import histogramas
+from utils.amostragem import amostra_para_pontos
+from utils.coortes import FILTROS_NIVEIS
+from utils.graficos_hipoteses import kde_de_contagens
+
+# Número máximo de pontos enviados ao navegador por gráfico de pontos
+LIMITE_PONTOS = 2_000
+
+# Pontos das curvas (KDE, ECDF, regressão logística)
+PONTOS_CURVA = 128
+
+# Casas decimais dos valores enviados ao navegador
+CASAS_DECIMAIS = 3
+
+# Bins dos histogramas por grupo
+BINS = 30
+
+# Tamanho de cada painel dos gráficos compostos, em pixels
+LARGURA = 240
+ALTURA = 180
+
+# Nome de cada nível das colunas exibidas por nome; as demais colunas binárias usam ROTULOS_BINARIOS
+ROTULOS_BINARIOS = {0: "Não", 1: "Sim"}
+ROTULOS = {coluna: nomes for coluna, (_, nomes) in FILTROS_NIVEIS.items()}
+
+# Chave da preferência do usuário em `st.session_state`
+CHAVE_SESSAO = "graficos_interativos"
+
+
+def seletor_graficos():
+    """Exibe na barra lateral a escolha entre gráficos interativos e imagens estáticas; retorna True para interativos."""
+    # Regravar o valor mantém a escolha ao trocar de página (widgets ausentes perdem o estado)
+    st.session_state[CHAVE_SESSAO] = st.session_state.get(CHAVE_SESSAO, True)
+    return st.sidebar.toggle(
+        "Gráficos interativos", key=CHAVE_SESSAO,
+        help="Desenha os gráficos no navegador, com zoom e detalhes ao passar o mouse. "
+             "Desligado, exibe as imagens estáticas do matplotlib.",
+    )
+
+
+def _rotulos(coluna, valores):
+    nomes = ROTULOS.get(coluna, ROTULOS_BINARIOS)
+    return [nomes.get(valor, str(valor)) for valor in valores]
+
+
+def _cores(cores, dominio=None):
+    """Escala de cor de uma lista de cores ou de um esquema do Vega (por exemplo, "set2")."""
+    opcoes = {} if dominio is None else {"domain": dominio}
+    if isinstance(cores, str):
+        return alt.Scale(scheme=cores, **opcoes)
+    return alt.Scale(range=list(cores), **opcoes)
+
+
+def _grafico(tabela):
+    """Gráfico do Altair sobre `tabela`, com os valores arredondados a CASAS_DECIMAIS (menos bytes por valor)."""
+    return alt.Chart(tabela.round(CASAS_DECIMAIS))
+
+
+def _nome_parametro(prefixo, texto):
+    return f"{prefixo}_{re.sub(r'[^0-9A-Za-z]', '_', texto)}"
+
+
+def _curva(x, y, pontos=PONTOS_CURVA):
+    """Curva (x, y) reduzida a cerca de `pontos` pontos."""
+    passo = max(len(x) // pontos, 1)
+    return pd.DataFrame({"x": x[::passo], "y": y[::passo]})
+
+
+# -----------------------------------------------------------
+#  Agregados calculados no servidor
+# -----------------------------------------------------------
+
+def caixas(data, valor, grupo):
+    """Quartis, mediana e bigodes (1,5 IQR, como o seaborn) de `valor` em cada grupo."""
+    linhas = []
+    for nivel, serie in data.groupby(grupo, observed=True)[valor]:
+        valores = serie.dropna().to_numpy(dtype=np.float64)
+        if not len(valores):
+            continue
+        q1, mediana, q3 = np.percentile(valores, [25, 50, 75])
+        amplitude = 1.5 * (q3 - q1)
+        linhas.append({
+            "nivel": nivel, "n": len(valores), "q1": q1, "mediana": mediana, "q3": q3,
+            "inferior": valores[valores >= q1 - amplitude].min(), "superior": valores[valores <= q3 + amplitude].max(),
+        })
+    caixas = pd.DataFrame(linhas)
+    caixas["grupo"] = _rotulos(grupo, caixas["nivel"])
+    return caixas
+
+
+def ecdf(data, valor, grupo, pontos=PONTOS_CURVA):
+    """Função de distribuição acumulada de `valor` em cada grupo, avaliada em `pontos` pontos da faixa dos dados."""
+    x = np.linspace(data[valor].min(), data[valor].max(), pontos)
+    partes = []
+    for nivel, serie in data.groupby(grupo, observed=True)[valor]:
+        ordenados = np.sort(serie.dropna().to_numpy(dtype=np.float64))
+        proporcao = np.searchsorted(ordenados, x, side="right") / max(len(ordenados), 1)
+        partes.append(pd.DataFrame({"x": x, "proporcao": proporcao, "grupo": _rotulos(grupo, [nivel])[0]}))
+    return pd.concat(partes, ignore_index=True)
+
+
+def histogramas_por_grupo(data, valor, grupo, bins=BINS):
+    """Contagens de `valor` em bins comuns a todos os grupos."""
+    bordas = np.histogram_bin_edges(data[valor].dropna(), bins=bins)
+    partes = []
+    for nivel, serie in data.groupby(grupo, observed=True)[valor]:
+        contagens, _ = np.histogram(serie.dropna(), bins=bordas)
+        partes.append(pd.DataFrame({
+            "inicio": bordas[:-1], "fim": bordas[1:], "contagem": contagens, "grupo": _rotulos(grupo, [nivel])[0],
+        }))
+    return pd.concat(partes, ignore_index=True)
+
+
+def barras_por_grupo(grupos, grupo):
+    """Contagens de `histogramas_por_grupo` a partir de {nível: Histograma} com bins comuns."""
+    return pd.concat([
+        pd.DataFrame({
+            "inicio": hist.edges[:-1], "fim": hist.edges[1:], "contagem": hist.counts,
+            "grupo": _rotulos(grupo, [nivel])[0],
+        })
+        for nivel, hist in grupos.items()
+    ], ignore_index=True)
+
+
+def densidades_por_grupo(data, valor, grupo):
+    """KDE (densidade por unidade de `valor`) de cada grupo, pela aproximação binada de `utils.agregados`."""
+    partes = []
+    for nivel, subconjunto in data.groupby(grupo, observed=True):
+        hist = histogramas(subconjunto, [valor])[valor]
+        if hist.kde_x is None:
+            continue
+        # As curvas de `histogramas` estão na escala das contagens: divide-se pelo total x largura do bin
+        escala = hist.counts.sum() * (hist.edges[1] - hist.edges[0])
+        curva = _curva(hist.kde_x, hist.kde_y / escala)
+        curva["grupo"] = _rotulos(grupo, [nivel])[0]
+        partes.append(curva)
+    return pd.concat(partes, ignore_index=True)
+
+
+# -----------------------------------------------------------
+#  Gráficos básicos
+# -----------------------------------------------------------
+
+def histograma(hist, coluna, titulo, cor="steelblue", kde=True):
+    """Histograma de um `Histograma` pré-calculado, com a curva KDE opcional."""
+    barras = _grafico(pd.DataFrame({"inicio": hist.edges[:-1], "fim": hist.edges[1:], "contagem": hist.counts}))
+    grafico = barras.mark_bar(color=cor, opacity=0.75, stroke="black", strokeWidth=0.5).encode(
+        x=alt.X("inicio:Q", bin="binned", title=coluna),
+        x2="fim:Q",
+        y=alt.Y("contagem:Q", title="Frequência"),
+        tooltip=[
+            alt.Tooltip("inicio:Q", title="De", format=".2f"), alt.Tooltip("fim:Q", title="Até", format=".2f"),
+            alt.Tooltip("contagem:Q", title="Pacientes"),
+        ],
+    )
+    if kde and hist.kde_x is not None:
+        grafico += _grafico(_curva(hist.kde_x, hist.kde_y)).mark_line(color=cor).encode(x="x:Q", y="y:Q")
+    # Seleção com nome próprio: nas grades, cada painel tem o seu zoom
+    return grafico.properties(title=titulo).interactive(name=_nome_parametro("zoom", coluna), bind_y=False)
+
+
+def _cor_unica(cores):
+    # Cor de uma série só: a primeira de uma lista, a própria cor ou, no lugar de um esquema, a padrão
+    if not isinstance(cores, str):
+        return cores[0]
+    return cores if is_color_like(cores) else "steelblue"
+
+
+def frequencias(resumo, coluna, titulo, cores="tableau10"):
+    """Gráfico de barras das frequências de um `ResumoColuna`, uma cor por nível.
+
+    Colunas sem tabela de frequências (por exemplo, sem nenhum valor válido)
+    viram o histograma do resumo.
+    """
+    if resumo.frequencias is None:
+        return histograma(resumo.histograma, coluna, titulo, cor=_cor_unica(cores))
+    contagens = resumo.frequencias[resumo.frequencias > 0]
+    tabela = pd.DataFrame({"nivel": _rotulos(coluna, contagens.index), "contagem": contagens.to_numpy()})
+    tabela["percentual"] = tabela["contagem"] / tabela["contagem"].sum()
+    return _grafico(tabela).mark_bar().encode(
+        # Rótulos inclinados quando há mais de dois níveis, para não se sobreporem nos painéis estreitos
+        x=alt.X("nivel:N", sort=list(tabela["nivel"]), title=coluna, axis=alt.Axis(labelAngle=0 if len(tabela) <= 2 else -30)),
+        y=alt.Y("contagem:Q", title="Frequência"),
+        color=alt.Color("nivel:N", scale=_cores(cores, list(tabela["nivel"])), legend=None),
+        tooltip=[
+            alt.Tooltip("nivel:N", title=coluna), alt.Tooltip("contagem:Q", title="Pacientes"),
+            alt.Tooltip("percentual:Q", title="Percentual", format=".1%"),
+        ],
+    ).properties(title=titulo)
+
+
+def boxplot(data, valor, grupo, titulo, cores="pastel1", medianas=True):
+    """Boxplot de `valor` por `grupo` desenhado a partir de `caixas`, com o valor da mediana opcional."""
+    base = _grafico(caixas(data, valor, grupo)).encode(
+        x=alt.X("grupo:N", title=grupo, axis=alt.Axis(labelAngle=0)),
+        tooltip=[
+            alt.Tooltip("grupo:N", title=grupo), alt.Tooltip("n:Q", title="Pacientes"),
+            *[alt.Tooltip(f"{campo}:Q", title=nome, format=".2f") for campo, nome in [
+                ("superior", "Bigode superior"), ("q3", "3º quartil"), ("mediana", "Mediana"),
+                ("q1", "1º quartil"), ("inferior", "Bigode inferior"),
+            ]],
+        ],
+    )
+    grafico = alt.layer(
+        base.mark_rule().encode(y=alt.Y("inferior:Q", title=valor), y2="superior:Q"),
+        base.mark_bar(size=60, stroke="black").encode(
+            y="q1:Q", y2="q3:Q", color=alt.Color("grupo:N", scale=_cores(cores), legend=None)),
+        base.mark_tick(size=60, color="black", thickness=2).encode(y="mediana:Q"),
+    )
+    if medianas:
+        grafico += base.mark_text(dy=-8, color="blue").encode(y="mediana:Q", text=alt.Text("mediana:Q", format=".2f"))
+    return grafico.properties(title=titulo)
+
+
+def distribuicao_acumulada(data, valor, grupo, titulo, cores=("blue", "red")):
+    """ECDF de `valor` por `grupo`."""
+    return _grafico(ecdf(data, valor, grupo)).mark_line(interpolate="step-after").encode(
+        x=alt.X("x:Q", title=valor),
+        y=alt.Y("proporcao:Q", title="Probabilidade Acumulada"),
+        color=alt.Color("grupo:N", scale=_cores(cores), title=grupo),
+        tooltip=[
+            alt.Tooltip("grupo:N", title=grupo), alt.Tooltip("x:Q", title=valor, format=".2f"),
+            alt.Tooltip("proporcao:Q", title="Proporção", format=".1%"),
+        ],
+    ).properties(title=titulo).interactive(bind_y=False)
+
+
+def _grade(graficos, titulo, colunas=3):
+    paineis = [grafico.properties(width=LARGURA, height=ALTURA) for grafico in graficos]
+    return alt.concat(*paineis, columns=colunas, title=titulo).resolve_scale(color="independent")
+
+
+# -----------------------------------------------------------
+#  Página de descrição (a partir do perfil de `utils.agregados.perfilar`)
+# -----------------------------------------------------------
+
+def histogramas_numericos(perfil):
+    """Grade com o histograma de cada coluna numérica do perfil."""
+    return _grade(
+        [histograma(resumo.histograma, coluna, coluna, cor="skyblue", kde=False) for coluna, resumo in perfil.items()],
+        "Distribuição das Variáveis Numéricas", colunas=4,
+    )
+
+
+# Painéis de cada grupo: id -> (título, [(coluna, título do painel, cor ou esquema de cores)]).
+# Colunas com tabela de frequências no perfil viram gráficos de barras; as demais, histogramas.
+PAINEIS = {
+    "demograficos": ("Detalhes Demográficos", [
+        ("Age", "Distribuição da Idade (Anos)", "steelblue"),
+        ("Gender", "Distribuição do Gênero", ["#ff2626", "#2664ff"]),
+        ("Ethnicity", "Distribuição da Etnicidade", "set2"),
+        ("EducationLevel", "Distribuição do Nível Educacional", "set3"),
+    ]),
+    "estilo_de_vida": ("Fatores de Estilo de Vida", [
+        ("BMI", "Distribuição do IMC", "green"),
+        ("Smoking", "Distribuição dos Fumantes", ["#ff2626", "#2664ff"]),
+        ("AlcoholConsumption", "Distribuição do Consumo de Álcool (Unidades)", "purple"),
+        ("PhysicalActivity", "Distribuição da Atividade Física Semanal (Horas)", "orange"),
+        ("DietQuality", "Distribuição da Qualidade da Dieta (Score)", "pink"),
+        ("SleepQuality", "Distribuição da Qualidade do Sono (Score)", "brown"),
+    ]),
+    "historico_medico": ("Histórico Médico", [
+        ("FamilyHistoryAlzheimers", "Histórico de Alzheimer na família", ["#ff2626", "#2664ff"]),
+        ("CardiovascularDisease", "Doença Cardiovascular", "set2"),
+        ("Diabetes", "Diabetes", "set3"),
+        ("Depression", "Depressão", ["#ff13ed", "#ffed13"]),
+        ("HeadInjury", "Ferimento na Cabeça", ["#49ff13", "#1c4fee"]),
+        ("Hypertension", "Hipertensão", ["#16f4ed", "#9d580b"]),
+    ]),
+    "medicoes_clinicas": ("Medições Clínicas", [
+        ("SystolicBP", "Pressão Sistólica (mmHg)", "#ff2626"),
+        ("DiastolicBP", "Pressão Diastólica (mmHg)", "#2664ff"),
+        ("CholesterolTotal", "Colesterol Total (mg/dL)", "#eb9d2d"),
+        ("CholesterolLDL", "Colesterol LDL (mg/dL)", "#4fea34"),
+        ("CholesterolHDL", "Colesterol HDL (mg/dL)", "#7e2de5"),
+        ("CholesterolTriglycerides", "Triglicerídeos (mg/dL)", "#9d580b"),
+    ]),
+    "avaliacoes_cognitivas": ("Avaliações Cognitivas e Funcionais", [
+        ("MMSE", "Mini-Exame do Estado Mental (Score)", "#ff2626"),
+        ("FunctionalAssessment", "Avaliação Funcional (Score)", "#2664ff"),
+        ("MemoryComplaints", "Queixas de Memória", ["#ff2626", "#2664ff"]),
+        ("BehavioralProblems", "Problemas Comportamentais", ["#49ff13", "#1c4fee"]),
+        ("ADL", "Atividades de Vida Diária (Score)", "#eb9d2d"),
+    ]),
+    "sintomas_diagnostico": ("Sintomas e Diagnóstico", [
+        ("Confusion", "Confusão", ["#ff2626", "#2664ff"]),
+        ("Disorientation", "Desorientação", "set2"),
+        ("PersonalityChanges", "Mudanças de Personalidade", "set3"),
+        ("DifficultyCompletingTasks", "Dificuldade de Completar Tarefas", ["#ff13ed", "#ffed13"]),
+        ("Forgetfulness", "Esquecimento", ["#49ff13", "#1c4fee"]),
+        ("Diagnosis", "Diagnóstico", ["#16f4ed", "#9d580b"]),
+    ]),
+}
+
+
+def grupo_de_atributos(perfil, grupo):
+    """Grade com um painel por coluna do grupo `grupo` de PAINEIS."""
+    titulo, paineis = PAINEIS[grupo]
+    graficos = []
+    for coluna, titulo_painel, cores in paineis:
+        resumo = perfil[coluna]
+        if resumo.frequencias is not None:
+            graficos.append(frequencias(resumo, coluna, titulo_painel, cores))
+        else:
+            graficos.append(histograma(resumo.histograma, coluna, titulo_painel, cor=_cor_unica(cores)))
+    return _grade(graficos, titulo)
+
+
+# Gráficos da página de descrição: id -> (título, construtor(perfil)), como `utils.graficos_descricao.GRUPOS`
+GRUPOS = {
+    "histogramas_numericos": ("Distribuição das Variáveis Numéricas", histogramas_numericos),
+    **{
+        grupo: (titulo, lambda perfil, grupo=grupo: grupo_de_atributos(perfil, grupo))
+        for grupo, (titulo, _) in PAINEIS.items()
+    },
+}
+
+
+# -----------------------------------------------------------
+#  Página de hipóteses
+# -----------------------------------------------------------
+
+def _pontos(data, colunas, estratos=None):
+    return amostra_para_pontos(data[colunas], estratos, limite=LIMITE_PONTOS)
+
+
+def tabagismo_hdl(data):
+    """Pontos (amostra) e boxplot do colesterol HDL por tabagismo (4.1)."""
+    pontos = _pontos(data, ["Smoking", "CholesterolHDL"], "Smoking")
+    pontos = pd.DataFrame({"grupo": _rotulos("Smoking", pontos["Smoking"]), "CholesterolHDL": pontos["CholesterolHDL"]})
+    strip = _grafico(pontos).mark_point(filled=True, opacity=0.6).transform_calculate(
+        deslocamento="random()",
+    ).encode(
+        x=alt.X("grupo:N", title="Fumante", axis=alt.Axis(labelAngle=0)),
+        xOffset=alt.XOffset("deslocamento:Q", scale=alt.Scale(domain=[-0.5, 1.5])),
+        y=alt.Y("CholesterolHDL:Q", title="Colesterol HDL"),
+        color=alt.Color("grupo:N", scale=_cores("set1"), legend=None),
+        shape=alt.Shape("grupo:N", scale=alt.Scale(range=["square", "triangle-up"]), title="Fumante"),
+        tooltip=[alt.Tooltip("grupo:N", title="Fumante"), alt.Tooltip("CholesterolHDL:Q", format=".2f")],
+    ).properties(title="Relação entre Fumo e Colesterol HDL")
+    caixa = boxplot(data, "CholesterolHDL", "Smoking",
+                    "Distribuição de Colesterol HDL entre Fumantes e Não-Fumantes", "set2", medianas=False)
+    return alt.hconcat(strip.properties(width=LARGURA + 60), caixa.properties(width=LARGURA + 60))
+
+
+def _curva_logistica(x, coef, intercept):
+    x = np.linspace(*x, PONTOS_CURVA)
+    return pd.DataFrame({"x": x, "y": expit(x * float(np.ravel(coef)[0]) + float(np.ravel(intercept)[0]))})
+
+
+def tabagismo_hdl_regressao(data, coef, intercept):
+    """Pontos (amostra) e curva da regressão logística Smoking ~ CholesterolHDL (4.1)."""
+    pontos = _grafico(_pontos(data, ["CholesterolHDL", "Smoking"], "Smoking")).mark_circle(opacity=0.5).encode(
+        x=alt.X("CholesterolHDL:Q", scale=alt.Scale(zero=False)),
+        y=alt.Y("Smoking:Q", title="Smoking"),
+        tooltip=[alt.Tooltip("CholesterolHDL:Q", format=".2f"), "Smoking:Q"],
+    )
+    curva = _grafico(_curva_logistica((20, 100), coef, intercept)).mark_line(color="red", strokeWidth=3).encode(
+        x="x:Q", y="y:Q", tooltip=[alt.Tooltip("x:Q", title="CholesterolHDL", format=".1f"),
+                                   alt.Tooltip("y:Q", title="P(Smoking = 1)", format=".3f")],
+    )
+    return (pontos + curva).properties(
+        title=f"Regressão Logística: Smoking ~ CholesterolHDL (β1 = {float(np.ravel(coef)[0]):.3f})",
+    ).interactive()
+
+
+def _tabela_longa(tabela):
+    longa = tabela.stack().rename("contagem").reset_index()
+    longa["historico"] = _rotulos(tabela.index.name, longa[tabela.index.name])
+    longa["diagnostico"] = _rotulos(tabela.columns.name, longa[tabela.columns.name])
+    return longa
+
+
+def historico_diagnostico_barras(tabela):
+    """Contagem de diagnósticos por histórico familiar, a partir da tabela FamilyHistoryAlzheimers x Diagnosis (4.2)."""
+    return _grafico(_tabela_longa(tabela)).mark_bar().encode(
+        x=alt.X("historico:N", title="Histórico Familiar", axis=alt.Axis(labelAngle=0)),
+        xOffset="diagnostico:N",
+        y=alt.Y("contagem:Q", title="Contagem"),
+        color=alt.Color("diagnostico:N", scale=_cores(["gray", "blue"]), title="Diagnóstico"),
+        tooltip=[
+            alt.Tooltip("historico:N", title="Histórico Familiar"), alt.Tooltip("diagnostico:N", title="Diagnóstico"),
+            alt.Tooltip("contagem:Q", title="Pacientes"),
+        ],
+    ).properties(title="Histórico Familiar vs. Diagnóstico")
+
+
+def historico_diagnostico_regressao(tabela, coef, intercept):
+    """Combinações observadas (área proporcional à contagem) e curva da regressão logística Diagnosis ~ FamilyHistoryAlzheimers (4.2)."""
+    combinacoes = _grafico(tabela.stack().rename("contagem").reset_index()).mark_circle(color="blue", opacity=0.5).encode(
+        x=alt.X(f"{tabela.index.name}:Q", title="FamilyHistoryAlzheimers (0 = Não, 1 = Sim)"),
+        y=alt.Y(f"{tabela.columns.name}:Q", title="Probabilidade de Diagnóstico Positivo"),
+        size=alt.Size("contagem:Q", title="Pacientes", scale=alt.Scale(range=[50, 2000])),
+        tooltip=[f"{tabela.index.name}:Q", f"{tabela.columns.name}:Q", alt.Tooltip("contagem:Q", title="Pacientes")],
+    )
+    curva = _grafico(_curva_logistica((0, 1), coef, intercept)).mark_line(color="red", strokeWidth=2).encode(
+        x="x:Q", y="y:Q", tooltip=[alt.Tooltip("y:Q", title="P(Diagnosis = 1)", format=".3f")],
+    )
+    return (combinacoes + curva).properties(title="Regressão Logística: Diagnóstico x Histórico Familiar")
+
+
+def historico_diagnostico_pdf(tabela):
+    """Densidade do diagnóstico por histórico familiar, a partir da tabela de contingência (4.2)."""
+    total = tabela.to_numpy().sum()
+    partes = []
+    for historico, rotulo in zip(tabela.index, _rotulos(tabela.index.name, tabela.index)):
+        curva = kde_de_contagens(tabela.columns, tabela.loc[historico], total, gridsize=PONTOS_CURVA)
+        if curva is not None:
+            partes.append(pd.DataFrame({"x": curva[0], "y": curva[1], "grupo": rotulo}))
+    return _grafico(pd.concat(partes, ignore_index=True)).mark_area(opacity=0.35, line=True).encode(
+        x=alt.X("x:Q", title="Diagnóstico de Alzheimer (0 = Negativo, 1 = Positivo)"),
+        y=alt.Y("y:Q", title="Densidade de Probabilidade", stack=None),
+        color=alt.Color("grupo:N", scale=_cores(["gray", "blue"]), title="Histórico Familiar"),
+        tooltip=[alt.Tooltip("grupo:N", title="Histórico Familiar"), alt.Tooltip("x:Q", format=".2f"),
+                 alt.Tooltip("y:Q", title="Densidade", format=".3f")],
+    ).properties(title="Função de Densidade de Probabilidade - Diagnóstico vs Histórico Familiar").interactive(
+        bind_y=False)
+
+
+def dieta_mmse_dispersao(data):
+    """Dispersão (amostra) DietQuality x MMSE com os histogramas de cada variável nas margens (4.3)."""
+    marginais = histogramas(data, ["DietQuality", "MMSE"])
+    zoom = alt.selection_interval(bind="scales")
+    pontos = _grafico(_pontos(data, ["DietQuality", "MMSE"])).mark_circle(opacity=0.5).encode(
+        x=alt.X("DietQuality:Q"), y=alt.Y("MMSE:Q"),
+        tooltip=[alt.Tooltip("DietQuality:Q", format=".2f"), alt.Tooltip("MMSE:Q", format=".2f")],
+    ).add_params(zoom).properties(width=LARGURA * 2, height=LARGURA * 2)
+
+    def barras(coluna):
+        hist = marginais[coluna]
+        return _grafico(pd.DataFrame({"inicio": hist.edges[:-1], "fim": hist.edges[1:], "contagem": hist.counts}))
+
+    topo = barras("DietQuality").mark_bar(color="steelblue", opacity=0.6).encode(
+        x=alt.X("inicio:Q", bin="binned", title=None), x2="fim:Q", y=alt.Y("contagem:Q", title=None),
+        tooltip=[alt.Tooltip("contagem:Q", title="Pacientes")],
+    ).properties(width=LARGURA * 2, height=60)
+    direita = barras("MMSE").mark_bar(color="steelblue", opacity=0.6).encode(
+        y=alt.Y("inicio:Q", bin="binned", title=None), y2="fim:Q", x=alt.X("contagem:Q", title=None),
+        tooltip=[alt.Tooltip("contagem:Q", title="Pacientes")],
+    ).properties(width=60, height=LARGURA * 2)
+    return alt.vconcat(topo, alt.hconcat(pontos, direita, spacing=5), spacing=5, title="DietQuality x MMSE")
+
+
+def dieta_mmse_regressao(x_test, y_test, y_pred):
+    """Valores reais e previstos (amostra) da regressão linear MMSE ~ DietQuality (4.3)."""
+    pontos = amostra_para_pontos(pd.DataFrame({
+        "DietQuality": np.ravel(x_test), "Dados Reais": np.ravel(y_test), "Previsões": np.ravel(y_pred),
+    }), limite=LIMITE_PONTOS // 2)
+    longa = pontos.melt("DietQuality", var_name="serie", value_name="MMSE")
+    return _grafico(longa).mark_circle(opacity=0.6).encode(
+        x="DietQuality:Q", y="MMSE:Q", color=alt.Color("serie:N", title=None),
+        tooltip=["serie:N", alt.Tooltip("DietQuality:Q", format=".2f"), alt.Tooltip("MMSE:Q", format=".2f")],
+    ).properties(title="Regressão Linear - DietQuality x MMSE").interactive()
+
+
+def dieta_histograma(hist):
+    """Histograma da qualidade da dieta (4.3), a partir do agregado pré-calculado."""
+    return histograma(hist, "Qualidade da Dieta", "Histograma - Distribuição da Qualidade da Dieta", cor="blue")
+
+
+def atividade_sintomas_boxplots(data):
+    """Boxplots da atividade física por Confusion e Forgetfulness, com as medianas (4.4)."""
+    return alt.hconcat(*[
+        boxplot(data, "PhysicalActivity", sintoma, f"Atividade Física vs {sintoma}").properties(width=LARGURA + 60)
+        for sintoma in ["Confusion", "Forgetfulness"]
+    ])
+
+
+def atividade_sintomas_histogramas(data, por_sintoma=None):
+    """Histogramas empilhados da atividade física por Confusion e Forgetfulness (4.4).
+
+    Com `por_sintoma` ({sintoma: {nível: Histograma}}, por exemplo do resumo
+    incremental), as barras vêm desses agregados e `data` não é lido.
+    """
+    paineis = []
+    for sintoma in ["Confusion", "Forgetfulness"]:
+        if por_sintoma is None:
+            barras = histogramas_por_grupo(data, "PhysicalActivity", sintoma)
+        else:
+            barras = barras_por_grupo(por_sintoma[sintoma], sintoma)
+        paineis.append(_grafico(barras).mark_bar(
+            stroke="white", strokeWidth=0.5).encode(
+            x=alt.X("inicio:Q", bin="binned", title="Physical Activity (0 a 10)"),
+            x2="fim:Q",
+            y=alt.Y("contagem:Q", title="Frequência", stack="zero"),
+            color=alt.Color("grupo:N", scale=_cores("set2"), title=sintoma),
+            tooltip=[
+                alt.Tooltip("grupo:N", title=sintoma), alt.Tooltip("inicio:Q", title="De", format=".2f"),
+                alt.Tooltip("fim:Q", title="Até", format=".2f"), alt.Tooltip("contagem:Q", title="Pacientes"),
+            ],
+        ).properties(title=f"Distribuição de PhysicalActivity por {sintoma}", width=LARGURA + 60))
+    return alt.hconcat(*paineis).resolve_scale(color="independent")
+
+
+def atividade_depressao(data):
+    """Boxplot e densidade da atividade física por depressão (4.5)."""
+    caixa = boxplot(data, "PhysicalActivity", "Depression", "Atividade Física vs Depressão", "redblue")
+    densidade = _grafico(densidades_por_grupo(data, "PhysicalActivity", "Depression")).mark_area(
+        opacity=0.35, line=True).encode(
+        x=alt.X("x:Q", title="PhysicalActivity"),
+        y=alt.Y("y:Q", title="Densidade", stack=None),
+        color=alt.Color("grupo:N", scale=_cores("redblue"), title="Depression"),
+        tooltip=[alt.Tooltip("grupo:N", title="Depression"), alt.Tooltip("x:Q", format=".2f"),
+                 alt.Tooltip("y:Q", title="Densidade", format=".3f")],
+    ).properties(title="Distribuição de Atividade Física por Depressão")
+    return alt.hconcat(caixa.properties(width=LARGURA + 60), densidade.properties(width=LARGURA + 60)).resolve_scale(
+        color="independent")
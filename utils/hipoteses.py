@@ -0,0 +1,207 @@
+"""Cálculos da página de hipóteses, independentes do Streamlit.
+
+Reúne o ajuste dos modelos de regressão, os testes T, as conclusões
+testadas por reamostragem e a lista de figuras da página, para que possam
+ser executados tanto pela página quanto por scripts (benchmarks, geração
+de artefatos) com exatamente a mesma lógica.
+"""
+
+from sklearn.linear_model import LinearRegression, LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from utils import graficos_hipoteses as graficos
+from utils import graficos_interativos as interativos
+from utils.agregados import histogramas, histogramas_por_grupo
+from utils.contingencia import TabelasContingencia
+from utils.modelos import Especificacao, ajustar
+from utils.reamostragem import Conclusao
+from utils.testes import testes_t_em_lote
+
+# Colunas utilizadas nas hipóteses
+COLUNAS = [
+    "Smoking", "CholesterolHDL", "FamilyHistoryAlzheimers", "Diagnosis", "DietQuality",
+    "MMSE", "PhysicalActivity", "Confusion", "Forgetfulness", "Depression",
+]
+
+
+# Sintomas cognitivos comparados na hipótese 4.4
+SINTOMAS = ["Confusion", "Forgetfulness"]
+
+
+# Regressões das hipóteses 4.1, 4.2, 4.3 e 4.5: nome -> Especificacao
+MODELOS = {
+    # 4.1 - Regressão logística Smoking ~ CholesterolHDL
+    "tabagismo_hdl": Especificacao(LogisticRegression(random_state=0), ["CholesterolHDL"], "Smoking", (0.2, 42)),
+    # 4.2 - Regressão logística Diagnosis ~ FamilyHistoryAlzheimers
+    "historico_diagnostico": Especificacao(LogisticRegression(), ["FamilyHistoryAlzheimers"], "Diagnosis", (0.2, 42)),
+    # 4.3 - Regressão linear MMSE ~ DietQuality
+    "dieta_mmse": Especificacao(LinearRegression(), ["DietQuality"], "MMSE", (0.2, 42)),
+    # 4.5 - Regressão logística Depression ~ PhysicalActivity padronizada
+    "atividade_depressao": Especificacao(
+        make_pipeline(StandardScaler(), LogisticRegression()), ["PhysicalActivity"], "Depression", None),
+}
+
+
+# Conclusões das hipóteses testadas por permutação e bootstrap: nome -> Conclusao
+REAMOSTRAGENS = {
+    # 4.1 - HDL médio de não fumantes menos o de fumantes, e coeficiente de Smoking ~ CholesterolHDL
+    "hdl_tabagismo": Conclusao("4.1", "medias", "CholesterolHDL", "Smoking"),
+    "tabagismo_hdl": Conclusao("4.1", "logistico", "Smoking", "CholesterolHDL"),
+    # 4.2 - Proporção de diagnósticos sem histórico familiar menos a proporção com histórico
+    "diagnostico_historico": Conclusao("4.2", "medias", "Diagnosis", "FamilyHistoryAlzheimers"),
+    # 4.3 - Inclinação de MMSE ~ DietQuality
+    "dieta_mmse": Conclusao("4.3", "linear", "MMSE", "DietQuality"),
+    # 4.4 e 4.5 - Mediana e média de PhysicalActivity sem o sintoma menos com o sintoma
+    "atividade_confusao": Conclusao("4.4", "medianas", "PhysicalActivity", "Confusion"),
+    "atividade_esquecimento": Conclusao("4.4", "medianas", "PhysicalActivity", "Forgetfulness"),
+    "atividade_depressao": Conclusao("4.5", "medias", "PhysicalActivity", "Depression"),
+}
+
+# Sinal que a estatística de cada conclusão de REAMOSTRAGENS tem quando a hipótese é verdadeira
+SENTIDOS = {
+    "hdl_tabagismo": 1,  # fumantes com HDL menor
+    "tabagismo_hdl": -1,  # HDL maior, menor chance de ser fumante
+    "diagnostico_historico": -1,  # mais diagnósticos com histórico familiar
+    "dieta_mmse": 1,
+    "atividade_confusao": 1,  # pacientes sem o sintoma mais ativos
+    "atividade_esquecimento": 1,
+    "atividade_depressao": 1,
+}
+
+
+def ajustar_modelos(data):
+    """Ajusta todas as regressões de MODELOS, sem cache.
+
+    Retorna um dicionário por hipótese com o coeficiente e o intercepto (e,
+    para 4.1 a 4.3, as métricas de teste e uma amostra dos dados de teste e
+    das previsões).
+    A página usa o registro de `utils.modelos`, que ajusta cada modelo uma
+    única vez por versão do dataset.
+    """
+    return {nome: ajustar(especificacao, data) for nome, especificacao in MODELOS.items()}
+
+
+def testes_t(data):
+    """Testes T das hipóteses 4.4 e 4.5: PhysicalActivity entre os grupos 0 e 1 de cada sintoma."""
+    return testes_t_em_lote(data, ["PhysicalActivity"], ["Confusion", "Forgetfulness", "Depression"]).set_index("grupo")
+
+
+def tabela_historico(data):
+    """Tabela de contingência FamilyHistoryAlzheimers x Diagnosis da hipótese 4.2."""
+    return TabelasContingencia.de_dados(data, ["FamilyHistoryAlzheimers", "Diagnosis"]).tabela(
+        "FamilyHistoryAlzheimers", "Diagnosis")
+
+
+def testes_contingencia(data):
+    """Qui-quadrado, teste exato de Fisher e razão de chances da hipótese 4.2 (ver `TabelasContingencia.teste`)."""
+    tabelas = TabelasContingencia.de_dados(data, ["FamilyHistoryAlzheimers", "Diagnosis"])
+    return tabelas.testes(correcao=None)
+
+
+def resumir_conclusao(reamostragem, nome, nivel=0.05):
+    """Resultado da conclusão `nome` na tabela de `reamostrar_conclusoes`: (valida a hipótese, frase).
+
+    A hipótese é validada quando o p-valor da permutação é menor que `nivel` e
+    a estatística tem o sinal de SENTIDOS; a frase descreve o resultado com o
+    p-valor e o intervalo de bootstrap.
+    """
+    linha = reamostragem.set_index("conclusao").loc[nome]
+    evidencia = (
+        f"p = {linha['p_valor']:.4f} no teste de permutação, "
+        f"IC 95% [{linha['ic_inferior']:.4f}, {linha['ic_superior']:.4f}] por bootstrap"
+    )
+    if linha["p_valor"] >= nivel:
+        return False, f"não há diferença estatisticamente relevante ({evidencia})"
+    if (linha["estatistica"] > 0) == (SENTIDOS[nome] > 0):
+        return True, f"a diferença é estatisticamente relevante e no sentido da hipótese ({evidencia})"
+    return False, f"a diferença é estatisticamente relevante, mas no sentido oposto ao da hipótese ({evidencia})"
+
+
+def _dieta_histograma(data, modelos, modulo=graficos):
+    return modulo.dieta_histograma(histogramas(data, ["DietQuality"])["DietQuality"])
+
+
+def _histogramas_sintomas(data, resumo=None):
+    if resumo is not None:
+        return {sintoma: resumo.histogramas_por_grupo("PhysicalActivity", sintoma) for sintoma in SINTOMAS}
+    return {sintoma: histogramas_por_grupo(data, "PhysicalActivity", sintoma) for sintoma in SINTOMAS}
+
+
+def _atividade_sintomas_boxplots(data, modelos, resumo=None):
+    medianas = None if resumo is None else {sintoma: resumo.medianas(sintoma, "PhysicalActivity") for sintoma in SINTOMAS}
+    return graficos.atividade_sintomas_boxplots(data, medianas)
+
+
+def _atividade_sintomas_histogramas(data, modelos, resumo=None):
+    return graficos.atividade_sintomas_histogramas(_histogramas_sintomas(data, resumo))
+
+
+# Figuras da página, na ordem de exibição: id -> (seção, construtor(data, modelos))
+FIGURAS = {
+    "tabagismo_hdl": ("4.1", lambda data, modelos: graficos.tabagismo_hdl(data)),
+    "tabagismo_hdl_regressao": ("4.1", lambda data, modelos: graficos.tabagismo_hdl_regressao(
+        data, modelos["tabagismo_hdl"]["coef"], modelos["tabagismo_hdl"]["intercept"])),
+    "tabagismo_hdl_cdf": ("4.1", lambda data, modelos: graficos.tabagismo_hdl_cdf(data)),
+    "historico_diagnostico_barras": ("4.2", lambda data, modelos: graficos.historico_diagnostico_barras(
+        tabela_historico(data))),
+    "historico_diagnostico_pairplot": ("4.2", lambda data, modelos: graficos.historico_diagnostico_pairplot(
+        tabela_historico(data))),
+    "historico_diagnostico_regressao": ("4.2", lambda data, modelos: graficos.historico_diagnostico_regressao(
+        data, modelos["historico_diagnostico"]["coef"], modelos["historico_diagnostico"]["intercept"])),
+    "historico_diagnostico_pdf": ("4.2", lambda data, modelos: graficos.historico_diagnostico_pdf(
+        tabela_historico(data))),
+    "dieta_mmse_dispersao": ("4.3", lambda data, modelos: graficos.dieta_mmse_dispersao(data)),
+    "dieta_mmse_regressao": ("4.3", lambda data, modelos: graficos.dieta_mmse_regressao(
+        modelos["dieta_mmse"]["x_test"], modelos["dieta_mmse"]["y_test"], modelos["dieta_mmse"]["y_pred"])),
+    "dieta_histograma": ("4.3", _dieta_histograma),
+    "atividade_sintomas_boxplots": ("4.4", _atividade_sintomas_boxplots),
+    "atividade_sintomas_histogramas": ("4.4", _atividade_sintomas_histogramas),
+    "atividade_sintomas_cdf": ("4.4", lambda data, modelos: graficos.atividade_sintomas_cdf(data)),
+    "atividade_depressao": ("4.5", lambda data, modelos: graficos.atividade_depressao(data)),
+    "atividade_depressao_cdf": ("4.5", lambda data, modelos: graficos.atividade_depressao_cdf(data)),
+}
+
+
+# Figuras da 4.4 que aceitam `resumo=` (o ResumoIncremental do dataset original, ver
+# utils/incremental.py): as medianas e os histogramas por sintoma vêm dos esboços do
+# resumo, atualizados a cada lote acrescentado, em vez de uma passada pelos dados
+DO_RESUMO = {"atividade_sintomas_boxplots", "atividade_sintomas_histogramas"}
+
+
+# Modelos de MODELOS usados por cada figura (as demais não dependem de nenhum)
+MODELOS_DAS_FIGURAS = {
+    "tabagismo_hdl_regressao": ["tabagismo_hdl"],
+    "historico_diagnostico_regressao": ["historico_diagnostico"],
+    "dieta_mmse_regressao": ["dieta_mmse"],
+}
+
+
+# Versões interativas das figuras (ver utils/graficos_interativos.py): id -> construtor(data, modelos).
+# Figuras sem versão interativa (o pair plot da 4.2) continuam sendo exibidas como imagem.
+GRAFICOS = {
+    "tabagismo_hdl": lambda data, modelos: interativos.tabagismo_hdl(data),
+    "tabagismo_hdl_regressao": lambda data, modelos: interativos.tabagismo_hdl_regressao(
+        data, modelos["tabagismo_hdl"]["coef"], modelos["tabagismo_hdl"]["intercept"]),
+    "tabagismo_hdl_cdf": lambda data, modelos: interativos.distribuicao_acumulada(
+        data, "CholesterolHDL", "Smoking", "Função de Distribuição Acumulada - CholesterolHDL vs Smoking"),
+    "historico_diagnostico_barras": lambda data, modelos: interativos.historico_diagnostico_barras(
+        tabela_historico(data)),
+    "historico_diagnostico_regressao": lambda data, modelos: interativos.historico_diagnostico_regressao(
+        tabela_historico(data), modelos["historico_diagnostico"]["coef"], modelos["historico_diagnostico"]["intercept"]),
+    "historico_diagnostico_pdf": lambda data, modelos: interativos.historico_diagnostico_pdf(tabela_historico(data)),
+    "dieta_mmse_dispersao": lambda data, modelos: interativos.dieta_mmse_dispersao(data),
+    "dieta_mmse_regressao": lambda data, modelos: interativos.dieta_mmse_regressao(
+        modelos["dieta_mmse"]["x_test"], modelos["dieta_mmse"]["y_test"], modelos["dieta_mmse"]["y_pred"]),
+    "dieta_histograma": lambda data, modelos: _dieta_histograma(data, modelos, interativos),
+    # As caixas interativas (com as medianas) são calculadas dos dados; `resumo` só é aceito por DO_RESUMO
+    "atividade_sintomas_boxplots": lambda data, modelos, resumo=None: interativos.atividade_sintomas_boxplots(data),
+    "atividade_sintomas_histogramas": lambda data, modelos, resumo=None: interativos.atividade_sintomas_histogramas(
+        data, None if resumo is None else _histogramas_sintomas(data, resumo)),
+    "atividade_sintomas_cdf": lambda data, modelos: interativos.distribuicao_acumulada(
+        data, "PhysicalActivity", "Confusion", "Função de Distribuição Acumulada - Atividade Física vs Sintomas Cognitivos"),
+    "atividade_depressao": lambda data, modelos: interativos.atividade_depressao(data),
+    "atividade_depressao_cdf": lambda data, modelos: interativos.distribuicao_acumulada(
+        data, "PhysicalActivity", "Depression", "Função de Distribuição Acumulada - Atividade Física vs Depressão",
+        cores=("gray", "blue")),
+}
@@ -0,0 +1,219 @@
+"""Estatísticas incrementais do dataset original.
+
+O CSV original só recebe novas linhas no final. Em vez de recalcular tudo
+a cada nova versão, guardamos estatísticas suficientes e combináveis
+(contagens, somas e somas de quadrados, esboços de quantis em grade fixa e
+tabelas de contingência) e a posição até onde o arquivo já foi lido. Uma nova versão do arquivo lê apenas
+o lote acrescentado, em blocos de tamanho limitado, resume esse lote e o
+combina ao resumo anterior, com custo proporcional ao lote. Uma última linha
+ainda incompleta (o arquivo sendo escrito) fica para a próxima leitura.
+
+Os esboços são contagens em uma grade fixa de GRADE células sobre as faixas
+documentadas de cada coluna: somar os esboços de dois lotes dá o esboço do
+conjunto, e deles saem as medianas e os histogramas por grupo da hipótese
+4.4 (bins formados por células vizinhas da grade, ver
+`utils.agregados.histogramas_da_grade`).
+"""
+
+import hashlib
+import io
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.agregados import histogramas_da_grade, quantis_da_grade
+from utils.contingencia import TabelasContingencia
+from utils.dados import RAW_DATA_PATH, assinatura_arquivo
+from utils.esquema import BINARY_COLUMNS, FAIXAS
+from utils.preprocessamento import CHUNK_ROWS
+from utils.testes import combinar_estatisticas, estatisticas_por_grupo, testes_t_de_estatisticas
+
+# Estado persistido entre execuções (resumo e posição lida do arquivo)
+ESTADO_PATH = ".cache/incremental/estado.joblib"
+
+# Formato do resumo persistido; estados de outro formato são recalculados do início
+FORMATO_ESTADO = 4
+
+# Colunas numéricas resumidas e colunas binárias usadas como grupos
+DESFECHOS = list(FAIXAS)
+GRUPOS = BINARY_COLUMNS
+
+# Células da grade fixa (sobre as faixas documentadas) usada como esboço de quantis e histogramas
+GRADE = 1024
+
+# Pares (grupo, desfecho) com esboço por grupo, para as medianas e histogramas das hipóteses 4.4 e 4.5
+POR_GRUPO = [
+    ("Confusion", "PhysicalActivity"),
+    ("Forgetfulness", "PhysicalActivity"),
+    ("Depression", "PhysicalActivity"),
+]
+
+# Bytes do arquivo usados para detectar que o trecho já lido não foi reescrito
+TAMANHO_IMPRESSAO = 4096
+
+# Bytes lidos do lote acrescentado por vez
+BLOCO_BYTES = 16 * 1024**2
+
+
+def _esboco(valores, coluna):
+    """Contagens de `valores` na grade fixa da coluna (valores fora da faixa vão para as células das pontas)."""
+    minimo, maximo = FAIXAS[coluna]
+    valores = valores[~np.isnan(valores)]
+    celulas = np.floor((valores - minimo) / (maximo - minimo) * GRADE)
+    return np.bincount(np.clip(celulas, 0, GRADE - 1).astype(np.int64), minlength=GRADE)
+
+
+class ResumoIncremental:
+    """Estatísticas suficientes de um conjunto de linhas, combináveis com as de outros conjuntos."""
+
+    def __init__(self, linhas, grupos, esbocos, esbocos_grupo, tabelas):
+        self.linhas = linhas
+        self.grupos = grupos  # `estatisticas_por_grupo` (GRUPOS x DESFECHOS)
+        self.esbocos = esbocos  # DESFECHOS x GRADE
+        self.esbocos_grupo = esbocos_grupo  # (grupo, desfecho) -> 2 x GRADE
+        self.tabelas = tabelas  # TabelasContingencia das colunas categóricas
+
+    @classmethod
+    def de_bloco(cls, bloco, deslocamento=None):
+        """Resume um bloco de linhas com as colunas do CSV original."""
+        grupos = estatisticas_por_grupo(bloco, DESFECHOS, GRUPOS, deslocamento=deslocamento)
+        esbocos = np.stack([_esboco(bloco[col].to_numpy(dtype=np.float64), col) for col in DESFECHOS])
+        esbocos_grupo = {}
+        for grupo, desfecho in POR_GRUPO:
+            valores = bloco[desfecho].to_numpy(dtype=np.float64)
+            rotulos = bloco[grupo].to_numpy()
+            esbocos_grupo[(grupo, desfecho)] = np.stack([_esboco(valores[rotulos == g], desfecho) for g in (0, 1)])
+        return cls(len(bloco), grupos, esbocos, esbocos_grupo, TabelasContingencia.de_dados(bloco))
+
+    def combinar(self, outro):
+        """Novo resumo com as linhas deste e de `outro`."""
+        return ResumoIncremental(
+            self.linhas + outro.linhas,
+            combinar_estatisticas(self.grupos, outro.grupos),
+            self.esbocos + outro.esbocos,
+            {chave: esboco + outro.esbocos_grupo[chave] for chave, esboco in self.esbocos_grupo.items()},
+            self.tabelas.combinar(outro.tabelas),
+        )
+
+    def quantil(self, coluna, q, grupo=None):
+        """Quantil `q` da coluna (erro menor que a faixa documentada / GRADE).
+
+        Com `grupo`, retorna uma Series com o quantil em cada valor (0 e 1)
+        do grupo; o par (grupo, coluna) precisa estar em POR_GRUPO.
+        """
+        minimo, maximo = FAIXAS[coluna]
+        passo = (maximo - minimo) / GRADE
+        if grupo is None:
+            return float(quantis_da_grade(self.esbocos[DESFECHOS.index(coluna)], minimo, passo, [q])[0])
+        esbocos = self.esbocos_grupo[(grupo, coluna)]
+        return pd.Series(
+            [quantis_da_grade(esboco, minimo, passo, [q])[0] for esboco in esbocos],
+            index=pd.Index([0, 1], name=grupo), name=coluna,
+        )
+
+    def medianas(self, grupo, coluna):
+        """Mediana de `coluna` em cada grupo, como `data.groupby(grupo)[coluna].median()`."""
+        return self.quantil(coluna, 0.5, grupo)
+
+    def histogramas_por_grupo(self, coluna, grupo, bins="auto"):
+        """Como `utils.agregados.histogramas_por_grupo`, a partir dos esboços (bins de células inteiras da grade).
+
+        Retorna {nível: Histograma} dos níveis com alguma linha; o par
+        (grupo, coluna) precisa estar em POR_GRUPO.
+        """
+        minimo, maximo = FAIXAS[coluna]
+        esbocos = self.esbocos_grupo[(grupo, coluna)]
+        histogramas = histogramas_da_grade(esbocos, minimo, (maximo - minimo) / GRADE, bins)
+        return {nivel: hist for nivel, hist, esboco in zip((0, 1), histogramas, esbocos) if esboco.any()}
+
+    def testes_t(self, desfechos=None, grupos=None, correcao="fdr_bh"):
+        """Testes T (ver `utils.testes.testes_t_em_lote`) de todos os pares pedidos, sem reler os dados."""
+        desfechos = DESFECHOS if desfechos is None else list(desfechos)
+        grupos = GRUPOS if grupos is None else list(grupos)
+        linhas = [GRUPOS.index(col) for col in grupos]
+        colunas = [DESFECHOS.index(col) for col in desfechos]
+        estat = {nome: matriz[np.ix_(linhas, colunas)] for nome, matriz in self.grupos.items() if nome != "deslocamento"}
+        estat["deslocamento"] = self.grupos["deslocamento"][colunas]
+        return testes_t_de_estatisticas(estat, desfechos, grupos, correcao)
+
+
+def _impressao(arquivo, fim):
+    """Hash dos últimos bytes antes de `fim`, para verificar que o trecho já lido não mudou."""
+    arquivo.seek(max(0, fim - TAMANHO_IMPRESSAO))
+    return hashlib.sha1(arquivo.read(min(fim, TAMANHO_IMPRESSAO))).hexdigest()
+
+
+def atualizar_resumo(origem=RAW_DATA_PATH, estado_path=ESTADO_PATH, chunk_rows=CHUNK_ROWS, bloco_bytes=BLOCO_BYTES):
+    """Resumo de todo o CSV `origem`, lendo apenas as linhas acrescentadas desde a última chamada.
+
+    Só linhas terminadas por quebra de linha são lidas: a posição guardada
+    é a do fim da última linha completa. Se o arquivo tiver sido reescrito
+    (cabeçalho diferente, tamanho menor ou conteúdo já lido alterado) ou o
+    estado for de outro FORMATO_ESTADO, o resumo é recalculado do início.
+    """
+    try:
+        estado = joblib.load(estado_path)
+    except FileNotFoundError:
+        estado = None
+
+    with open(origem, "rb") as arquivo:
+        cabecalho = arquivo.readline()
+        tamanho = os.fstat(arquivo.fileno()).st_size
+        if (
+            estado is None
+            or estado.get("formato") != FORMATO_ESTADO
+            or estado["origem"] != os.path.abspath(origem)
+            or estado["cabecalho"] != cabecalho
+            or estado["posicao"] > tamanho
+            or estado["impressao"] != _impressao(arquivo, estado["posicao"])
+        ):
+            estado = {
+                "formato": FORMATO_ESTADO, "origem": os.path.abspath(origem), "cabecalho": cabecalho,
+                "posicao": len(cabecalho), "resumo": None,
+            }
+        if estado["posicao"] == tamanho:
+            return estado["resumo"]
+
+        # Lê o lote em blocos de até `bloco_bytes`, resumindo só as linhas completas; o trecho
+        # depois da última quebra de linha é levado para o bloco seguinte ou, no fim, para a
+        # próxima chamada
+        nomes = pd.read_csv(io.BytesIO(cabecalho), nrows=0).columns
+        resumo = estado["resumo"]
+        posicao = estado["posicao"]
+        arquivo.seek(posicao)
+        pendente = b""
+        for _ in range(posicao, tamanho, bloco_bytes):
+            trecho = pendente + arquivo.read(min(bloco_bytes, tamanho - arquivo.tell()))
+            fim = trecho.rfind(b"\n") + 1
+            pendente = trecho[fim:]
+            if not fim:
+                continue
+            for bloco in pd.read_csv(io.BytesIO(trecho[:fim]), header=None, names=nomes, chunksize=chunk_rows):
+                if resumo is None:
+                    resumo = ResumoIncremental.de_bloco(bloco)
+                else:
+                    resumo = resumo.combinar(ResumoIncremental.de_bloco(bloco, resumo.grupos["deslocamento"]))
+            posicao += fim
+
+        if posicao == estado["posicao"]:
+            return resumo
+        impressao = _impressao(arquivo, posicao)
+
+    os.makedirs(os.path.dirname(estado_path), exist_ok=True)
+    tmp_path = f"{estado_path}.{os.getpid()}.tmp"
+    joblib.dump({**estado, "posicao": posicao, "impressao": impressao, "resumo": resumo}, tmp_path)
+    os.replace(tmp_path, estado_path)
+    return resumo
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _resumo(origem, assinatura):
+    return atualizar_resumo(origem)
+
+
+def resumo_incremental(origem=RAW_DATA_PATH):
+    """`atualizar_resumo` uma vez por versão do arquivo."""
+    return _resumo(origem, assinatura_arquivo(origem))
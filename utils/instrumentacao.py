@@ -0,0 +1,219 @@
+"""Medição do custo de cada etapa das páginas.
+
+Registra o tempo de parede, o tempo de CPU da thread e a variação da
+memória residente do processo em cada carregamento de dados, construção de
+figura, serialização de figura (o que `st.pyplot` faria), ajuste de
+modelo e teste por reamostragem. Cada medição é marcada com a página e a
+seção em que ocorreu.
+
+As medições ficam em um registro compartilhado pelo servidor, visível em um
+painel oculto (acrescente `?diagnostico=1` à URL da página) e exportável
+como JSON ou no formato de texto do Prometheus. O arquivo `METRICAS_PATH` é
+regravado pelas páginas instrumentadas no máximo a cada
+`INTERVALO_EXPORTACAO` segundos, para ser coletado como um "textfile" do
+Prometheus.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+# Arquivo com as métricas no formato de texto do Prometheus
+METRICAS_PATH = ".cache/instrumentacao/metricas.prom"
+
+# Intervalo mínimo, em segundos, entre duas gravações de METRICAS_PATH
+INTERVALO_EXPORTACAO = 15
+
+# Parâmetro da URL que exibe o painel de diagnóstico
+PARAMETRO_PAINEL = "diagnostico"
+
+# Etapas medidas
+ETAPAS = ("carregamento", "figura", "serializacao", "ajuste", "reamostragem")
+
+# Prefixo dos nomes das métricas exportadas
+PREFIXO = "alzheimer"
+
+# Medição de uma etapa:
+# pagina, secao - onde a etapa ocorreu (None fora de uma página/seção)
+# etapa, nome   - tipo da etapa (ver ETAPAS) e o que foi medido (arquivo, figura, modelo)
+# inicio        - instante de início (epoch, em segundos)
+# wall, cpu     - tempo de parede e de CPU da thread, em segundos
+# memoria       - variação da memória residente do processo, em bytes
+Medicao = namedtuple("Medicao", ["pagina", "secao", "etapa", "nome", "inicio", "wall", "cpu", "memoria"])
+
+_pagina = contextvars.ContextVar("pagina", default=None)
+_secao = contextvars.ContextVar("secao", default=None)
+
+_PAGINA_BYTES = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def memoria_residente():
+    """Memória residente atual do processo, em bytes (pico, onde /proc não existe)."""
+    try:
+        with open("/proc/self/statm") as arquivo:
+            return int(arquivo.read().split()[1]) * _PAGINA_BYTES
+    except OSError:
+        import resource
+
+        # ru_maxrss está em KiB no Linux e em bytes no macOS
+        maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maximo if os.uname().sysname == "Darwin" else maximo * 1024
+
+
+class RegistroMedicoes:
+    """Medições recentes e totais acumulados por (página, seção, etapa, nome)."""
+
+    def __init__(self, max_medicoes=5000):
+        self._recentes = deque(maxlen=max_medicoes)
+        self._totais = {}
+        self._exportado_em = None
+        self._lock = threading.Lock()
+
+    def registrar(self, medicao):
+        rotulos = (medicao.pagina, medicao.secao, medicao.etapa, medicao.nome)
+        with self._lock:
+            self._recentes.append(medicao)
+            execucoes, wall, cpu, memoria, _ = self._totais.get(rotulos, (0, 0.0, 0.0, 0, None))
+            self._totais[rotulos] = (
+                execucoes + 1, wall + medicao.wall, cpu + medicao.cpu, memoria + medicao.memoria, medicao,
+            )
+
+    def medicoes(self):
+        """DataFrame com as medições recentes, da mais antiga para a mais nova."""
+        with self._lock:
+            recentes = list(self._recentes)
+        return pd.DataFrame(recentes, columns=Medicao._fields)
+
+    def resumo(self):
+        """DataFrame com os totais de cada (página, seção, etapa, nome), do maior tempo de parede para o menor."""
+        with self._lock:
+            totais = dict(self._totais)
+        linhas = [
+            (*rotulos, execucoes, wall, cpu, memoria, ultima.wall)
+            for rotulos, (execucoes, wall, cpu, memoria, ultima) in totais.items()
+        ]
+        colunas = ["pagina", "secao", "etapa", "nome", "execucoes", "wall", "cpu", "memoria", "ultima_wall"]
+        return pd.DataFrame(linhas, columns=colunas).sort_values("wall", ascending=False, ignore_index=True)
+
+    def limpar(self):
+        with self._lock:
+            self._recentes.clear()
+            self._totais.clear()
+
+    def para_json(self):
+        """Medições recentes e totais em JSON."""
+        return json.dumps({
+            "medicoes": self.medicoes().to_dict(orient="records"),
+            "totais": self.resumo().to_dict(orient="records"),
+        }, ensure_ascii=False, default=str)
+
+    def para_prometheus(self):
+        """Totais no formato de texto do Prometheus, por rótulos.
+
+        Execuções e tempos só crescem e são contadores; a variação de memória
+        acumulada pode diminuir (e ficar negativa), então é um gauge.
+        """
+        with self._lock:
+            totais = dict(self._totais)
+        metricas = [
+            ("execucoes_total", "counter", "Número de execuções da etapa.", 0),
+            ("wall_segundos_total", "counter", "Tempo de parede acumulado, em segundos.", 1),
+            ("cpu_segundos_total", "counter", "Tempo de CPU da thread acumulado, em segundos.", 2),
+            ("memoria_variacao_bytes", "gauge", "Variação da memória residente acumulada, em bytes.", 3),
+        ]
+        linhas = []
+        for nome, tipo, ajuda, indice in metricas:
+            linhas.append(f"# HELP {PREFIXO}_etapa_{nome} {ajuda}")
+            linhas.append(f"# TYPE {PREFIXO}_etapa_{nome} {tipo}")
+            for rotulos, valores in sorted(totais.items(), key=lambda item: tuple(map(str, item[0]))):
+                linhas.append(f"{PREFIXO}_etapa_{nome}{{{_rotulos_prometheus(rotulos)}}} {valores[indice]}")
+        return "\n".join(linhas) + "\n"
+
+    def exportar_prometheus(self, path=METRICAS_PATH, intervalo=0):
+        """Grava `para_prometheus()` em `path` de forma atômica.
+
+        Não grava nada se a última gravação foi há menos de `intervalo` segundos.
+        """
+        agora = time.monotonic()
+        with self._lock:
+            if self._exportado_em is not None and agora - self._exportado_em < intervalo:
+                return
+            self._exportado_em = agora
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as arquivo:
+            arquivo.write(self.para_prometheus())
+        os.replace(tmp_path, path)
+
+
+def _rotulos_prometheus(rotulos):
+    nomes = ("pagina", "secao", "etapa", "nome")
+    pares = []
+    for nome, valor in zip(nomes, rotulos):
+        valor = "" if valor is None else str(valor)
+        valor = valor.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pares.append(f'{nome}="{valor}"')
+    return ",".join(pares)
+
+
+@st.cache_resource
+def registro_medicoes():
+    """Registro de medições compartilhado por todas as sessões do servidor."""
+    return RegistroMedicoes()
+
+
+def iniciar_pagina(pagina):
+    """Marca as medições seguintes da execução atual com `pagina` (e sem seção)."""
+    _pagina.set(pagina)
+    _secao.set(None)
+
+
+def definir_secao(secao):
+    """Marca as medições seguintes da execução atual com a seção `secao`."""
+    _secao.set(secao)
+
+
+@contextmanager
+def medir(etapa, nome):
+    """Mede o bloco e registra o resultado como uma etapa `etapa` chamada `nome`.
+
+    Threads de segundo plano não herdam a página e a seção; para isso,
+    agende o trabalho com `contextvars.copy_context().run`.
+    """
+    inicio = time.time()
+    wall, cpu, memoria = time.perf_counter(), time.thread_time(), memoria_residente()
+    try:
+        yield
+    finally:
+        registro_medicoes().registrar(Medicao(
+            _pagina.get(), _secao.get(), etapa, str(nome), inicio,
+            time.perf_counter() - wall, time.thread_time() - cpu, memoria_residente() - memoria,
+        ))
+
+
+def painel_diagnostico():
+    """Regrava as métricas exportadas (ver INTERVALO_EXPORTACAO) e, com `?diagnostico=1` na URL, exibe o painel."""
+    registro = registro_medicoes()
+    registro.exportar_prometheus(intervalo=INTERVALO_EXPORTACAO)
+    if st.query_params.get(PARAMETRO_PAINEL) != "1":
+        return
+
+    st.markdown("---")
+    st.subheader("Diagnóstico de desempenho")
+    resumo = registro.resumo()
+    if resumo.empty:
+        st.info("Nenhuma medição registrada ainda.")
+        return
+    st.dataframe(resumo, use_container_width=True)
+    with st.expander("Medições recentes"):
+        st.dataframe(registro.medicoes().iloc[::-1], use_container_width=True)
+    col1, col2 = st.columns(2)
+    col1.download_button("Baixar JSON", registro.para_json(), "medicoes.json", "application/json")
+    col2.download_button("Baixar Prometheus", registro.para_prometheus(), "metricas.prom", "text/plain")
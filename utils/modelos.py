@@ -0,0 +1,239 @@
+"""Registro de modelos ajustados.
+
+Cada modelo é ajustado uma única vez por (versão do dataset, estimador e
+hiperparâmetros, features, alvo, divisão de teste). Apenas os coeficientes,
+as métricas de teste e uma amostra limitada dos pontos de teste são
+guardados: os resultados mais usados ficam em memória (LRU) e todos são
+persistidos em disco com joblib, um diretório por versão do dataset, de modo
+que reexecuções, outras sessões e reinícios do servidor os reaproveitam.
+Modelos ausentes são ajustados por um worker em segundo plano, enquanto a
+página continua a renderizar o que não depende deles.
+"""
+
+import contextvars
+import hashlib
+import os
+import shutil
+import threading
+from collections import OrderedDict, namedtuple
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+import streamlit as st
+from sklearn.base import clone
+from sklearn.model_selection import train_test_split
+
+from utils.amostragem import amostra_para_pontos
+from utils.instrumentacao import medir
+
+# Diretório onde os modelos ajustados são persistidos
+MODELS_DIR = ".cache/modelos"
+
+# Resultados mantidos em memória
+MAX_MODELOS = 64
+
+# Versões do dataset (inclusive coortes) mantidas em disco, as mais recentes
+MANTER_VERSOES = 16
+
+# Definição de um modelo:
+# estimador - estimador (ou pipeline) do scikit-learn ainda não ajustado
+# features  - colunas usadas como variáveis explicativas
+# target    - coluna alvo
+# teste     - (test_size, random_state) para separar um conjunto de teste, ou None
+Especificacao = namedtuple("Especificacao", ["estimador", "features", "target", "teste"])
+
+
+def chave_modelo(versao, especificacao):
+    """Chave estável para (versão do dataset, estimador, hiperparâmetros, features, alvo, teste)."""
+    estimador = especificacao.estimador
+    parametros = sorted((nome, repr(valor)) for nome, valor in estimador.get_params(deep=True).items())
+    texto = repr((
+        versao, type(estimador).__qualname__, parametros,
+        list(especificacao.features), especificacao.target, especificacao.teste,
+    ))
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+
+def coeficientes(estimador):
+    """(coeficientes, intercepto) de um estimador linear ajustado (do último passo, no caso de pipelines)."""
+    final = estimador.steps[-1][1] if hasattr(estimador, "steps") else estimador
+    return np.ravel(final.coef_), float(np.ravel(final.intercept_)[0])
+
+
+def ajustar(especificacao, data):
+    """Ajusta o modelo descrito por `especificacao` em `data`.
+
+    Retorna um dicionário com o coeficiente e o intercepto (do último passo,
+    no caso de pipelines) e, quando há divisão de teste, as métricas sobre o
+    conjunto de teste inteiro e uma amostra (ver `amostra_para_pontos`) dos
+    dados de teste e das previsões. O estimador não é guardado.
+    """
+    X = data[list(especificacao.features)]
+    y = data[especificacao.target]
+    if especificacao.teste is not None:
+        test_size, random_state = especificacao.teste
+        X, x_test, y, y_test = train_test_split(X, y, test_size=test_size, random_state=random_state)
+    nome = f"{type(especificacao.estimador).__name__}: {especificacao.target} ~ {' + '.join(especificacao.features)}"
+    with medir("ajuste", nome):
+        estimador = clone(especificacao.estimador).fit(X, y)
+
+    coef, intercept = coeficientes(estimador)
+    resultado = {
+        "coef": float(coef[0]) if len(coef) == 1 else coef,
+        "intercept": intercept,
+    }
+    if especificacao.teste is not None:
+        # score: acurácia nos classificadores, R² nas regressões
+        resultado["metricas"] = {"score": float(estimador.score(x_test, y_test)), "teste": len(y_test)}
+        amostra = amostra_para_pontos(x_test)
+        posicoes = x_test.index.get_indexer(amostra.index)
+        resultado.update(x_test=amostra, y_test=y_test.iloc[posicoes], y_pred=estimador.predict(amostra))
+    return resultado
+
+
+def remover_versoes_antigas(diretorio, manter=MANTER_VERSOES):
+    """Mantém em `diretorio` apenas os `manter` subdiretórios de versão gravados mais recentemente."""
+    versoes = []
+    for nome in os.listdir(diretorio):
+        caminho = os.path.join(diretorio, nome)
+        try:
+            versoes.append((os.stat(caminho).st_mtime_ns, caminho))
+        except FileNotFoundError:
+            continue
+    for _, caminho in sorted(versoes, reverse=True)[manter:]:
+        if os.path.isdir(caminho):
+            shutil.rmtree(caminho, ignore_errors=True)
+        else:
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass
+
+
+class ModelosAgendados(Mapping):
+    """Resultados de um conjunto de modelos, por nome.
+
+    Os ajustes ausentes já foram agendados no worker; acessar um modelo
+    aguarda apenas o ajuste dele.
+    """
+
+    def __init__(self, registro, chaves):
+        self._registro = registro
+        self._chaves = chaves
+
+    def __getitem__(self, nome):
+        return self._registro.resultado(self._chaves[nome])
+
+    def __iter__(self):
+        return iter(self._chaves)
+
+    def __len__(self):
+        return len(self._chaves)
+
+    def prontos(self):
+        """Nomes dos modelos cujo ajuste já terminou."""
+        return [nome for nome, chave in self._chaves.items() if self._registro.pronto(chave)]
+
+
+class RegistroModelos:
+    """Modelos ajustados em memória (LRU) e em disco, com ajuste em segundo plano.
+
+    As chaves usadas pelo registro são pares (versão do dataset, `chave_modelo`).
+    """
+
+    def __init__(self, models_dir=MODELS_DIR, max_workers=1, max_modelos=MAX_MODELOS, manter=MANTER_VERSOES):
+        self.models_dir = models_dir
+        self.max_modelos = max_modelos
+        self.manter = manter
+        self._memoria = OrderedDict()
+        self._futuros = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="modelos")
+
+    def _caminho(self, chave):
+        versao, modelo = chave
+        return os.path.join(self.models_dir, versao, f"{modelo}.joblib")
+
+    def _guardar(self, chave, resultado):
+        # Chamado com o lock adquirido
+        self._memoria[chave] = resultado
+        self._memoria.move_to_end(chave)
+        while len(self._memoria) > self.max_modelos:
+            self._memoria.popitem(last=False)
+
+    def obter(self, chave):
+        """Retorna o resultado já ajustado ou None."""
+        with self._lock:
+            if chave in self._memoria:
+                self._memoria.move_to_end(chave)
+                return self._memoria[chave]
+        try:
+            resultado = joblib.load(self._caminho(chave))
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._guardar(chave, resultado)
+        return resultado
+
+    def pronto(self, chave):
+        with self._lock:
+            if chave in self._memoria:
+                return True
+        return os.path.exists(self._caminho(chave))
+
+    def _ajustar_e_guardar(self, chave, especificacao, data):
+        try:
+            resultado = ajustar(especificacao, data)
+            caminho = self._caminho(chave)
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            tmp_path = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+            joblib.dump(resultado, tmp_path)
+            os.replace(tmp_path, caminho)
+            with self._lock:
+                self._guardar(chave, resultado)
+            remover_versoes_antigas(self.models_dir, self.manter)
+            return resultado
+        finally:
+            with self._lock:
+                self._futuros.pop(chave, None)
+
+    def agendar(self, versao, especificacao, data):
+        """Agenda o ajuste do modelo no worker, se ele ainda não existir, e retorna sua chave."""
+        chave = (versao, chave_modelo(versao, especificacao))
+        if self.pronto(chave):
+            return chave
+        with self._lock:
+            if chave not in self._futuros and chave not in self._memoria:
+                # O contexto copiado leva a página e a seção atuais para a medição do ajuste
+                self._futuros[chave] = self._executor.submit(
+                    contextvars.copy_context().run, self._ajustar_e_guardar, chave, especificacao, data,
+                )
+        return chave
+
+    def resultado(self, chave):
+        """Resultado do modelo `chave`, aguardando o ajuste se ele estiver em andamento."""
+        with self._lock:
+            futuro = self._futuros.get(chave)
+        if futuro is not None:
+            return futuro.result()
+        resultado = self.obter(chave)
+        if resultado is None:
+            raise KeyError(f"Modelo {chave} não foi agendado.")
+        return resultado
+
+    def modelos(self, versao, especificacoes, data):
+        """Agenda os modelos `especificacoes` (nome -> Especificacao) e retorna seus resultados por nome."""
+        chaves = {nome: self.agendar(versao, especificacao, data) for nome, especificacao in especificacoes.items()}
+        return ModelosAgendados(self, chaves)
+
+    def ajustar(self, versao, especificacao, data):
+        """Resultado do modelo, ajustando-o (e aguardando) se necessário."""
+        return self.resultado(self.agendar(versao, especificacao, data))
+
+
+@st.cache_resource
+def registro_modelos():
+    """Registro de modelos compartilhado por todas as sessões do servidor."""
+    return RegistroModelos()
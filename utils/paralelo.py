@@ -0,0 +1,107 @@
+"""Renderização de figuras em um pool de processos.
+
+O backend Agg do matplotlib segura o GIL durante quase toda a
+renderização, então threads não aceleram a construção de várias figuras.
+Aqui cada figura é construída e convertida em bytes de imagem em um
+processo separado: a página envia apenas o identificador da figura, o
+caminho do dataset e os resultados dos modelos, e cada processo lê (uma
+vez) as colunas de que precisa. Com um pool, o tempo de carregamento da
+página passa a ser limitado pela figura mais lenta, e não pela soma delas.
+"""
+
+import functools
+import importlib
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import streamlit as st
+
+from utils.dados import assinatura_arquivo, ler_tratados
+from utils.figuras import figura_para_bytes
+from utils.instrumentacao import medir
+
+# Falhas do pool que levam a figura a ser renderizada no processo atual: tarefa
+# cancelada ou argumentos/resultado que não puderam ser serializados. Erros da
+# própria figura não entram aqui e chegam à página com o traceback do processo.
+ERROS_DO_POOL = (CancelledError, pickle.PicklingError)
+
+
+@functools.lru_cache(maxsize=4)
+def _dados_do_processo(caminho, assinatura, colunas):
+    return ler_tratados(caminho, list(colunas) if colunas is not None else None)
+
+
+def renderizar_figura(modulo, figura_id, caminho, colunas, modelos, formato="png", linhas=None):
+    """Constrói a figura `figura_id` de `modulo.FIGURAS` e devolve seus bytes (executada nos processos do pool).
+
+    Com `linhas` (posições de uma coorte, ver `utils.coortes`), a figura usa apenas essas linhas do dataset.
+    """
+    data = _dados_do_processo(caminho, assinatura_arquivo(caminho), colunas)
+    if linhas is not None:
+        data = data.iloc[linhas]
+    construir = importlib.import_module(modulo).FIGURAS[figura_id][1]
+    return figura_para_bytes(construir(data, modelos), formato)
+
+
+def criar_pool(max_workers=None):
+    """Pool de processos iniciados com "spawn" (seguro com as threads do servidor do Streamlit).
+
+    Retorna None quando há apenas um núcleo disponível: nesse caso o pool só
+    acrescentaria o custo de serialização, e as figuras são renderizadas no
+    próprio processo.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers < 2:
+        return None
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+@st.cache_resource
+def pool_figuras():
+    """Pool de processos compartilhado por todas as sessões do servidor (ou None, ver `criar_pool`)."""
+    return criar_pool()
+
+
+def _renderizar_no_processo(*args):
+    """`renderizar_figura` no processo atual, registrada como "<figura_id>:fallback" no painel de diagnóstico."""
+    with medir("figura", f"{args[1]}:fallback"):
+        return renderizar_figura(*args)
+
+
+def _aguardar_figura(futuro, *args):
+    try:
+        return futuro.result()
+    except BrokenProcessPool:
+        # Um processo do pool morreu: o pool é descartado e recriado no próximo acesso
+        pool_figuras.clear()
+    except ERROS_DO_POOL:
+        pass
+    # Falhas do pool não impedem a figura: ela é renderizada neste processo
+    return _renderizar_no_processo(*args)
+
+
+def agendar_figuras(pool, modulo, figura_ids, caminho, colunas, modelos, formato="png", linhas=None):
+    """Envia cada figura de `figura_ids` ao pool e retorna {figura_id: função que devolve os bytes da imagem}.
+
+    A função aguarda o resultado do pool e, se o pool falhar (processo morto
+    ou um dos ERROS_DO_POOL), renderiza a figura no processo atual. Com o pool
+    quebrado, nada é enviado e todas as figuras são renderizadas no processo
+    atual. Cada renderização local é registrada como "<figura_id>:fallback".
+    """
+    colunas = tuple(colunas) if colunas is not None else None
+    agendadas = {}
+    for figura_id in figura_ids:
+        args = (modulo, figura_id, caminho, colunas, modelos, formato, linhas)
+        try:
+            futuro = pool.submit(renderizar_figura, *args)
+        except BrokenProcessPool:
+            pool_figuras.clear()
+            futuro = None
+        if futuro is None:
+            agendadas[figura_id] = functools.partial(_renderizar_no_processo, *args)
+        else:
+            agendadas[figura_id] = functools.partial(_aguardar_figura, futuro, *args)
+    return agendadas
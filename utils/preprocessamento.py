@@ -0,0 +1,161 @@
+"""Pré-processamento do dataset em blocos.
+
+O CSV de origem é lido em blocos de tamanho fixo; cada bloco passa pelas
+transformações configuradas e é gravado imediatamente no destino. A memória
+usada depende apenas do tamanho do bloco, não do tamanho do arquivo.
+"""
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from utils.esquema import ID_COLUMNS, LEITURA_SCHEMA, aplicar_esquema
+
+# Linhas lidas e gravadas por vez
+CHUNK_ROWS = 100_000
+
+# Linhas de cada record batch do Arrow (limita a memória usada na gravação)
+LINHAS_POR_LOTE = 1_000_000
+
+
+def remover_colunas(columns):
+    """Transformação que descarta `columns` do bloco, se existirem."""
+    columns = list(columns)
+
+    def transformar(bloco):
+        return bloco.drop(columns=[col for col in columns if col in bloco.columns])
+
+    return transformar
+
+
+# Transformações aplicadas por padrão a cada bloco, em ordem
+TRANSFORMACOES_PADRAO = [remover_colunas(ID_COLUMNS), aplicar_esquema]
+
+
+class _EscritorParquet:
+    def __init__(self, path):
+        self.path = path
+        self._writer = None
+
+    def escrever(self, bloco):
+        tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, tabela.schema)
+        self._writer.write_table(tabela.cast(self._writer.schema))
+
+    def fechar(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class _EscritorCSV:
+    def __init__(self, path):
+        self.path = path
+        self._arquivo = open(path, "w", newline="", encoding="utf-8")
+        self._cabecalho = True
+
+    def escrever(self, bloco):
+        bloco.to_csv(self._arquivo, index=False, header=self._cabecalho)
+        self._cabecalho = False
+
+    def fechar(self):
+        self._arquivo.close()
+
+
+class _EscritorArrow:
+    """Arquivo Arrow IPC (Feather v2) sem compressão, lido pelas páginas via memory map.
+
+    Para que a leitura não copie nada, cada coluna precisa estar em um único
+    bloco contíguo: os blocos são acumulados e gravados como um record batch
+    a cada LINHAS_POR_LOTE linhas. Datasets até esse tamanho ficam em um
+    único record batch; nos maiores, a memória usada continua limitada a um
+    lote, ao custo de uma cópia na leitura para juntar os lotes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._writer = None
+        self._schema = None
+        self._lote = []
+        self._linhas = 0
+
+    def escrever(self, bloco):
+        tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+        if self._writer is None:
+            self._schema = tabela.schema
+            self._writer = ipc.new_file(self.path, self._schema)
+        self._lote.append(tabela.cast(self._schema))
+        self._linhas += tabela.num_rows
+        if self._linhas >= LINHAS_POR_LOTE:
+            self._gravar_lote()
+
+    def _gravar_lote(self):
+        if self._linhas:
+            lote = pa.concat_tables(self._lote).combine_chunks()
+            self._writer.write_table(lote, max_chunksize=self._linhas)
+        self._lote = []
+        self._linhas = 0
+
+    def fechar(self):
+        if self._writer is None:
+            return
+        self._gravar_lote()
+        self._writer.close()
+
+
+ESCRITORES = {"parquet": _EscritorParquet, "arrow": _EscritorArrow, "csv": _EscritorCSV}
+
+# Formato deduzido da extensão do destino (demais extensões: CSV)
+EXTENSOES = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+
+
+def formato_do_caminho(path):
+    """Formato de escrita ("parquet", "arrow" ou "csv") correspondente à extensão de `path`."""
+    return EXTENSOES.get(os.path.splitext(path)[1], "csv")
+
+
+def ler_em_blocos(origem, chunk_rows=CHUNK_ROWS, usecols=None):
+    """Itera sobre o CSV `origem` em DataFrames de até `chunk_rows` linhas, já tipados pelo esquema.
+
+    Em um bloco com valores ausentes, as colunas inteiras do esquema ficam em
+    float32 (ver `aplicar_esquema`); os escritores convertem os blocos
+    seguintes para os tipos do primeiro.
+    """
+    for bloco in pd.read_csv(origem, chunksize=chunk_rows, usecols=usecols, dtype=LEITURA_SCHEMA):
+        yield aplicar_esquema(bloco)
+
+
+def preprocessar_em_blocos(origem, destino, transformacoes=None, formato=None, chunk_rows=CHUNK_ROWS):
+    """Aplica `transformacoes` ao CSV `origem` bloco a bloco e grava o resultado em `destino`.
+
+    O formato de saída ("parquet", "arrow" ou "csv") é deduzido da extensão
+    de `destino` quando não informado. A gravação é feita em um arquivo
+    temporário, movido para `destino` apenas ao final, de modo que leitores
+    nunca vejam um arquivo parcial. Retorna o número de linhas gravadas.
+    """
+    if transformacoes is None:
+        transformacoes = TRANSFORMACOES_PADRAO
+    if formato is None:
+        formato = formato_do_caminho(destino)
+    if formato not in ESCRITORES:
+        raise ValueError(f"Formato desconhecido: {formato!r}. Use um de {sorted(ESCRITORES)}.")
+
+    tmp_path = f"{destino}.tmp"
+    escritor = ESCRITORES[formato](tmp_path)
+    linhas = 0
+    try:
+        for bloco in ler_em_blocos(origem, chunk_rows):
+            for transformar in transformacoes:
+                bloco = transformar(bloco)
+            escritor.escrever(bloco)
+            linhas += len(bloco)
+    except BaseException:
+        escritor.fechar()
+        os.remove(tmp_path)
+        raise
+    escritor.fechar()
+    os.replace(tmp_path, destino)
+    return linhas
@@ -0,0 +1,342 @@
+"""Testes de permutação e intervalos de bootstrap vetorizados.
+
+Em vez de recalcular a estatística réplica a réplica, cada lote de réplicas
+é uma matriz (réplicas x linhas) de índices sorteados ou de rótulos
+permutados, e a estatística é calculada para todas as linhas da matriz de
+uma vez com NumPy. O tamanho dos lotes é limitado por `MAX_ELEMENTOS`, então
+a memória temporária não depende do número de réplicas.
+
+As réplicas são divididas em partes de `BLOCO` réplicas, cada uma com sua
+própria semente (derivada de `seed` com `SeedSequence.spawn`), e as partes
+podem ser executadas em vários processos com joblib (`n_jobs`). O resultado
+é o mesmo para qualquer `n_jobs`.
+
+O custo de cada método cresce com réplicas x linhas, então em coortes
+grandes o número de réplicas é reduzido para caber em `MAX_TRABALHO`
+elementos, sem ficar abaixo de `MIN_REPLICAS` (ver `replicas_para`).
+
+Cada função retorna um `Resultado` com a estatística observada, o p-valor
+bilateral do teste de permutação e o intervalo de confiança percentil do
+bootstrap.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from joblib import Parallel, delayed
+from scipy.special import expit
+
+from utils.instrumentacao import medir
+
+# Número padrão de réplicas (de permutação e de bootstrap)
+REPLICAS = 10_000
+
+# Réplicas por parte (unidade de semente e de paralelismo)
+BLOCO = 1_000
+
+# Elementos de cada matriz de réplicas (8 bytes cada), limitando a memória por lote
+MAX_ELEMENTOS = 2**22
+
+# Elementos (réplicas x linhas) de cada método, limitando o tempo em coortes grandes
+MAX_TRABALHO = 2**25
+
+# Menor número de réplicas usado quando o limite acima reduz as réplicas
+MIN_REPLICAS = 200
+
+# Custo relativo de uma réplica do bootstrap da regressão logística (iterações
+# de Newton a partir do ajuste observado) em relação às demais estatísticas
+CUSTO_LOGISTICA = 4
+
+# Nível de confiança dos intervalos
+NIVEL = 0.95
+
+# Iterações máximas e tolerância do ajuste da regressão logística
+ITERACOES_LOGISTICA = 50
+TOLERANCIA_LOGISTICA = 1e-8
+
+# estatistica  - valor observado nos dados
+# p_valor      - p-valor bilateral do teste de permutação, (1 + extremos) / (1 + réplicas)
+# ic_inferior, ic_superior - intervalo percentil do bootstrap no nível pedido
+# replicas     - número de réplicas de cada método
+Resultado = namedtuple("Resultado", ["estatistica", "p_valor", "ic_inferior", "ic_superior", "replicas"])
+
+# Conclusão testada por reamostragem:
+# secao    - hipótese da página
+# teste    - chave de TESTES (medias, medianas, linear ou logistico)
+# desfecho - variável resposta (y)
+# variavel - coluna de grupo (0/1) nas diferenças, ou preditora nas regressões (x)
+Conclusao = namedtuple("Conclusao", ["secao", "teste", "desfecho", "variavel"])
+
+
+def replicas_para(n, replicas=REPLICAS, custo=1):
+    """Réplicas usadas para `n` linhas: `replicas`, reduzidas para caber em `MAX_TRABALHO`.
+
+    `custo` é o custo relativo de cada elemento da matriz de réplicas. O
+    resultado nunca fica abaixo de `MIN_REPLICAS` (nem acima de `replicas`).
+    """
+    limite = MAX_TRABALHO // max(n * custo, 1)
+    return min(replicas, max(MIN_REPLICAS, limite))
+
+
+def _lotes(tamanho, n):
+    """Tamanhos dos lotes de réplicas para matrizes de `n` colunas."""
+    lote = max(1, MAX_ELEMENTOS // max(n, 1))
+    return [min(lote, tamanho - inicio) for inicio in range(0, tamanho, lote)]
+
+
+def _parte(estatistica, args, semente, tamanho, n):
+    rng = np.random.default_rng(semente)
+    return np.concatenate([estatistica(rng, lote, *args) for lote in _lotes(tamanho, n)])
+
+
+def replicar(estatistica, args, n, replicas=REPLICAS, seed=0, n_jobs=1):
+    """Calcula `replicas` réplicas de `estatistica(rng, lote, *args)`, que devolve `lote` valores.
+
+    `n` é o número de colunas das matrizes de réplicas criadas por
+    `estatistica` (usado para limitar o tamanho dos lotes).
+    """
+    partes = [min(BLOCO, replicas - inicio) for inicio in range(0, replicas, BLOCO)]
+    sementes = np.random.SeedSequence(seed).spawn(len(partes))
+    if n_jobs == 1:
+        resultados = [_parte(estatistica, args, semente, tamanho, n) for semente, tamanho in zip(sementes, partes)]
+    else:
+        resultados = Parallel(n_jobs=n_jobs)(
+            delayed(_parte)(estatistica, args, semente, tamanho, n) for semente, tamanho in zip(sementes, partes)
+        )
+    return np.concatenate(resultados)
+
+
+def _resultado(observado, permutacoes, bootstrap, nivel, referencia=None):
+    """`Resultado` de `observado`; `referencia` é o observado na escala de `permutacoes`, se for outra."""
+    referencia = observado if referencia is None else referencia
+    # Tolerância relativa para que empates numéricos com o observado contem como extremos
+    extremos = np.sum(np.abs(permutacoes) >= np.abs(referencia) * (1 - 1e-12))
+    cauda = (1 - nivel) / 2 * 100
+    inferior, superior = np.percentile(bootstrap, [cauda, 100 - cauda])
+    return Resultado(float(observado), (1 + extremos) / (1 + len(permutacoes)), inferior, superior, len(bootstrap))
+
+
+def _permutar(rng, lote, valores):
+    """Matriz (lote x n) com uma permutação de `valores` por linha."""
+    return rng.permuted(np.tile(valores, (lote, 1)), axis=1)
+
+
+def _sortear_grupo(rng, lote, n, tamanho):
+    """Matriz (lote x tamanho) de índices distintos entre 0 e n - 1, um grupo permutado por linha.
+
+    Todas as linhas são sorteadas de uma vez: os índices das `tamanho`
+    menores de n chaves uniformes formam um subconjunto uniforme, e a
+    seleção parcial (argpartition) evita ordenar as linhas inteiras.
+    """
+    return np.argpartition(rng.random((lote, n)), tamanho - 1, axis=1)[:, :tamanho]
+
+
+def _separar(y, grupo):
+    y = np.asarray(y, dtype=np.float64)
+    grupo = np.asarray(grupo)
+    validos = ~np.isnan(y) & ((grupo == 0) | (grupo == 1))
+    return y[validos], (grupo[validos] == 1).astype(np.float64)
+
+
+# -----------------------------
+# Diferença de médias
+# -----------------------------
+def _permutacao_medias(rng, lote, y, n1):
+    soma1 = y[_sortear_grupo(rng, lote, len(y), n1)].sum(axis=1)
+    return (y.sum() - soma1) / (len(y) - n1) - soma1 / n1
+
+
+def _bootstrap_medias(rng, lote, y0, y1):
+    return (
+        y0[rng.integers(0, len(y0), (lote, len(y0)))].mean(axis=1)
+        - y1[rng.integers(0, len(y1), (lote, len(y1)))].mean(axis=1)
+    )
+
+
+def diferenca_medias(y, grupo, replicas=REPLICAS, seed=0, nivel=NIVEL, n_jobs=1):
+    """Diferença media0 - media1 de `y` entre os grupos 0 e 1 de `grupo`.
+
+    O p-valor permuta os rótulos de grupo; o intervalo reamostra cada grupo
+    separadamente (bootstrap estratificado).
+    """
+    y, rotulos = _separar(y, grupo)
+    y0, y1 = y[rotulos == 0], y[rotulos == 1]
+    observado = y0.mean() - y1.mean()
+    replicas = replicas_para(len(y), replicas)
+    permutacoes = replicar(_permutacao_medias, (y, len(y1)), len(y), replicas, seed, n_jobs)
+    bootstrap = replicar(_bootstrap_medias, (y0, y1), max(len(y0), len(y1)), replicas, seed + 1, n_jobs)
+    return _resultado(observado, permutacoes, bootstrap, nivel)
+
+
+# -----------------------------
+# Diferença de medianas
+# -----------------------------
+def _medianas_por_rotulo(ordenados, rotulos):
+    """Mediana dos valores `ordenados` marcados com 1 em cada linha de `rotulos` (lote x n).
+
+    Como os valores estão ordenados, a mediana é o valor na posição em que a
+    contagem acumulada de rótulos atinge a metade do grupo, sem ordenar cada linha.
+    """
+    acumulado = np.cumsum(rotulos, axis=1)
+    total = acumulado[:, -1:]
+    inferior = np.argmax(acumulado >= (total + 1) // 2, axis=1)
+    superior = np.argmax(acumulado >= total // 2 + 1, axis=1)
+    return (ordenados[inferior] + ordenados[superior]) / 2
+
+
+def _permutacao_medianas(rng, lote, ordenados, n1):
+    permutados = np.zeros((lote, len(ordenados)), dtype=np.uint8)
+    np.put_along_axis(permutados, _sortear_grupo(rng, lote, len(ordenados), n1), 1, axis=1)
+    return _medianas_por_rotulo(ordenados, 1 - permutados) - _medianas_por_rotulo(ordenados, permutados)
+
+
+def _bootstrap_medianas(rng, lote, y0, y1):
+    return (
+        np.median(y0[rng.integers(0, len(y0), (lote, len(y0)))], axis=1)
+        - np.median(y1[rng.integers(0, len(y1), (lote, len(y1)))], axis=1)
+    )
+
+
+def diferenca_medianas(y, grupo, replicas=REPLICAS, seed=0, nivel=NIVEL, n_jobs=1):
+    """Diferença mediana0 - mediana1 de `y` entre os grupos 0 e 1 de `grupo` (ver `diferenca_medias`)."""
+    y, rotulos = _separar(y, grupo)
+    ordem = np.argsort(y, kind="stable")
+    ordenados, rotulos = y[ordem], rotulos[ordem]
+    y0, y1 = ordenados[rotulos == 0], ordenados[rotulos == 1]
+    observado = np.median(y0) - np.median(y1)
+    replicas = replicas_para(len(y), replicas)
+    permutacoes = replicar(_permutacao_medianas, (ordenados, len(y1)), len(y), replicas, seed, n_jobs)
+    bootstrap = replicar(_bootstrap_medianas, (y0, y1), max(len(y0), len(y1)), replicas, seed + 1, n_jobs)
+    return _resultado(observado, permutacoes, bootstrap, nivel)
+
+
+# -----------------------------
+# Coeficiente da regressão linear simples
+# -----------------------------
+def _inclinacao(x, y):
+    """Inclinação de mínimos quadrados de cada linha de `y` sobre a linha correspondente de `x`."""
+    xc = x - x.mean(axis=-1, keepdims=True)
+    return (xc * y).sum(axis=-1) / (xc * xc).sum(axis=-1)
+
+
+def _permutacao_linear(rng, lote, x, y):
+    # Com x fixo e centralizado, cada inclinação é um produto escalar
+    xc = x - x.mean()
+    return _permutar(rng, lote, y) @ xc / (xc @ xc)
+
+
+def _bootstrap_linear(rng, lote, x, y):
+    indices = rng.integers(0, len(x), (lote, len(x)))
+    return _inclinacao(x[indices], y[indices])
+
+
+def _pares_validos(x, y):
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    validos = ~np.isnan(x) & ~np.isnan(y)
+    return x[validos], y[validos]
+
+
+def coeficiente_linear(y, x, replicas=REPLICAS, seed=0, nivel=NIVEL, n_jobs=1):
+    """Inclinação da regressão linear y ~ x, com permutação de y e bootstrap dos pares (x, y)."""
+    x, y = _pares_validos(x, y)
+    observado = _inclinacao(x, y)
+    replicas = replicas_para(len(x), replicas)
+    permutacoes = replicar(_permutacao_linear, (x, y), len(x), replicas, seed, n_jobs)
+    bootstrap = replicar(_bootstrap_linear, (x, y), len(x), replicas, seed + 1, n_jobs)
+    return _resultado(observado, permutacoes, bootstrap, nivel)
+
+
+# -----------------------------
+# Coeficiente da regressão logística simples
+# -----------------------------
+def ajustar_logistica(x, y, penalidade=1.0, inicio=(0.0, 0.0)):
+    """Coeficiente da regressão logística y ~ x para cada linha de `x` e `y` (lote x n), por Newton.
+
+    `penalidade` é a penalização L2 do coeficiente (o intercepto não é
+    penalizado), como `1 / C` no `LogisticRegression` do scikit-learn.
+    `inicio` é o par (intercepto, coeficiente) de partida de todas as linhas.
+    """
+    coef, intercepto = _newton_logistica(x, y, penalidade, inicio)
+    return coef
+
+
+def _newton_logistica(x, y, penalidade, inicio):
+    x, y = np.atleast_2d(x), np.atleast_2d(y)
+    intercepto = np.full(len(x), inicio[0], dtype=np.float64)
+    coef = np.full(len(x), inicio[1], dtype=np.float64)
+    for _ in range(ITERACOES_LOGISTICA):
+        p = expit(intercepto[:, None] + coef[:, None] * x)
+        residuo = y - p
+        peso = p * (1 - p)
+        g0 = residuo.sum(axis=1)
+        g1 = (residuo * x).sum(axis=1) - penalidade * coef
+        h00 = peso.sum(axis=1)
+        h01 = (peso * x).sum(axis=1)
+        h11 = (peso * x * x).sum(axis=1) + penalidade
+        determinante = h00 * h11 - h01 * h01
+        passo0 = (h11 * g0 - h01 * g1) / determinante
+        passo1 = (h00 * g1 - h01 * g0) / determinante
+        intercepto += passo0
+        coef += passo1
+        if np.max(np.abs(passo1)) < TOLERANCIA_LOGISTICA and np.max(np.abs(passo0)) < TOLERANCIA_LOGISTICA:
+            break
+    return coef, intercepto
+
+
+def _bootstrap_logistica(rng, lote, x, y, penalidade, inicio):
+    indices = rng.integers(0, len(x), (lote, len(x)))
+    return ajustar_logistica(x[indices], y[indices], penalidade, inicio)
+
+
+def coeficiente_logistico(y, x, replicas=REPLICAS, seed=0, nivel=NIVEL, n_jobs=1, penalidade=1.0):
+    """Coeficiente da regressão logística y ~ x (y em 0/1), com teste de escore por permutação e bootstrap dos pares.
+
+    O p-valor não reajusta o modelo a cada permutação: sob a hipótese nula
+    (coeficiente zero) a estatística de escore é sum((x - média de x) * y),
+    e como a permutação de y não muda a média nem a variância de y, basta
+    comparar esse produto escalar, o mesmo do teste linear. Só o bootstrap
+    reajusta o modelo, partindo do ajuste observado, e por isso tem as
+    réplicas reduzidas por `CUSTO_LOGISTICA` (ver `replicas_para`).
+    """
+    x, y = _pares_validos(x, y)
+    coef, intercepto = _newton_logistica(x, y, penalidade, (0.0, 0.0))
+    observado = coef[0]
+    replicas = replicas_para(len(x), replicas, CUSTO_LOGISTICA)
+    xc = x - x.mean()
+    permutacoes = replicar(_permutacao_linear, (x, y), len(x), replicas, seed, n_jobs)
+    bootstrap = replicar(
+        _bootstrap_logistica, (x, y, penalidade, (intercepto[0], observado)), len(x), replicas, seed + 1, n_jobs)
+    return _resultado(observado, permutacoes, bootstrap, nivel, referencia=xc @ y / (xc @ xc))
+
+
+# Funções de teste: nome -> função(y, x, replicas, seed, nivel, n_jobs)
+TESTES = {
+    "medias": diferenca_medias,
+    "medianas": diferenca_medianas,
+    "linear": coeficiente_linear,
+    "logistico": coeficiente_logistico,
+}
+
+
+def reamostrar_conclusoes(conclusoes, data, replicas=REPLICAS, seed=0, nivel=NIVEL, n_jobs=1):
+    """Tabela com o teste de permutação e o intervalo de bootstrap de cada conclusão.
+
+    `conclusoes` é um dicionário nome -> Conclusao; a tabela tem uma linha por
+    conclusão, com os campos da Conclusao e do Resultado.
+    """
+    linhas = []
+    for nome, conclusao in conclusoes.items():
+        with medir("reamostragem", nome):
+            resultado = TESTES[conclusao.teste](
+                data[conclusao.desfecho], data[conclusao.variavel], replicas, seed, nivel, n_jobs)
+        linhas.append({"conclusao": nome, **conclusao._asdict(), **resultado._asdict()})
+    return pd.DataFrame(linhas)
+
+
+@st.cache_resource(max_entries=4, show_spinner="Executando os testes por reamostragem...")
+def reamostragem_em_cache(versao, _conclusoes, _data, replicas=REPLICAS, seed=0, n_jobs=-1):
+    """`reamostrar_conclusoes` uma vez por versão do dataset (as conclusões e o DataFrame não entram na chave)."""
+    return reamostrar_conclusoes(_conclusoes, _data, replicas, seed, NIVEL, n_jobs)
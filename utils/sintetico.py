@@ -0,0 +1,191 @@
+"""Geração de coortes sintéticas com o esquema do dataset de Alzheimer.
+
+Usado para testes de carga e planejamento de capacidade: produz qualquer
+número de linhas com as mesmas colunas e tipos de
+`alzheimers_disease_data.csv`. O gerador aprende com o dataset real a
+distribuição marginal de cada coluna (quantis empíricos das numéricas,
+frequências das binárias e categóricas) e as correlações entre elas, por
+meio de uma cópula gaussiana: sorteia vetores normais correlacionados e os
+transforma de volta pelas marginais empíricas, tudo vetorizado em NumPy.
+"""
+
+import functools
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+from scipy.stats import rankdata
+
+from utils.dados import RAW_DATA_PATH
+from utils.esquema import BINARY_COLUMNS, CATEGORICAL_COLUMNS, FAIXAS, ID_COLUMNS, aplicar_esquema
+from utils.preprocessamento import CHUNK_ROWS, ESCRITORES, formato_do_caminho
+
+# Ordem das colunas no CSV original
+COLUNAS_ORIGINAIS = [
+    "PatientID", "Age", "Gender", "Ethnicity", "EducationLevel", "BMI", "Smoking",
+    "AlcoholConsumption", "PhysicalActivity", "DietQuality", "SleepQuality",
+    "FamilyHistoryAlzheimers", "CardiovascularDisease", "Diabetes", "Depression",
+    "HeadInjury", "Hypertension", "SystolicBP", "DiastolicBP", "CholesterolTotal",
+    "CholesterolLDL", "CholesterolHDL", "CholesterolTriglycerides", "MMSE",
+    "FunctionalAssessment", "MemoryComplaints", "BehavioralProblems", "ADL",
+    "Confusion", "Disorientation", "PersonalityChanges", "DifficultyCompletingTasks",
+    "Forgetfulness", "Diagnosis", "DoctorInCharge",
+]
+
+# Colunas numéricas armazenadas como inteiros no CSV original
+INTEIRAS = {"Age", "SystolicBP", "DiastolicBP"}
+
+# Colunas sorteadas como categorias (valores e frequências observados)
+DISCRETAS = BINARY_COLUMNS + list(CATEGORICAL_COLUMNS)
+
+# Número de quantis guardados por coluna numérica
+QUANTIS = 1001
+
+# Marginais e correlações aprendidas de um dataset:
+# colunas   - ordem das colunas na matriz de correlação
+# quantis   - coluna numérica -> quantis empíricos em QUANTIS níveis igualmente espaçados
+# discretas - coluna discreta -> (valores, frequências acumuladas)
+# cholesky  - fator de Cholesky da correlação entre os escores normais das colunas
+ModeloCoorte = namedtuple("ModeloCoorte", ["colunas", "quantis", "discretas", "cholesky"])
+
+
+def _correlacao_valida(corr, minimo=1e-6):
+    """Aproxima `corr` pela matriz de correlação positiva definida mais próxima."""
+    autovalores, autovetores = np.linalg.eigh(corr)
+    corr = (autovetores * np.maximum(autovalores, minimo)) @ autovetores.T
+    d = np.sqrt(np.diag(corr))
+    return corr / np.outer(d, d)
+
+
+def _escores_discretos(valores, acumuladas):
+    """Escores normais de uma coluna discreta e sua correlação com a normal latente.
+
+    Cada categoria recebe a média da normal padrão no intervalo que ela
+    ocupa na cópula; a correlação desse escore com a normal latente é o
+    fator de atenuação usado para corrigir as correlações observadas.
+    """
+    limites = ndtri(np.concatenate([[0.0], acumuladas]))
+    densidades = np.exp(-0.5 * np.nan_to_num(limites, posinf=0, neginf=0) ** 2) / np.sqrt(2 * np.pi)
+    densidades[[0, -1]] = 0.0
+    probabilidades = np.diff(np.concatenate([[0.0], acumuladas]))
+    medias = (densidades[:-1] - densidades[1:]) / probabilidades
+    return medias[valores], np.sqrt(np.sum(probabilidades * medias**2))
+
+
+def ajustar_modelo(data):
+    """Aprende marginais e correlações das colunas de FAIXAS e DISCRETAS presentes em `data`."""
+    colunas = [col for col in COLUNAS_ORIGINAIS if col in FAIXAS or col in DISCRETAS]
+    colunas = [col for col in colunas if col in data.columns]
+    valores = data[colunas].to_numpy(dtype=np.float64)
+
+    # Escores normais: posições (com empates pela média) para as numéricas e
+    # médias por categoria para as discretas
+    escores = ndtri(rankdata(valores, axis=0) / (len(valores) + 1))
+    atenuacao = np.ones(len(colunas))
+    niveis = np.linspace(0, 1, QUANTIS)
+    quantis, discretas = {}, {}
+    for j, col in enumerate(colunas):
+        if col in DISCRETAS:
+            categorias, indices, contagens = np.unique(valores[:, j], return_inverse=True, return_counts=True)
+            acumuladas = np.cumsum(contagens) / contagens.sum()
+            discretas[col] = (categorias.astype(np.int64), acumuladas)
+            escores[:, j], atenuacao[j] = _escores_discretos(indices, acumuladas)
+        else:
+            quantis[col] = np.quantile(valores[:, j], niveis)
+
+    # Correlação da cópula gaussiana, corrigida da atenuação causada pela
+    # discretização das colunas binárias e categóricas
+    corr = np.corrcoef(escores, rowvar=False) / np.outer(atenuacao, atenuacao)
+    np.fill_diagonal(corr, 1.0)
+    corr = _correlacao_valida(np.clip(corr, -1, 1))
+    return ModeloCoorte(colunas, quantis, discretas, np.linalg.cholesky(corr))
+
+
+@functools.lru_cache(maxsize=4)
+def modelo_padrao(path=RAW_DATA_PATH):
+    """Modelo aprendido do dataset original em `path` (calculado uma vez por processo)."""
+    return ajustar_modelo(pd.read_csv(path))
+
+
+def _gerar(modelo, rng, n_linhas, primeiro_id):
+    u = ndtr(rng.standard_normal((n_linhas, len(modelo.colunas))) @ modelo.cholesky.T)
+    colunas = {"PatientID": np.arange(primeiro_id, primeiro_id + n_linhas, dtype=np.int64)}
+    for j, col in enumerate(modelo.colunas):
+        if col in modelo.discretas:
+            categorias, acumuladas = modelo.discretas[col]
+            indices = np.searchsorted(acumuladas, u[:, j], side="right")
+            colunas[col] = categorias[np.minimum(indices, len(categorias) - 1)]
+        else:
+            # Os quantis estão em níveis igualmente espaçados, então a
+            # interpolação entre eles é feita por índice direto, sem busca binária
+            quantis = modelo.quantis[col]
+            posicoes = u[:, j] * (QUANTIS - 1)
+            indices = np.minimum(posicoes.astype(np.intp), QUANTIS - 2)
+            valores = quantis[indices] + (posicoes - indices) * np.diff(quantis)[indices]
+            colunas[col] = np.rint(valores).astype(np.int64) if col in INTEIRAS else valores
+    colunas["DoctorInCharge"] = np.full(n_linhas, "XXXConfid", dtype=object)
+    return pd.DataFrame(colunas)[[col for col in COLUNAS_ORIGINAIS if col in colunas]]
+
+
+def gerar_coorte(n_linhas, seed=0, primeiro_id=1, modelo=None):
+    """Gera `n_linhas` pacientes sintéticos com as colunas e tipos do CSV original.
+
+    Sem `modelo`, usa as distribuições aprendidas do dataset original.
+    """
+    if modelo is None:
+        modelo = modelo_padrao()
+    return _gerar(modelo, np.random.default_rng(seed), n_linhas, primeiro_id)
+
+
+def gerar_uniforme(n_linhas, seed=0, primeiro_id=1):
+    """Coorte sorteando cada atributo uniformemente e de forma independente nas faixas documentadas."""
+    rng = np.random.default_rng(seed)
+    colunas = {"PatientID": np.arange(primeiro_id, primeiro_id + n_linhas, dtype=np.int64)}
+    for col, (minimo, maximo) in FAIXAS.items():
+        if col in INTEIRAS:
+            colunas[col] = rng.integers(minimo, maximo + 1, n_linhas, dtype=np.int64)
+        else:
+            colunas[col] = rng.uniform(minimo, maximo, n_linhas)
+    for col in BINARY_COLUMNS:
+        colunas[col] = rng.integers(0, 2, n_linhas, dtype=np.int64)
+    for col, categorias in CATEGORICAL_COLUMNS.items():
+        colunas[col] = rng.choice(np.asarray(categorias, dtype=np.int64), n_linhas)
+    colunas["DoctorInCharge"] = np.full(n_linhas, "XXXConfid", dtype=object)
+    return pd.DataFrame(colunas)[COLUNAS_ORIGINAIS]
+
+
+def gerar_tratados(n_linhas, seed=0, modelo=None):
+    """Coorte sintética já no formato do dataset tratado (sem IDs, tipada pelo esquema)."""
+    return aplicar_esquema(gerar_coorte(n_linhas, seed, modelo=modelo).drop(columns=ID_COLUMNS))
+
+
+def gravar_coorte(destino, n_linhas, seed=0, modelo=None, formato=None, chunk_rows=CHUNK_ROWS):
+    """Gera `n_linhas` pacientes em blocos de `chunk_rows` e os grava em `destino`.
+
+    O formato ("csv", "parquet" ou "arrow") é deduzido da extensão de
+    `destino` quando não informado. A memória usada depende apenas do
+    tamanho do bloco (exceto no fechamento do Arrow, ver
+    `utils.preprocessamento`), e o arquivo só aparece em `destino` quando completo.
+    """
+    if modelo is None:
+        modelo = modelo_padrao()
+    if formato is None:
+        formato = formato_do_caminho(destino)
+    if formato not in ESCRITORES:
+        raise ValueError(f"Formato desconhecido: {formato!r}. Use um de {sorted(ESCRITORES)}.")
+
+    rng = np.random.default_rng(seed)
+    tmp_path = f"{destino}.tmp"
+    escritor = ESCRITORES[formato](tmp_path)
+    try:
+        for inicio in range(0, n_linhas, chunk_rows):
+            escritor.escrever(_gerar(modelo, rng, min(chunk_rows, n_linhas - inicio), inicio + 1))
+    except BaseException:
+        escritor.fechar()
+        os.remove(tmp_path)
+        raise
+    escritor.fechar()
+    os.replace(tmp_path, destino)
+    return n_linhas
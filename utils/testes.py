@@ -0,0 +1,156 @@
+"""Testes de hipótese em lote.
+
+Compara vários desfechos numéricos entre os dois grupos (0 e 1) de várias
+colunas binárias de uma só vez. Em vez de chamar `ttest_ind` para cada par,
+acumula contagens, somas e somas de quadrados por grupo com produtos
+matriciais e deriva daí as estatísticas de todos os pares.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from utils.agregados import CHUNK_SIZE
+
+CORRECOES = ("bonferroni", "holm", "fdr_bh")
+
+
+def corrigir_pvalores(p_values, metodo="fdr_bh"):
+    """Ajusta p-valores para comparações múltiplas (Bonferroni, Holm ou Benjamini-Hochberg)."""
+    p = np.asarray(p_values, dtype=np.float64)
+    ajustado = np.full_like(p, np.nan)
+    validos = ~np.isnan(p)
+    pv = p[validos]
+    m = len(pv)
+    if m == 0:
+        return ajustado
+    if metodo == "bonferroni":
+        resultado = pv * m
+    elif metodo == "holm":
+        ordem = np.argsort(pv)
+        passos = pv[ordem] * (m - np.arange(m))
+        resultado = np.empty(m)
+        resultado[ordem] = np.maximum.accumulate(passos)
+    elif metodo == "fdr_bh":
+        ordem = np.argsort(pv)[::-1]
+        passos = pv[ordem] * m / np.arange(m, 0, -1)
+        resultado = np.empty(m)
+        resultado[ordem] = np.minimum.accumulate(passos)
+    else:
+        raise ValueError(f"Correção desconhecida: {metodo!r}. Use uma de {CORRECOES}.")
+    ajustado[validos] = np.minimum(resultado, 1.0)
+    return ajustado
+
+
+def estatisticas_por_grupo(data, desfechos, grupos, chunk_size=CHUNK_SIZE, deslocamento=None):
+    """Contagens, somas e somas de quadrados de cada desfecho em cada grupo.
+
+    Retorna um dicionário de matrizes (grupos x desfechos) para os grupos 0
+    e 1, além dos deslocamentos usados para centralizar os desfechos (por
+    padrão, a média do primeiro bloco). Valores ausentes são ignorados,
+    tanto no desfecho quanto na coluna de grupo.
+    """
+    desfechos, grupos = list(desfechos), list(grupos)
+    k, m = len(grupos), len(desfechos)
+    acumulado = {nome: np.zeros((k, m)) for nome in ("n0", "n1", "s0", "s1", "q0", "q1")}
+
+    for inicio in range(0, len(data), chunk_size):
+        bloco = data.iloc[inicio:inicio + chunk_size]
+        y = bloco.loc[:, desfechos].to_numpy(dtype=np.float64)
+        g = bloco.loc[:, grupos].to_numpy(dtype=np.float64)
+        if deslocamento is None:
+            # Centralizar reduz o cancelamento numérico em soma_quadrados - n * media²
+            deslocamento = np.nan_to_num(np.nanmean(y, axis=0)) if len(y) else np.zeros(m)
+        validos = ~np.isnan(y)
+        y = np.where(validos, y - deslocamento, 0.0)
+        validos = validos.astype(np.float64)
+        for rotulo, indicador in (("0", g == 0), ("1", g == 1)):
+            indicador = indicador.astype(np.float64).T
+            acumulado["n" + rotulo] += indicador @ validos
+            acumulado["s" + rotulo] += indicador @ y
+            acumulado["q" + rotulo] += indicador @ (y * y)
+
+    acumulado["deslocamento"] = deslocamento if deslocamento is not None else np.zeros(m)
+    return acumulado
+
+
+def combinar_estatisticas(a, b):
+    """Soma dois resultados de `estatisticas_por_grupo` (por exemplo, de lotes diferentes de linhas).
+
+    As somas de `b` são recentralizadas no deslocamento de `a` antes da
+    soma, então os dois podem ter sido calculados com deslocamentos diferentes.
+    """
+    delta = a["deslocamento"] - b["deslocamento"]
+    combinado = {"deslocamento": a["deslocamento"]}
+    for rotulo in ("0", "1"):
+        n, soma, quadrados = b["n" + rotulo], b["s" + rotulo], b["q" + rotulo]
+        # Σ(y - c_a) = Σ(y - c_b) - n·δ e Σ(y - c_a)² = Σ(y - c_b)² - 2δ·Σ(y - c_b) + n·δ², com δ = c_a - c_b
+        combinado["n" + rotulo] = a["n" + rotulo] + n
+        combinado["s" + rotulo] = a["s" + rotulo] + soma - n * delta
+        combinado["q" + rotulo] = a["q" + rotulo] + quadrados - 2 * delta * soma + n * delta**2
+    return combinado
+
+
+def testes_t_de_estatisticas(estat, desfechos, grupos, correcao="fdr_bh"):
+    """Deriva os testes T de Student e de Welch a partir de `estatisticas_por_grupo`."""
+    n0, n1 = estat["n0"], estat["n1"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        media0 = estat["s0"] / n0
+        media1 = estat["s1"] / n1
+        var0 = (estat["q0"] - n0 * media0**2) / (n0 - 1)
+        var1 = (estat["q1"] - n1 * media1**2) / (n1 - 1)
+        var0, var1 = np.clip(var0, 0, None), np.clip(var1, 0, None)
+        diferenca = media0 - media1
+
+        # Student (variâncias iguais), como o padrão de `ttest_ind`
+        gl = n0 + n1 - 2
+        var_comb = ((n0 - 1) * var0 + (n1 - 1) * var1) / gl
+        t = diferenca / np.sqrt(var_comb * (1 / n0 + 1 / n1))
+        p = 2 * stats.t.sf(np.abs(t), gl)
+
+        # Welch (variâncias diferentes)
+        a, b = var0 / n0, var1 / n1
+        t_welch = diferenca / np.sqrt(a + b)
+        gl_welch = (a + b) ** 2 / (a**2 / (n0 - 1) + b**2 / (n1 - 1))
+        p_welch = 2 * stats.t.sf(np.abs(t_welch), gl_welch)
+
+        # Tamanho de efeito
+        cohen_d = diferenca / np.sqrt(var_comb)
+        hedges_g = cohen_d * (1 - 3 / (4 * gl - 1))
+
+    deslocamento = estat["deslocamento"]
+    resultado = pd.DataFrame({
+        "grupo": np.repeat(grupos, len(desfechos)),
+        "desfecho": np.tile(desfechos, len(grupos)),
+        "n0": n0.ravel().astype(np.int64),
+        "n1": n1.ravel().astype(np.int64),
+        "media0": (media0 + deslocamento).ravel(),
+        "media1": (media1 + deslocamento).ravel(),
+        "diferenca": diferenca.ravel(),
+        "t": t.ravel(),
+        "gl": gl.ravel(),
+        "p": p.ravel(),
+        "t_welch": t_welch.ravel(),
+        "gl_welch": gl_welch.ravel(),
+        "p_welch": p_welch.ravel(),
+        "cohen_d": cohen_d.ravel(),
+        "hedges_g": hedges_g.ravel(),
+    })
+    if correcao is not None:
+        resultado["p_ajustado"] = corrigir_pvalores(resultado["p"], correcao)
+        resultado["p_welch_ajustado"] = corrigir_pvalores(resultado["p_welch"], correcao)
+    return resultado
+
+
+def testes_t_em_lote(data, desfechos, grupos, correcao="fdr_bh", chunk_size=CHUNK_SIZE):
+    """Testes T de todos os pares (coluna binária, desfecho) em uma única passada.
+
+    Para cada par, compara o desfecho entre o grupo 0 e o grupo 1 (a
+    diferença é media0 - media1, como em `ttest_ind(grupo0, grupo1)`).
+    Retorna um DataFrame com uma linha por par, contendo as estatísticas de
+    Student e de Welch, o d de Cohen, o g de Hedges e os p-valores
+    corrigidos pelo método `correcao` (None desativa a correção).
+    """
+    desfechos, grupos = list(desfechos), list(grupos)
+    estat = estatisticas_por_grupo(data, desfechos, grupos, chunk_size)
+    return testes_t_de_estatisticas(estat, desfechos, grupos, correcao)